@@ -4,15 +4,29 @@ Ianvs Benchmarking Dashboard - Real-time metrics visualization
 Displays federated learning benchmarks, cloud-edge metrics, and algorithm comparisons
 """
 
+import bisect
+import hashlib
+import os
+import sqlite3
+import threading
 import streamlit as st
+import numpy as np
 import pandas as pd
 import json
 import plotly.graph_objects as go
 import plotly.express as px
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 import yaml
 
+from ranking import load_rank_criteria, normalized_scores, rank_algorithms
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow result segments are skipped without pyarrow
+    pa = None
+
 # Page configuration
 st.set_page_config(
     page_title="Ianvs Edge AI Benchmarking",
@@ -48,69 +62,539 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def demo_results():
+    """Demo results shown until the orchestrator has written any rounds"""
+    return {
+        "job_name": "federated_learning_edge_benchmark",
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "status": "completed",
+        "algorithms": [
+            {
+                "name": "FederatedAveraging",
+                "metrics": {
+                    "accuracy": 0.9234,
+                    "f1_score": 0.9156,
+                    "precision": 0.9301,
+                    "recall": 0.9015,
+                    "inference_latency": 45.2,  # ms
+                    "bandwidth_usage": 1.23  # MB
+                },
+                "rounds": 10,
+                "convergence_round": 7
+            }
+        ],
+        "edge_nodes": [
+            {
+                "name": "edge-node-1",
+                "samples": 1024,
+                "accuracy": 0.9189,
+                "avg_latency": 42.1,
+                "status": "active"
+            },
+            {
+                "name": "edge-node-2",
+                "samples": 987,
+                "accuracy": 0.9278,
+                "avg_latency": 38.9,
+                "status": "active"
+            },
+            {
+                "name": "edge-node-3",
+                "samples": 1105,
+                "accuracy": 0.9241,
+                "avg_latency": 54.3,
+                "status": "active"
+            }
+        ],
+        "training_history": [
+            {"round": 1, "accuracy": 0.7823, "loss": 0.4512, "latency": 89.3},
+            {"round": 2, "accuracy": 0.8234, "loss": 0.3891, "latency": 76.2},
+            {"round": 3, "accuracy": 0.8567, "loss": 0.3245, "latency": 68.5},
+            {"round": 4, "accuracy": 0.8789, "loss": 0.2891, "latency": 61.2},
+            {"round": 5, "accuracy": 0.8945, "loss": 0.2567, "latency": 55.8},
+            {"round": 6, "accuracy": 0.9078, "loss": 0.2234, "latency": 51.3},
+            {"round": 7, "accuracy": 0.9156, "loss": 0.1987, "latency": 47.9},
+            {"round": 8, "accuracy": 0.9201, "loss": 0.1823, "latency": 46.1},
+            {"round": 9, "accuracy": 0.9223, "loss": 0.1756, "latency": 45.5},
+            {"round": 10, "accuracy": 0.9234, "loss": 0.1721, "latency": 45.2}
+        ],
+        # Same shape as the regression.json written by runner/regression.py
+        "comparison": {
+            "baseline": ["demo-baseline"],
+            "confidence": 0.95,
+            "regression": False,
+            "algorithms": {
+                "FederatedAveraging": {
+                    "accuracy": {"delta": 0.0234, "ci_low": 0.0112, "ci_high": 0.0351, "verdict": "improvement"},
+                    "f1_score": {"delta": 0.0156, "ci_low": 0.0041, "ci_high": 0.0268, "verdict": "improvement"},
+                    "inference_latency": {"delta": -12.3, "ci_low": -17.8, "ci_high": -6.9, "verdict": "improvement"},
+                    "bandwidth_usage": {"delta": -0.45, "ci_low": -0.61, "ci_high": -0.28, "verdict": "improvement"}
+                }
+            }
+        }
+    }
+
+DEFAULT_ALGORITHM = "FederatedAveraging"
+METRIC_KEYS = ["accuracy", "f1_score", "precision", "recall",
+               "inference_latency", "bandwidth_usage"]
+
+class ResultsIndex:
+    """Incremental index of round result files, keyed by path, mtime and size
+
+    The results directory is scanned with ``os.scandir`` on every refresh, but a
+    result file is only re-parsed when it is new or its mtime/size changed.
+    Both output formats are indexed: ``round_{n}.json`` files and append-only
+    ``rounds-*.arrows`` segments, which are read memory-mapped.
+    Rounds written directly under the results directory belong to the job named
+    in ``benchmarkingjob.yaml``; each sub-directory is treated as its own job.
+    """
+
+    ROUND_PREFIX = "round_"
+    SEGMENT_PREFIX = "rounds-"
+    SEGMENT_SUFFIX = ".arrows"
+
+    def __init__(self, results_path: Path, default_job: str):
+        self.results_path = results_path
+        self.default_job = default_job
+        # path -> (mtime_ns, size, job, parsed rounds)
+        self._entries: Dict[str, Tuple[int, int, str, List[dict]]] = {}
+        self._rounds: Dict[str, List[dict]] = {}
+        self._summaries: Dict[str, List[dict]] = {}
+        self._lock = threading.Lock()
+
+    def _scan(self):
+        """Yield (job, DirEntry) for every result file under the results directory"""
+        if not self.results_path.is_dir():
+            return
+        with os.scandir(self.results_path) as it:
+            for entry in it:
+                if entry.is_dir():
+                    with os.scandir(entry.path) as sub:
+                        for sub_entry in sub:
+                            if self._is_result_file(sub_entry):
+                                yield entry.name, sub_entry
+                elif self._is_result_file(entry):
+                    yield self.default_job, entry
+
+    def _is_result_file(self, entry) -> bool:
+        if not entry.is_file():
+            return False
+        if entry.name.startswith(self.ROUND_PREFIX) and entry.name.endswith(".json"):
+            return True
+        return (pa is not None
+                and entry.name.startswith(self.SEGMENT_PREFIX)
+                and entry.name.endswith(self.SEGMENT_SUFFIX))
+
+    def _parse(self, path: str) -> List[dict]:
+        if path.endswith(self.SEGMENT_SUFFIX):
+            return read_arrow_segment(path)
+        with open(path, 'r') as f:
+            return [json.load(f)]
+
+    def refresh(self) -> bool:
+        """Re-parse new or changed result files; return True if anything changed"""
+        with self._lock:
+            seen = set()
+            changed_jobs = set()
+            for job, entry in self._scan():
+                seen.add(entry.path)
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                cached = self._entries.get(entry.path)
+                if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                    continue
+                try:
+                    records = self._parse(entry.path)
+                except (OSError, ValueError):
+                    # Partially written file; pick it up on the next refresh
+                    continue
+                self._entries[entry.path] = (stat.st_mtime_ns, stat.st_size, job, records)
+                changed_jobs.add(job)
+
+            for path in set(self._entries) - seen:
+                changed_jobs.add(self._entries.pop(path)[2])
+
+            for job in changed_jobs:
+                self._rounds.pop(job, None)
+                self._summaries.pop(job, None)
+            return bool(changed_jobs)
+
+    def jobs(self) -> List[str]:
+        """Job names, most recently updated first"""
+        with self._lock:
+            latest: Dict[str, int] = {}
+            for mtime, _, job, records in self._entries.values():
+                if records:
+                    latest[job] = max(latest.get(job, 0), mtime)
+        return sorted(latest, key=latest.get, reverse=True)
+
+    def rounds(self, job: str) -> List[dict]:
+        """Parsed rounds of a job, ordered by round number"""
+        with self._lock:
+            if job not in self._rounds:
+                records = [r for e in self._entries.values() if e[2] == job for r in e[3]]
+                # A run resumed from a checkpoint repeats the rounds after it; the later record wins
+                latest = {(r.get("algorithm", DEFAULT_ALGORITHM), r.get("round", 0)): r
+                          for r in sorted(records, key=lambda r: r.get("timestamp", ""))}
+                self._rounds[job] = sorted(latest.values(), key=lambda r: r.get("round", 0))
+            return self._rounds[job]
+
+    def job_summary(self, job: str) -> List[dict]:
+        """Final round of every algorithm in a job"""
+        with self._lock:
+            if job in self._summaries:
+                return self._summaries[job]
+        last: Dict[str, dict] = {}
+        for record in self.rounds(job):
+            last[record.get("algorithm", DEFAULT_ALGORITHM)] = record
+        summary = [
+            {"job": job, "algorithm": name, **{k: r[k] for k in METRIC_KEYS if k in r},
+             "round": r.get("round"), "timestamp": r.get("timestamp"),
+             # Set when the orchestrator replayed the rounds from its result cache
+             "cached_from": r.get("cached_from")}
+            for name, r in last.items()
+        ]
+        with self._lock:
+            self._summaries[job] = summary
+        return summary
+
+    def fingerprint(self, job: Optional[str] = None) -> str:
+        """Digest of the path, mtime and size of a job's result files, or of every job's"""
+        with self._lock:
+            files = sorted((path, e[0], e[1]) for path, e in self._entries.items()
+                           if job is None or e[2] == job)
+        return hashlib.sha1(repr(files).encode()).hexdigest()
+
+    def summaries(self) -> List[dict]:
+        """Final metrics of every (job, algorithm) pair across all jobs"""
+        return [row for job in self.jobs() for row in self.job_summary(job)]
+
+def read_arrow_segment(path: str) -> List[dict]:
+    """Read an Arrow IPC round segment memory-mapped, up to its last complete batch"""
+    # Keep in sync with runner/results_store.py read_arrow_segment; the dashboard
+    # image does not ship the runner modules, so it cannot import that copy
+    rows: List[dict] = []
+    try:
+        with pa.memory_map(path, 'r') as source:
+            reader = pa.ipc.open_stream(source)
+            for batch in reader:
+                rows.extend(batch.to_pylist())
+    except (pa.ArrowInvalid, OSError):
+        # Segment still being written; keep the batches read so far
+        pass
+    return [{k: v for k, v in row.items() if v is not None} for row in rows]
+
+def format_metric(value, fmt: str) -> str:
+    """Format a metric value, or a placeholder when the run did not report it"""
+    return fmt.format(value) if value is not None else "n/a"
+
+def baseline_delta(comparison: Optional[dict], algorithm: str, metric: str, fmt: str):
+    """st.metric delta, help text and whether the change is significant, from a baseline comparison"""
+    result = (comparison or {}).get("algorithms", {}).get(algorithm, {}).get(metric)
+    if not result:
+        return None, None, False
+    help_text = (
+        f"Change vs baseline {', '.join(comparison['baseline'])}: {result['verdict']} "
+        f"({comparison['confidence']:.0%} CI {fmt.format(result['ci_low'])} to {fmt.format(result['ci_high'])})"
+    )
+    return fmt.format(result["delta"]), help_text, result["verdict"] != "unchanged"
+
+@st.cache_resource
+def get_results_index(results_path: str, default_job: str) -> ResultsIndex:
+    """Process-wide results index shared by all sessions and reruns"""
+    return ResultsIndex(Path(results_path), default_job)
+
+# Edge latency percentiles written per round, in ms
+LATENCY_PERCENTILES = {"latency_p50": "p50", "latency_p95": "p95",
+                       "latency_p99": "p99", "latency_p999": "p99.9"}
+
+# Per-round collection timing written by deadline-based rounds
+ROUND_TIMING_KEYS = ["collect_time", "straggler_wait", "round_deadline", "participants"]
+
+# Per-round wall clock and busy percentage of every core, from simulator.py runs
+SIMULATION_KEYS = ["round_duration", "core_utilization"]
+
+HISTORY_KEYS = (["round", "accuracy", "loss", "latency"] + list(LATENCY_PERCENTILES)
+                + ROUND_TIMING_KEYS + SIMULATION_KEYS)
+
+# Edge node detail cards shown before the rest are summarised (simulations run thousands of clients)
+MAX_NODE_CARDS = 12
+
+# Edge node statuses of a round and their chart colors, from on time to missing
+PARTICIPATION_STATUSES = {"active": ("On time", "#2ca02c"), "late": ("Late (stale)", "#ffbf00"),
+                          "straggler": ("Missed deadline", "#ff7f0e"), "dropped": ("Dropped", "#9467bd"),
+                          "failed": ("Failed", "#d62728")}
+
+# Roughly the pixel width of a chart; longer series are downsampled to this
+MAX_CHART_POINTS = 2000
+
+# Indexed columns of the runner/history.py job history that the browser can sort by
+HISTORY_METRICS = {"accuracy": "desc", "loss": "asc", "f1_score": "desc", "inference_latency": "asc",
+                   "latency_p99": "asc", "bandwidth_usage": "asc", "duration": "asc"}
+HISTORY_PAGE_SIZES = [25, 50, 100, 250]
+
+# Parsed results and derived frames/figures are cached per result fingerprint;
+# entries expire after the TTL (s) and the oldest are evicted past max entries
+RESULTS_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", 600))
+RESULTS_CACHE_ENTRIES = int(os.getenv("DASHBOARD_CACHE_ENTRIES", 16))
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling
+    
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            avg_x = x[end:edges[i + 2]].mean()
+            avg_y = y[end:edges[i + 2]].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+def history_trace(df, column: str, name: str, color: str, **kwargs):
+    """Line trace for a history column
+    
+    Short histories keep the original SVG markers. Longer ones switch to
+    WebGL (Scattergl) and are LTTB-downsampled to MAX_CHART_POINTS.
+    """
+    x = df['round'].to_numpy(dtype=float)
+    y = df[column].to_numpy(dtype=float)
+    mask = ~np.isnan(y)
+    x, y = x[mask], y[mask]
+    
+    if len(x) <= MAX_CHART_POINTS:
+        return go.Scatter(
+            x=x, y=y,
+            mode='lines+markers',
+            name=name,
+            line=dict(color=color, width=3),
+            marker=dict(size=8),
+            **kwargs
+        )
+    
+    keep = lttb_indices(x, y, MAX_CHART_POINTS)
+    return go.Scattergl(
+        x=x[keep], y=y[keep],
+        mode='lines',
+        name=name,
+        line=dict(color=color, width=2),
+        **kwargs
+    )
+
+def client_participation(rounds: List[dict], algorithm: str) -> List[dict]:
+    """Rounds per status, mean response time and total lateness of every edge node"""
+    clients: Dict[str, dict] = {}
+    for record in rounds:
+        if record.get("algorithm", DEFAULT_ALGORITHM) != algorithm:
+            continue
+        for node in record.get("edge_nodes") or []:
+            if node.get("response_time") is None:
+                # Written before rounds had deadlines
+                continue
+            entry = clients.setdefault(node["name"], {
+                "name": node["name"], "rounds": 0, **{status: 0 for status in PARTICIPATION_STATUSES},
+                "response_total": 0.0, "lateness": 0.0
+            })
+            entry["rounds"] += 1
+            entry[node["status"]] = entry.get(node["status"], 0) + 1
+            if node["status"] in ("active", "late"):
+                entry["response_total"] += node["response_time"]
+            entry["lateness"] += node.get("lateness") or 0.0
+    for entry in clients.values():
+        answered = entry["active"] + entry["late"]
+        entry["participation"] = answered / entry["rounds"]
+        entry["mean_response"] = entry.pop("response_total") / answered if answered else None
+    return sorted(clients.values(), key=lambda c: c["name"])
+
+def class_metrics(rounds: List[dict], algorithm: str) -> List[dict]:
+    """Per-class precision, recall, F1 and support of an algorithm's latest round"""
+    latest = next((r for r in reversed(rounds) if r.get("algorithm", DEFAULT_ALGORITHM) == algorithm), {})
+    if not latest.get("class_f1"):
+        return []
+    return [
+        {"class": i, "precision": p, "recall": r, "f1_score": f, "support": n}
+        for i, (p, r, f, n) in enumerate(zip(latest["class_precision"], latest["class_recall"],
+                                             latest["class_f1"], latest["class_support"]))
+    ]
+
+@st.cache_data(ttl=RESULTS_CACHE_TTL, max_entries=RESULTS_CACHE_ENTRIES, show_spinner=False)
+def job_view(job: str, fingerprint: str, criteria: List[dict], _index: ResultsIndex) -> dict:
+    """Dashboard data of one job, recomputed only when its result files change
+    
+    ``fingerprint`` is the index digest of the job's files; ``_index`` is
+    excluded from the cache key and only read on a miss.
+    """
+    rounds = _index.rounds(job)
+    last = rounds[-1]
+    total_rounds = last.get("total_rounds", last.get("round", 0))
+    
+    # Algorithms of this job, best ranked first
+    board = rank_algorithms(pd.DataFrame(_index.job_summary(job)), criteria)
+    algorithms = [
+        {
+            "name": row["algorithm"],
+            "metrics": {k: row[k] for k in METRIC_KEYS if k in row and pd.notna(row[k])},
+            "rounds": row["round"],
+            "convergence_round": last.get("convergence_round"),
+            "cached_from": row["cached_from"] if pd.notna(row.get("cached_from")) else None
+        }
+        for row in board.to_dict("records")
+    ]
+    top = algorithms[0]["name"]
+    
+    return {
+        "job_name": job,
+        "fingerprint": fingerprint,
+        "timestamp": last.get("timestamp", ""),
+        "status": last.get("status", "completed" if last.get("round", 0) >= total_rounds else "running"),
+        "source": "results",
+        "algorithms": algorithms,
+        "edge_nodes": last.get("edge_nodes", []),
+        "participation": client_participation(rounds, top),
+        "class_metrics": class_metrics(rounds, top),
+        "training_history": pd.DataFrame([
+            {k: r[k] for k in HISTORY_KEYS if k in r} for r in rounds
+            if r.get("algorithm", DEFAULT_ALGORITHM) == top
+        ])
+    }
+
+@st.cache_data(ttl=RESULTS_CACHE_TTL, max_entries=RESULTS_CACHE_ENTRIES, show_spinner=False)
+def leaderboard_view(fingerprint: str, criteria: List[dict], _index: ResultsIndex) -> pd.DataFrame:
+    """Ranked final metrics across all jobs, keyed by the digest of every result file"""
+    return rank_algorithms(pd.DataFrame(_index.summaries()), criteria)
+
+@st.cache_data(ttl=RESULTS_CACHE_TTL, max_entries=RESULTS_CACHE_ENTRIES, show_spinner=False)
+def cached_training_figures(key: tuple, _df: pd.DataFrame) -> List[go.Figure]:
+    """training_figures for a history identified by ``key`` (job, fingerprint, zoom range)"""
+    return training_figures(_df)
+
+@st.cache_data(ttl=RESULTS_CACHE_TTL, max_entries=RESULTS_CACHE_ENTRIES, show_spinner=False)
+def read_json_file(path: str, mtime_ns: int) -> Optional[dict]:
+    """Parsed JSON file such as sweep.json; ``mtime_ns`` keys the cache so a rewritten file is re-read"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def training_figures(df) -> List[go.Figure]:
+    """Accuracy, loss and (when reported) latency figures for a training history"""
+    # Accuracy over rounds
+    fig_acc = go.Figure()
+    fig_acc.add_trace(history_trace(df, 'accuracy', 'Accuracy', '#1f77b4'))
+    fig_acc.update_layout(
+        title="Accuracy Improvement Across Rounds",
+        xaxis_title="Federated Round",
+        yaxis_title="Accuracy",
+        hovermode='x unified',
+        height=400
+    )
+    
+    # Loss over rounds
+    fig_loss = go.Figure()
+    fig_loss.add_trace(history_trace(df, 'loss', 'Loss', '#ff7f0e'))
+    fig_loss.update_layout(
+        title="Loss Reduction Across Rounds",
+        xaxis_title="Federated Round",
+        yaxis_title="Loss",
+        hovermode='x unified',
+        height=400
+    )
+    
+    # Latency trend (only reported once the latency metric is wired up)
+    if 'latency' not in df:
+        return [fig_acc, fig_loss]
+    
+    fig_latency = go.Figure()
+    percentiles = [k for k in LATENCY_PERCENTILES if k in df]
+    if percentiles:
+        # Tail percentiles merged across all edge nodes, with the mean for reference
+        fig_latency.add_trace(history_trace(df, 'latency', 'Mean', '#2ca02c', line_dash='dot'))
+        colors = px.colors.sequential.Oranges[2::2]
+        for key, color in zip(percentiles, colors):
+            fig_latency.add_trace(history_trace(df, key, LATENCY_PERCENTILES[key], color))
+    else:
+        fig_latency.add_trace(history_trace(df, 'latency', 'Latency', '#2ca02c', fill='tozeroy'))
+    fig_latency.update_layout(
+        title="Inference Latency Optimization",
+        xaxis_title="Federated Round",
+        yaxis_title="Latency (ms)",
+        hovermode='x unified',
+        height=300
+    )
+    return [fig_acc, fig_loss, fig_latency]
+
 class IanvsDashboard:
     def __init__(self):
         self.workspace_path = Path("./runner/workspace/results")
         self.configs_path = Path("./runner/configs")
+        self.live = False
+        self.live_interval = 5
+    
+    def load_job_name(self) -> str:
+        """Job name from benchmarkingjob.yaml, used for rounds written at the top level"""
+        try:
+            with open(self.configs_path / "benchmarkingjob.yaml", 'r') as f:
+                return yaml.safe_load(f)["benchmarkingjob"]["name"]
+        except Exception:
+            return "benchmark"
+
+    def results_index(self) -> ResultsIndex:
+        return get_results_index(str(self.workspace_path), self.load_job_name())
     
     def load_benchmark_results(self):
         """Load benchmark results from workspace"""
-        # Mock data for demonstration (replace with actual Ianvs output parsing)
-        return {
-            "job_name": "federated_learning_edge_benchmark",
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "status": "completed",
-            "algorithms": [
-                {
-                    "name": "FederatedAveraging",
-                    "metrics": {
-                        "accuracy": 0.9234,
-                        "f1_score": 0.9156,
-                        "precision": 0.9301,
-                        "recall": 0.9015,
-                        "inference_latency": 45.2,  # ms
-                        "bandwidth_usage": 1.23  # MB
-                    },
-                    "rounds": 10,
-                    "convergence_round": 7
-                }
-            ],
-            "edge_nodes": [
-                {
-                    "name": "edge-node-1",
-                    "samples": 1024,
-                    "accuracy": 0.9189,
-                    "avg_latency": 42.1,
-                    "status": "active"
-                },
-                {
-                    "name": "edge-node-2",
-                    "samples": 987,
-                    "accuracy": 0.9278,
-                    "avg_latency": 38.9,
-                    "status": "active"
-                },
-                {
-                    "name": "edge-node-3",
-                    "samples": 1105,
-                    "accuracy": 0.9241,
-                    "avg_latency": 54.3,
-                    "status": "active"
-                }
-            ],
-            "training_history": [
-                {"round": 1, "accuracy": 0.7823, "loss": 0.4512, "latency": 89.3},
-                {"round": 2, "accuracy": 0.8234, "loss": 0.3891, "latency": 76.2},
-                {"round": 3, "accuracy": 0.8567, "loss": 0.3245, "latency": 68.5},
-                {"round": 4, "accuracy": 0.8789, "loss": 0.2891, "latency": 61.2},
-                {"round": 5, "accuracy": 0.8945, "loss": 0.2567, "latency": 55.8},
-                {"round": 6, "accuracy": 0.9078, "loss": 0.2234, "latency": 51.3},
-                {"round": 7, "accuracy": 0.9156, "loss": 0.1987, "latency": 47.9},
-                {"round": 8, "accuracy": 0.9201, "loss": 0.1823, "latency": 46.1},
-                {"round": 9, "accuracy": 0.9223, "loss": 0.1756, "latency": 45.5},
-                {"round": 10, "accuracy": 0.9234, "loss": 0.1721, "latency": 45.2}
-            ]
-        }
+        index = self.results_index()
+        index.refresh()
+
+        jobs = index.jobs()
+        if not jobs:
+            data = demo_results()
+            data["source"] = "demo"
+            return data
+
+        job = jobs[0]
+        data = job_view(job, index.fingerprint(job), self.rank_criteria(), index)
+        data["comparison"] = self.load_comparison(job)
+        return data
+    
+    def load_comparison(self, job: str) -> Optional[dict]:
+        """Baseline comparison written next to the run's results by runner/regression.py"""
+        path = self.workspace_path / job / "regression.json"
+        if not path.exists():
+            return None
+        return read_json_file(str(path), path.stat().st_mtime_ns)
+    
+    def rank_criteria(self) -> List[dict]:
+        return load_rank_criteria(self.configs_path / "benchmarkingjob.yaml")
+    
+    def load_leaderboard(self, data) -> pd.DataFrame:
+        """Ranked final metrics of every algorithm across all job runs"""
+        if data.get('source') == 'demo':
+            rows = [{"job": data['job_name'], "algorithm": a['name'], **a['metrics']}
+                    for a in data['algorithms']]
+            return rank_algorithms(pd.DataFrame(rows), self.rank_criteria())
+        index = self.results_index()
+        return leaderboard_view(index.fingerprint(), self.rank_criteria(), index)
     
     def render_header(self):
         """Render dashboard header"""
@@ -122,114 +606,153 @@ class IanvsDashboard:
         """Render overview metrics"""
         st.subheader("📊 Benchmark Overview")
         
-        col1, col2, col3, col4 = st.columns(4)
+        metrics = data['algorithms'][0]['metrics']
+        algorithm = data['algorithms'][0]['name']
+        comparison = data.get('comparison')
+        if comparison and comparison.get('regression'):
+            regressed = [
+                f"{name} ({m})" for name, results in comparison['algorithms'].items()
+                for m, r in results.items() if r['verdict'] == 'regression'
+            ]
+            st.error(f"Significant regression against baseline {', '.join(comparison['baseline'])}: "
+                     + ", ".join(regressed))
+        elif comparison:
+            st.caption(f"Deltas against the pinned baseline {', '.join(comparison['baseline'])}; "
+                       "grey deltas are within the confidence interval")
         
-        with col1:
-            st.metric(
-                label="Overall Accuracy",
-                value=f"{data['algorithms'][0]['metrics']['accuracy']:.2%}",
-                delta="+2.34%"
-            )
+        cached = [a for a in data['algorithms'] if a.get('cached_from')]
+        if cached:
+            st.info("♻️ Served from the result cache (unchanged configs, code and dataset): "
+                    + ", ".join(f"{a['name']} as measured in {a['cached_from']}" for a in cached))
         
-        with col2:
-            st.metric(
-                label="F1 Score",
-                value=f"{data['algorithms'][0]['metrics']['f1_score']:.4f}",
-                delta="+0.0156"
-            )
+        cards = [
+            ("Overall Accuracy", 'accuracy', "{:.2%}", "{:+.2%}", "normal"),
+            ("F1 Score", 'f1_score', "{:.4f}", "{:+.4f}", "normal"),
+            ("Avg Latency", 'inference_latency', "{:.1f} ms", "{:+.1f} ms", "inverse"),
+            ("Bandwidth Used", 'bandwidth_usage', "{:.2f} MB", "{:+.2f} MB", "inverse"),
+        ]
+        for col, (label, key, fmt, delta_fmt, better) in zip(st.columns(4), cards):
+            delta, help_text, significant = baseline_delta(comparison, algorithm, key, delta_fmt)
+            with col:
+                st.metric(
+                    label=label,
+                    value=format_metric(metrics.get(key), fmt),
+                    delta=delta,
+                    delta_color=better if significant else "off",
+                    help=help_text
+                )
         
-        with col3:
-            st.metric(
-                label="Avg Latency",
-                value=f"{data['algorithms'][0]['metrics']['inference_latency']:.1f} ms",
-                delta="-12.3 ms",
-                delta_color="inverse"
-            )
+        st.markdown("---")
+    
+    def follow_training_history(self, job: str, algorithm: str) -> Tuple[pd.DataFrame, int]:
+        """Append rounds of ``algorithm`` newer than the last one this session saw
         
-        with col4:
-            st.metric(
-                label="Bandwidth Used",
-                value=f"{data['algorithms'][0]['metrics']['bandwidth_usage']:.2f} MB",
-                delta="-0.45 MB",
-                delta_color="inverse"
-            )
+        Rounds of every algorithm are interleaved by round number, so progress
+        is tracked as the last round seen rather than a position in the list.
+        Returns the history and that last round, which changes only when rounds
+        were appended.
+        """
+        index = self.results_index()
+        index.refresh()
+        rounds = index.rounds(job)
         
-        st.markdown("---")
+        state = st.session_state.get("live_history")
+        if state is None or state["job"] != job or state["algorithm"] != algorithm:
+            state = None
+        else:
+            latest = max((r.get("round", 0) for r in reversed(rounds)
+                          if r.get("algorithm", DEFAULT_ALGORITHM) == algorithm), default=0)
+            if latest < state["last_round"]:
+                state = None  # A new run replaced the results
+        if state is None:
+            state = {"job": job, "algorithm": algorithm, "last_round": 0,
+                     "columns": {k: [] for k in HISTORY_KEYS}, "frame": pd.DataFrame()}
+            st.session_state["live_history"] = state
+        
+        start = bisect.bisect_right(rounds, state["last_round"], key=lambda r: r.get("round", 0))
+        new = [r for r in rounds[start:] if r.get("algorithm", DEFAULT_ALGORITHM) == algorithm]
+        if new:
+            for record in new:
+                for key, column in state["columns"].items():
+                    column.append(record.get(key))
+            state["last_round"] = new[-1].get("round", 0)
+            state["frame"] = pd.DataFrame({k: v for k, v in state["columns"].items()
+                                           if any(x is not None for x in v)})
+        return state["frame"], state["last_round"]
     
     def render_training_progress(self, data):
         """Render training progress charts"""
         st.subheader("📈 Federated Learning Training Progress")
         
-        df = pd.DataFrame(data['training_history'])
+        if self.live and data.get('source') == 'results':
+            self.render_live_training_charts(
+                data['job_name'], data['algorithms'][0]['name'], data['status'] == 'running'
+            )
+        else:
+            self.render_training_charts(pd.DataFrame(data['training_history']),
+                                        (data['job_name'], data.get('fingerprint')))
         
-        col1, col2 = st.columns(2)
+        st.markdown("---")
+    
+    def render_live_training_charts(self, job: str, algorithm: str, running: bool):
+        """Follow the results directory and only rerun the training charts
         
-        with col1:
-            # Accuracy over rounds
-            fig_acc = go.Figure()
-            fig_acc.add_trace(go.Scatter(
-                x=df['round'],
-                y=df['accuracy'],
-                mode='lines+markers',
-                name='Accuracy',
-                line=dict(color='#1f77b4', width=3),
-                marker=dict(size=8)
-            ))
-            fig_acc.update_layout(
-                title="Accuracy Improvement Across Rounds",
-                xaxis_title="Federated Round",
-                yaxis_title="Accuracy",
-                hovermode='x unified',
-                height=400
-            )
-            st.plotly_chart(fig_acc, use_container_width=True)
+        The charts live in a fragment, so each tick re-renders just this
+        section; new rounds are appended to per-session columns rather than
+        rebuilding the history from every round, and the figures are reused
+        until a tick appends rounds.
+        """
+        @st.experimental_fragment(run_every=self.live_interval if running else None)
+        def live_charts():
+            history, last_round = self.follow_training_history(job, algorithm)
+            if history.empty:
+                st.info(f"Waiting for the first round of {algorithm}")
+                return
+            st.caption(f"Live: {len(history)} rounds, updated {datetime.now():%H:%M:%S}")
+            # Figures are only rebuilt on ticks that appended rounds
+            self.render_training_charts(history, (job, f"live:{algorithm}:{last_round}"))
         
-        with col2:
-            # Loss over rounds
-            fig_loss = go.Figure()
-            fig_loss.add_trace(go.Scatter(
-                x=df['round'],
-                y=df['loss'],
-                mode='lines+markers',
-                name='Loss',
-                line=dict(color='#ff7f0e', width=3),
-                marker=dict(size=8)
-            ))
-            fig_loss.update_layout(
-                title="Loss Reduction Across Rounds",
-                xaxis_title="Federated Round",
-                yaxis_title="Loss",
-                hovermode='x unified',
-                height=400
-            )
-            st.plotly_chart(fig_loss, use_container_width=True)
+        live_charts()
+    
+    def render_training_charts(self, df, cache_key: Optional[tuple] = None):
+        """Render accuracy, loss and latency charts for a training history
         
-        # Latency trend
-        fig_latency = go.Figure()
-        fig_latency.add_trace(go.Scatter(
-            x=df['round'],
-            y=df['latency'],
-            mode='lines+markers',
-            name='Latency',
-            line=dict(color='#2ca02c', width=3),
-            marker=dict(size=8),
-            fill='tozeroy'
-        ))
-        fig_latency.update_layout(
-            title="Inference Latency Optimization",
-            xaxis_title="Federated Round",
-            yaxis_title="Latency (ms)",
-            hovermode='x unified',
-            height=300
-        )
-        st.plotly_chart(fig_latency, use_container_width=True)
+        With a ``cache_key`` (job and result fingerprint) the figures are
+        reused across reruns until the results or the zoom range change.
+        """
+        low = high = None
+        if len(df) > MAX_CHART_POINTS:
+            # Narrowing the range re-samples from the full history, so zooming
+            # in far enough shows every round
+            first, last = int(df['round'].min()), int(df['round'].max())
+            low, high = st.slider("Zoom to rounds", first, last, (first, last))
+            df = df[(df['round'] >= low) & (df['round'] <= high)]
+            if len(df) > MAX_CHART_POINTS:
+                st.caption(f"{len(df):,} rounds downsampled to {MAX_CHART_POINTS:,} points per chart")
         
-        st.markdown("---")
+        if cache_key is None or cache_key[1] is None:
+            figures = training_figures(df)
+        else:
+            figures = cached_training_figures(cache_key + (low, high), df)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(figures[0], use_container_width=True)
+        with col2:
+            st.plotly_chart(figures[1], use_container_width=True)
+        
+        if len(figures) > 2:
+            st.plotly_chart(figures[2], use_container_width=True)
     
     def render_edge_nodes(self, data):
         """Render edge node statistics"""
         st.subheader("🌐 Edge Nodes Performance")
         
+        if not data['edge_nodes']:
+            st.info("No edge node metrics reported for this job yet")
+            st.markdown("---")
+            return
+        
         df_nodes = pd.DataFrame(data['edge_nodes'])
         
         col1, col2 = st.columns([2, 1])
@@ -253,10 +776,22 @@ class IanvsDashboard:
                 yaxis='y2'
             ))
             
+            has_cpu = 'cpu_percent' in df_nodes and df_nodes['cpu_percent'].notna().any()
+            if has_cpu:
+                # Utilization sampled on the node while it trained
+                fig_nodes.add_trace(go.Bar(
+                    name='CPU (%)',
+                    x=df_nodes['name'],
+                    y=df_nodes['cpu_percent'] / 100,
+                    marker_color='#2ca02c',
+                    customdata=df_nodes['cpu_percent'],
+                    hovertemplate="CPU %{customdata:.0f}%<extra></extra>"
+                ))
+            
             fig_nodes.update_layout(
                 title="Edge Nodes: Accuracy vs Latency",
                 xaxis_title="Edge Node",
-                yaxis=dict(title="Accuracy", side='left'),
+                yaxis=dict(title="Accuracy / CPU share" if has_cpu else "Accuracy", side='left'),
                 yaxis2=dict(title="Latency (ms)", overlaying='y', side='right'),
                 barmode='group',
                 height=400
@@ -266,14 +801,25 @@ class IanvsDashboard:
         with col2:
             # Edge node details table
             st.markdown("**Edge Node Details**")
-            for node in data['edge_nodes']:
+            if len(data['edge_nodes']) > MAX_NODE_CARDS:
+                st.caption(f"Showing {MAX_NODE_CARDS} of {len(data['edge_nodes'])} edge nodes")
+            for node in data['edge_nodes'][:MAX_NODE_CARDS]:
                 status_class = f"status-{node['status']}"
+                p99 = f" (p99 {node['p99_latency']:.1f} ms)" if node.get('p99_latency') else ""
+                f1 = f" · F1 {node['f1_score']:.3f}" if node.get('f1_score') is not None else ""
+                usage = []
+                if node.get('cpu_percent') is not None:
+                    usage.append(f"CPU {node['cpu_percent']:.0f}%")
+                if node.get('memory_mb') is not None:
+                    usage.append(f"{node['memory_mb']:.0f} MB")
+                resources = f"<p><strong>Resources:</strong> {' · '.join(usage)}</p>" if usage else ""
                 st.markdown(f"""
                 <div class="metric-card">
                     <h4>{node['name']}</h4>
                     <p><strong>Samples:</strong> {node['samples']}</p>
-                    <p><strong>Accuracy:</strong> {node['accuracy']:.2%}</p>
-                    <p><strong>Latency:</strong> {node['avg_latency']:.1f} ms</p>
+                    <p><strong>Accuracy:</strong> {node['accuracy']:.2%}{f1}</p>
+                    <p><strong>Latency:</strong> {node['avg_latency']:.1f} ms{p99}</p>
+                    {resources}
                     <span class="status-badge {status_class}">{node['status'].upper()}</span>
                 </div>
                 """, unsafe_allow_html=True)
@@ -281,6 +827,124 @@ class IanvsDashboard:
         
         st.markdown("---")
     
+    def render_stragglers(self, data):
+        """Render round collection time and per-client participation under round deadlines"""
+        history = pd.DataFrame(data['training_history'])
+        participation = data.get('participation')
+        if 'straggler_wait' not in history or not participation:
+            return
+        
+        st.subheader("⏱️ Stragglers and Participation")
+        
+        waited = history['straggler_wait'].sum()
+        collected = history['collect_time'].sum()
+        clients = pd.DataFrame(participation)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Time Waiting for Stragglers", f"{waited:.2f} s",
+                      help="Per round: collection time after the median on-time client had answered")
+        with col2:
+            st.metric("Share of Collection Time", f"{waited / collected:.1%}" if collected else "n/a")
+        with col3:
+            st.metric("Mean Updates per Round", f"{history['participants'].mean():.1f} / {len(clients)}")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            fig_rounds = go.Figure()
+            fig_rounds.add_trace(go.Bar(
+                name='Median client',
+                x=history['round'],
+                y=history['collect_time'] - history['straggler_wait'],
+                marker_color='#1f77b4'
+            ))
+            fig_rounds.add_trace(go.Bar(
+                name='Waiting for stragglers',
+                x=history['round'],
+                y=history['straggler_wait'],
+                marker_color='#ff7f0e'
+            ))
+            # Null (and left out of Arrow rows) when rounds wait for every client
+            if 'round_deadline' in history and history['round_deadline'].notna().any():
+                fig_rounds.add_trace(go.Scatter(
+                    name='Round deadline',
+                    x=history['round'],
+                    y=history['round_deadline'],
+                    mode='lines',
+                    line=dict(color='#d62728', dash='dash')
+                ))
+            fig_rounds.update_layout(
+                title="Round Collection Time",
+                xaxis_title="Federated Round",
+                yaxis_title="Seconds",
+                barmode='stack',
+                height=400
+            )
+            st.plotly_chart(fig_rounds, use_container_width=True)
+        
+        with col2:
+            fig_clients = go.Figure()
+            for status, (label, color) in PARTICIPATION_STATUSES.items():
+                if clients[status].any():
+                    fig_clients.add_trace(go.Bar(
+                        name=label,
+                        x=clients['name'],
+                        y=clients[status],
+                        marker_color=color
+                    ))
+            fig_clients.update_layout(
+                title="Client Participation",
+                xaxis_title="Edge Node",
+                yaxis_title="Rounds",
+                barmode='stack',
+                height=400
+            )
+            st.plotly_chart(fig_clients, use_container_width=True)
+        
+        columns = ["name", "participation", "mean_response", "lateness"] + list(PARTICIPATION_STATUSES)
+        st.dataframe(clients[columns], hide_index=True, use_container_width=True)
+        
+        st.markdown("---")
+    
+    def render_simulation(self, data):
+        """Render wall clock and per-core utilization of a local process-pool simulation"""
+        history = pd.DataFrame(data['training_history'])
+        if 'core_utilization' not in history or history['core_utilization'].isna().all():
+            return
+        
+        st.subheader("🖥️ Simulation Resources")
+        
+        rounds = history.dropna(subset=['core_utilization'])
+        cores = np.array(rounds['core_utilization'].tolist(), dtype=float)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Wall Clock", f"{history['round_duration'].sum():.1f} s",
+                      help="Sum of round durations, including aggregation and evaluation")
+        with col2:
+            st.metric("Mean Core Utilization", f"{cores.mean():.0f}%")
+        with col3:
+            st.metric("Clients / Cores", f"{len(data['edge_nodes'])} / {cores.shape[1]}")
+        
+        fig_cores = go.Figure(go.Heatmap(
+            x=rounds['round'],
+            y=[f"cpu{i}" for i in range(cores.shape[1])],
+            z=cores.T,
+            zmin=0,
+            zmax=100,
+            colorscale='Viridis',
+            colorbar=dict(title="Busy %"),
+            hovertemplate="Round %{x}, %{y}: %{z:.0f}%<extra></extra>"
+        ))
+        fig_cores.update_layout(
+            title="Per-Core Utilization",
+            xaxis_title="Federated Round",
+            yaxis_title="Core",
+            height=max(250, 40 * cores.shape[1] + 150)
+        )
+        st.plotly_chart(fig_cores, use_container_width=True)
+        
+        st.markdown("---")
+    
     def render_metrics_radar(self, data):
         """Render radar chart for algorithm metrics"""
         st.subheader("🎯 Algorithm Performance Radar")
@@ -288,30 +952,42 @@ class IanvsDashboard:
         metrics = data['algorithms'][0]['metrics']
         
         # Normalize metrics for radar chart
-        categories = ['Accuracy', 'F1 Score', 'Precision', 'Recall']
-        values = [
-            metrics['accuracy'],
-            metrics['f1_score'],
-            metrics['precision'],
-            metrics['recall']
-        ]
+        labels = {
+            'accuracy': 'Accuracy',
+            'f1_score': 'F1 Score',
+            'precision': 'Precision',
+            'recall': 'Recall'
+        }
+        keys = [key for key in labels if key in metrics]
+        categories = [labels[key] for key in keys]
+        
+        if len(keys) < 3:
+            st.info("Not enough classification metrics reported for a radar chart")
+            st.markdown("---")
+            return
         
         fig = go.Figure()
         
-        fig.add_trace(go.Scatterpolar(
-            r=values,
-            theta=categories,
-            fill='toself',
-            name='FederatedAveraging',
-            line=dict(color='#1f77b4', width=2),
-            marker=dict(size=8)
-        ))
+        # Overlay every algorithm of the job, best ranked first
+        colors = px.colors.qualitative.Plotly
+        lowest = 1.0
+        for i, algorithm in enumerate(data['algorithms']):
+            values = [algorithm['metrics'].get(key, 0.0) for key in keys]
+            lowest = min(lowest, min(values))
+            fig.add_trace(go.Scatterpolar(
+                r=values,
+                theta=categories,
+                fill='toself',
+                name=algorithm['name'],
+                line=dict(color=colors[i % len(colors)], width=2),
+                marker=dict(size=8)
+            ))
         
         fig.update_layout(
             polar=dict(
                 radialaxis=dict(
                     visible=True,
-                    range=[0.85, 1.0]
+                    range=[min(0.85, lowest - 0.05), 1.0]
                 )
             ),
             showlegend=True,
@@ -322,25 +998,272 @@ class IanvsDashboard:
         
         st.markdown("---")
     
-    def render_config_viewer(self):
-        """Render configuration viewer"""
-        st.subheader("⚙️ Configuration Viewer")
+    def render_class_metrics(self, data):
+        """Render per-class precision, recall and F1 of the latest round"""
+        classes = pd.DataFrame(data.get('class_metrics') or [])
+        if classes.empty:
+            return
+        
+        st.subheader("🔢 Per-Class Metrics")
+        st.caption("Derived from the test-set confusion matrix of the latest round")
+        
+        fig = go.Figure()
+        for key, label, color in (("precision", "Precision", '#1f77b4'), ("recall", "Recall", '#ff7f0e'),
+                                  ("f1_score", "F1 Score", '#2ca02c')):
+            fig.add_trace(go.Bar(
+                name=label,
+                x=classes['class'].astype(str),
+                y=classes[key],
+                marker_color=color,
+                customdata=classes['support'],
+                hovertemplate=f"{label} %{{y:.3f}}<br>support %{{customdata}}<extra></extra>"
+            ))
+        fig.update_layout(
+            xaxis_title="Class",
+            yaxis=dict(title="Score", range=[0, 1]),
+            barmode='group',
+            height=350
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown("---")
+    
+    def render_leaderboard(self, data):
+        """Render the weighted ranking of all algorithms across job runs"""
+        st.subheader("🏆 Algorithm Leaderboard")
         
-        config_file = st.selectbox(
-            "Select Configuration",
-            ["algorithm.yaml", "testenv.yaml", "benchmarkingjob.yaml"]
+        criteria = self.rank_criteria()
+        board = self.load_leaderboard(data)
+        if board.empty:
+            st.info("No algorithm metrics to rank yet")
+            st.markdown("---")
+            return
+        
+        st.caption("Score = " + " + ".join(
+            f"{c.get('weight', 1.0)} × {c['name']} ({c.get('order', 'desc')})" for c in criteria
+        ) + ", each min-max normalized across all runs")
+        
+        # The table size and radar selection only rerun this fragment
+        @st.experimental_fragment
+        def board_view():
+            col1, col2 = st.columns([3, 2])
+            
+            with col1:
+                top_n = st.number_input(
+                    "Show top", min_value=1, max_value=len(board), value=min(20, len(board))
+                )
+                columns = ["rank", "job", "algorithm", "score"] + [
+                    c["name"] for c in criteria if c["name"] in board
+                ]
+                shown = board[columns].head(top_n)
+                if 'cached_from' in board and board['cached_from'].notna().any():
+                    shown = shown.assign(cached=board['cached_from'].head(top_n).notna())
+                st.dataframe(shown, hide_index=True, use_container_width=True)
+            
+            with col2:
+                # Offer the best entries only; the full board can be very long
+                candidates = board.head(100)
+                options = [f"#{r.rank} {r.algorithm} ({r.job})" for r in candidates.itertuples()]
+                selected = st.multiselect("Compare on radar", options, default=options[:3])
+            
+                scores = normalized_scores(board, criteria)
+                colors = px.colors.qualitative.Plotly
+                fig = go.Figure()
+                for i, label in enumerate(selected):
+                    row = options.index(label)
+                    fig.add_trace(go.Scatterpolar(
+                        r=scores.iloc[row].tolist(),
+                        theta=[c["name"] for c in criteria],
+                        fill='toself',
+                        name=label,
+                        line=dict(color=colors[i % len(colors)], width=2)
+                    ))
+                fig.update_layout(
+                    polar=dict(radialaxis=dict(visible=True, range=[0, 1])),
+                    showlegend=True,
+                    height=400
+                )
+                st.plotly_chart(fig, use_container_width=True)
+        
+        board_view()
+        
+        st.markdown("---")
+    
+    def load_sweep_results(self) -> Optional[dict]:
+        """Most recent sweep.json written by runner/sweep.py, if any"""
+        candidates = list(self.workspace_path.glob("sweep.json")) + list(self.workspace_path.glob("*/sweep.json"))
+        if not candidates:
+            return None
+        latest = max(candidates, key=lambda p: p.stat().st_mtime)
+        sweep = read_json_file(str(latest), latest.stat().st_mtime_ns)
+        if sweep is None:
+            return None
+        sweep["job"] = latest.parent.name
+        return sweep
+    
+    def render_sweep(self):
+        """Render the batch-size/thread sweep as a throughput vs tail-latency Pareto chart"""
+        sweep = self.load_sweep_results()
+        if not sweep or not sweep.get("points"):
+            return
+        
+        st.subheader("⚡ Edge Inference Sweep")
+        limits = sweep.get("limits", {})
+        st.caption(f"{sweep['job']}: {len(sweep['points'])} grid points under "
+                   f"{limits.get('cpu', '?')} CPU per edge node")
+        
+        df = pd.DataFrame(sweep["points"])
+        df["label"] = df.apply(
+            lambda r: f"batch {r['batch_size']}, {r['intra_op_threads']}x{r['inter_op_threads']} threads",
+            axis=1
+        )
+        front = df[df["pareto"]].sort_values("latency_p99")
+        
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=df["latency_p99"], y=df["samples_per_sec"],
+            mode='markers',
+            name='Grid point',
+            marker=dict(size=9, color='#c7c7c7'),
+            text=df["label"],
+            hovertemplate="%{text}<br>p99 %{x:.3f} ms<br>%{y:,.0f} samples/s<extra></extra>"
+        ))
+        fig.add_trace(go.Scatter(
+            x=front["latency_p99"], y=front["samples_per_sec"],
+            mode='lines+markers',
+            name='Pareto frontier',
+            line=dict(color='#d62728', width=2),
+            marker=dict(size=11),
+            text=front["label"],
+            hovertemplate="%{text}<br>p99 %{x:.3f} ms<br>%{y:,.0f} samples/s<extra></extra>"
+        ))
+        fig.update_layout(
+            title="Throughput vs p99 Latency",
+            xaxis_title="p99 Latency (ms)",
+            yaxis_title="Samples / sec",
+            height=450
         )
+        st.plotly_chart(fig, use_container_width=True)
         
+        columns = ["batch_size", "intra_op_threads", "inter_op_threads", "samples_per_sec",
+                   "latency_p50", "latency_p99", "peak_rss_mb"]
+        st.dataframe(front[[c for c in columns if c in front]], use_container_width=True, hide_index=True)
+        
+        st.markdown("---")
+    
+    @property
+    def history_path(self) -> Path:
+        return self.workspace_path.parent / "history.db"
+    
+    def query_history(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        """Run a read-only query against the job history index"""
+        uri = f"file:{self.history_path.resolve()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True)
         try:
-            config_path = self.configs_path / config_file
-            if config_path.exists():
-                with open(config_path, 'r') as f:
-                    config_content = f.read()
-                st.code(config_content, language='yaml')
-            else:
-                st.warning(f"Configuration file {config_file} not found")
-        except Exception as e:
-            st.error(f"Error reading configuration: {str(e)}")
+            return pd.read_sql_query(sql, conn, params=params)
+        finally:
+            conn.close()
+    
+    def render_job_history(self):
+        """Render the job history browser over the SQLite index written by the runner
+        
+        Filters, sorting and paging are pushed down to indexed queries, and
+        the browser is a fragment so its widgets do not rerun the page.
+        """
+        if not self.history_path.exists():
+            return
+        
+        st.subheader("🗂️ Job History")
+        
+        @st.experimental_fragment
+        def history_browser():
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                jobs = self.query_history("SELECT DISTINCT job_name FROM results ORDER BY job_name")
+                job = st.selectbox("Job", ["All jobs"] + jobs["job_name"].tolist())
+            with col2:
+                algorithms = self.query_history("SELECT DISTINCT algorithm FROM results ORDER BY algorithm")
+                algorithm = st.selectbox("Algorithm", ["All algorithms"] + algorithms["algorithm"].tolist())
+            with col3:
+                sort_by = st.selectbox("Sort by", ["timestamp"] + list(HISTORY_METRICS))
+            with col4:
+                page_size = st.selectbox("Rows per page", HISTORY_PAGE_SIZES)
+            
+            where, params = [], []
+            if job != "All jobs":
+                where.append("job_name = ?")
+                params.append(job)
+            if algorithm != "All algorithms":
+                where.append("algorithm = ?")
+                params.append(algorithm)
+            if sort_by != "timestamp":
+                # Runs that never reported the metric cannot be ranked by it
+                where.append(f"{sort_by} IS NOT NULL")
+            clause = f"WHERE {' AND '.join(where)}" if where else ""
+            
+            total = int(self.query_history(f"SELECT COUNT(*) AS n FROM results {clause}", tuple(params))["n"][0])
+            if not total:
+                st.info("No runs match these filters")
+                return
+            pages = (total + page_size - 1) // page_size
+            page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+            
+            # Column names come from HISTORY_METRICS, never from free text
+            order = HISTORY_METRICS.get(sort_by, "desc").upper()
+            runs = self.query_history(
+                f"SELECT run_id, job_name, algorithm, timestamp, status, rounds, convergence_round, "
+                f"duration, {', '.join(m for m in HISTORY_METRICS if m != 'duration')} "
+                f"FROM results {clause} ORDER BY {sort_by} {order}, run_id DESC "
+                f"LIMIT ? OFFSET ?",
+                tuple(params) + (page_size, (page - 1) * page_size)
+            )
+            st.caption(f"{total:,} results; showing {len(runs)} sorted by {sort_by} ({order.lower()})")
+            st.dataframe(runs, hide_index=True, use_container_width=True)
+            
+            labels = [f"{r.run_id} / {r.algorithm}" for r in runs.itertuples()]
+            selected = st.multiselect("Compare runs", labels, default=labels[:min(3, len(labels))])
+            metric = st.selectbox("Compare metric", list(HISTORY_METRICS))
+            if selected:
+                chosen = runs[[label in selected for label in labels]]
+                fig = go.Figure(go.Bar(
+                    x=[f"{r.run_id}<br>{r.algorithm}" for r in chosen.itertuples()],
+                    y=chosen[metric],
+                    marker_color='#1f77b4'
+                ))
+                fig.update_layout(title=f"{metric} across runs", yaxis_title=metric, height=350)
+                st.plotly_chart(fig, use_container_width=True)
+        
+        history_browser()
+        
+        st.markdown("---")
+    
+    def render_config_viewer(self):
+        """Render configuration viewer
+        
+        The viewer is a fragment: picking another file reruns only this
+        section and never reloads result data.
+        """
+        st.subheader("⚙️ Configuration Viewer")
+        
+        @st.experimental_fragment
+        def config_viewer():
+            config_file = st.selectbox(
+                "Select Configuration",
+                ["algorithm.yaml", "testenv.yaml", "benchmarkingjob.yaml"]
+            )
+            
+            try:
+                config_path = self.configs_path / config_file
+                if config_path.exists():
+                    with open(config_path, 'r') as f:
+                        config_content = f.read()
+                    st.code(config_content, language='yaml')
+                else:
+                    st.warning(f"Configuration file {config_file} not found")
+            except Exception as e:
+                st.error(f"Error reading configuration: {str(e)}")
+        
+        config_viewer()
     
     def render_sidebar(self, data):
         """Render sidebar with job info"""
@@ -357,6 +1280,8 @@ class IanvsDashboard:
                 "failed": "🔴"
             }
             st.markdown(f"**Status:** {status_color.get(data['status'], '⚪')} {data['status'].upper()}")
+            if data.get('source') == 'demo':
+                st.caption(f"No round results in {self.workspace_path}; showing demo data")
             
             st.markdown("---")
             
@@ -364,6 +1289,15 @@ class IanvsDashboard:
             if st.button("🔄 Refresh Results"):
                 st.rerun()
             
+            self.live = st.toggle(
+                "📡 Live training updates",
+                disabled=data.get('source') != 'results',
+                help="Follow the results directory and refresh only the training charts"
+            )
+            self.live_interval = st.number_input(
+                "Live refresh interval (s)", min_value=1, max_value=60, value=5
+            )
+            
             if st.button("📥 Download Report"):
                 st.info("Report download feature coming soon!")
             
@@ -391,7 +1325,13 @@ class IanvsDashboard:
         self.render_overview(data)
         self.render_training_progress(data)
         self.render_edge_nodes(data)
+        self.render_stragglers(data)
+        self.render_simulation(data)
         self.render_metrics_radar(data)
+        self.render_class_metrics(data)
+        self.render_leaderboard(data)
+        self.render_sweep()
+        self.render_job_history()
         self.render_config_viewer()
         
         # Footer
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Ianvs Ranking Engine - Weighted multi-criteria algorithm leaderboard
+Applies the rank.sort_by weights and orders from benchmarkingjob.yaml to the
+final metrics of every algorithm across all job runs in one vectorized pass
+"""
+
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import yaml
+
+DEFAULT_CRITERIA = [
+    {"name": "accuracy", "weight": 0.4, "order": "desc"},
+    {"name": "f1_score", "weight": 0.3, "order": "desc"},
+    {"name": "inference_latency", "weight": 0.2, "order": "asc"},
+    {"name": "bandwidth_usage", "weight": 0.1, "order": "asc"},
+]
+
+
+def load_rank_criteria(config_path: Path) -> List[Dict]:
+    """Read rank.sort_by from benchmarkingjob.yaml, falling back to the shipped defaults"""
+    try:
+        with open(config_path, 'r') as f:
+            config = yaml.safe_load(f)
+        return config["benchmarkingjob"]["rank"]["sort_by"]
+    except Exception:
+        return DEFAULT_CRITERIA
+
+
+def normalized_scores(frame: pd.DataFrame, criteria: List[Dict]) -> pd.DataFrame:
+    """Min-max normalize every criterion column to [0, 1], where 1 is best
+
+    Columns with "asc" order (lower is better) are inverted. A criterion with
+    the same value for every row scores 1, and a missing value scores 0.
+    """
+    names = [c["name"] for c in criteria]
+    values = frame.reindex(columns=names).to_numpy(dtype=float)
+
+    missing = np.isnan(values)
+    lo = np.where(missing, np.inf, values).min(axis=0)
+    hi = np.where(missing, -np.inf, values).max(axis=0)
+    span = hi - lo
+    flat = ~(span > 0)  # also true for all-missing columns
+    scaled = (values - lo) / np.where(flat, 1.0, span)
+
+    ascending = np.array([c.get("order", "desc") == "asc" for c in criteria])
+    scaled[:, ascending] = 1.0 - scaled[:, ascending]
+    scaled[:, flat] = 1.0
+    scaled[missing] = 0.0
+    return pd.DataFrame(scaled, columns=names, index=frame.index)
+
+
+def rank_algorithms(frame: pd.DataFrame, criteria: List[Dict]) -> pd.DataFrame:
+    """Leaderboard of the frame's rows ordered by weighted criterion score
+
+    The frame holds one row per (job, algorithm) with a column per metric.
+    The result adds a ``score`` in [0, 1] and a 1-based ``rank``.
+    """
+    if frame.empty:
+        return frame.assign(score=pd.Series(dtype=float), rank=pd.Series(dtype=int))
+
+    weights = np.array([float(c.get("weight", 1.0)) for c in criteria])
+    scores = normalized_scores(frame, criteria).to_numpy() @ weights
+    if weights.sum() > 0:
+        scores = scores / weights.sum()
+
+    order = np.argsort(-scores, kind="stable")
+    board = frame.iloc[order].copy()
+    board["score"] = scores[order]
+    board.insert(0, "rank", np.arange(1, len(board) + 1))
+    return board.reset_index(drop=True)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Ianvs Aggregation Engine - Streaming server-side model aggregation
+Edge updates are flat float32 buffers folded into the running aggregate as
+they arrive, so memory stays proportional to the model size rather than to
+the number of clients.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+
+class Aggregator:
+    """Streaming aggregation interface: reset per round, add each update, read the result"""
+
+    name = "base"
+
+    def __init__(self, size: int):
+        self.size = size
+        self.count = 0
+        self.global_weights = None
+
+    def reset(self, global_weights: np.ndarray):
+        """Start a new round from the current global model"""
+        self.count = 0
+        self.global_weights = global_weights
+
+    def add(self, weights: np.ndarray, samples: int, scale: float = 1.0):
+        """Fold in one client model; ``scale`` discounts it further, e.g. for staleness"""
+        raise NotImplementedError
+
+    def result(self) -> np.ndarray:
+        raise NotImplementedError
+
+    def client_params(self) -> Dict:
+        """Extra training parameters sent to the edge clients"""
+        return {}
+
+
+class FedAvg(Aggregator):
+    """Sample-weighted average of the client models (McMahan et al.)"""
+
+    name = "fedavg"
+
+    def __init__(self, size: int, weighted: bool = True):
+        super().__init__(size)
+        self.weighted = weighted
+        self._sum = np.zeros(size, dtype=np.float64)
+        self._scratch = np.empty(size, dtype=np.float64)
+        self._total = 0.0
+
+    def reset(self, global_weights: np.ndarray):
+        super().reset(global_weights)
+        self._sum.fill(0.0)
+        self._total = 0.0
+
+    def add(self, weights: np.ndarray, samples: int, scale: float = 1.0):
+        weight = (float(samples) if self.weighted else 1.0) * scale
+        if weight <= 0:
+            return
+        np.multiply(weights, weight, out=self._scratch)
+        self._sum += self._scratch
+        self._total += weight
+        self.count += 1
+
+    def result(self) -> np.ndarray:
+        if self._total == 0:
+            return self.global_weights.astype(np.float32, copy=True)
+        return (self._sum / self._total).astype(np.float32)
+
+
+class FedProx(FedAvg):
+    """FedAvg on the server; clients add a proximal term mu/2 * ||w - w_global||^2"""
+
+    name = "fedprox"
+
+    def __init__(self, size: int, weighted: bool = True, mu: float = 0.01):
+        super().__init__(size, weighted)
+        self.mu = mu
+
+    def client_params(self) -> Dict:
+        return {"mu": self.mu}
+
+
+class TrimmedMean(Aggregator):
+    """Coordinate-wise mean after dropping the k largest and k smallest values
+
+    Only the running sum and the k extremes per coordinate are kept, so memory
+    is O(k * model size). k is trim_ratio of the expected client count and is
+    reduced when too few updates arrive to trim that many. Updates are
+    unweighted, so sample counts and staleness scales are ignored.
+    """
+
+    name = "trimmed_mean"
+
+    def __init__(self, size: int, clients: int = 3, trim_ratio: float = 0.1):
+        super().__init__(size)
+        self.k = int(clients * trim_ratio)
+        self._sum = np.zeros(size, dtype=np.float64)
+        self._high = np.empty((self.k, size), dtype=np.float64)
+        self._low = np.empty((self.k, size), dtype=np.float64)
+        self._carry = np.empty(size, dtype=np.float64)
+        self._kept = np.empty(size, dtype=np.float64)
+
+    def reset(self, global_weights: np.ndarray):
+        super().reset(global_weights)
+        self._sum.fill(0.0)
+        self._high.fill(-np.inf)
+        self._low.fill(np.inf)
+
+    def _insert(self, extremes: np.ndarray, values: np.ndarray, keep, drop):
+        """Insert into per-coordinate sorted extremes; keep is np.maximum for the top k"""
+        np.copyto(self._carry, values)
+        for row in extremes:
+            keep(row, self._carry, out=self._kept)
+            drop(row, self._carry, out=self._carry)
+            row[:] = self._kept
+
+    def add(self, weights: np.ndarray, samples: int, scale: float = 1.0):
+        self._sum += weights
+        if self.k:
+            self._insert(self._high, weights, np.maximum, np.minimum)
+            self._insert(self._low, weights, np.minimum, np.maximum)
+        self.count += 1
+
+    def result(self) -> np.ndarray:
+        if self.count == 0:
+            return self.global_weights.astype(np.float32, copy=True)
+        k = min(self.k, (self.count - 1) // 2)
+        total = self._sum - self._high[:k].sum(axis=0) - self._low[:k].sum(axis=0)
+        return (total / (self.count - 2 * k)).astype(np.float32)
+
+
+AGGREGATORS = {
+    FedAvg.name: FedAvg,
+    FedProx.name: FedProx,
+    TrimmedMean.name: TrimmedMean,
+}
+
+
+def build_aggregator(size: int, clients: int, hyperparameters: Dict) -> Aggregator:
+    """Aggregator for the aggregation module hyperparameters in algorithm.yaml"""
+    algorithm = hyperparameters.get("aggregation_algorithm", "fedavg").lower()
+    if algorithm not in AGGREGATORS:
+        raise ValueError(f"Unknown aggregation_algorithm '{algorithm}', expected one of {sorted(AGGREGATORS)}")
+    if algorithm == TrimmedMean.name:
+        return TrimmedMean(size, clients, float(hyperparameters.get("trim_ratio", 0.1)))
+    weighted = bool(hyperparameters.get("weighted", True))
+    if algorithm == FedProx.name:
+        return FedProx(size, weighted, float(hyperparameters.get("mu", 0.01)))
+    return FedAvg(size, weighted)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Ianvs Checkpoints - Atomic round checkpoints for resuming interrupted runs
+After every checkpointed round the orchestrator saves the global model, the
+round records so far and the error-feedback state of in-process clients to
+workspace/checkpoints/<run>/<algorithm>/round-<n>. A restarted orchestrator
+finds the unfinished run of its job, reopens its results directory and
+continues after the last saved round. Old rounds are pruned as new ones land
+and a run's checkpoints are removed once it finishes.
+"""
+
+import argparse
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import yaml
+
+CHECKPOINT_DIR = "checkpoints"
+
+RUN_FILE = "run.json"
+
+DEFAULT_CHECKPOINT = {
+    "enabled": True,
+    "every": 1,  # Rounds between checkpoints; the final round is always saved
+    "keep": 2,  # Checkpoints kept per algorithm
+}
+
+
+@dataclass
+class Checkpoint:
+    """State after ``round`` completed rounds of one algorithm"""
+    round: int
+    weights: np.ndarray
+    history: List[Dict]
+    key: str
+    clients: Dict[str, np.ndarray] = field(default_factory=dict)
+    elapsed: float = 0.0  # Wall seconds the algorithm had run, counted against execution.timeout on resume
+
+
+def fsync_dir(path: Path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_synced(path: Path, data: bytes):
+    with open(path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class CheckpointStore:
+    """Checkpoints of every unfinished run under one root, one directory per saved round
+
+    A round is written to a temporary directory, synced and renamed into
+    place, so a checkpoint directory is either complete or absent.
+    """
+
+    def __init__(self, root: Path, every: int = 1, keep: int = 2):
+        self.root = root
+        self.every = max(1, every)
+        self.keep = max(1, keep)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def open(cls, workspace: Path, settings: Optional[Dict] = None) -> Optional["CheckpointStore"]:
+        """Store under workspace/checkpoints, or None when disabled in benchmarkingjob.yaml"""
+        settings = {**DEFAULT_CHECKPOINT, **(settings or {})}
+        if not settings["enabled"]:
+            return None
+        return cls(workspace / CHECKPOINT_DIR, int(settings["every"]), int(settings["keep"]))
+
+    def due(self, round_num: int, total_rounds: int) -> bool:
+        return round_num % self.every == 0 or round_num == total_rounds
+
+    def start_run(self, run_id: str, job_name: str, key: str):
+        """Register a run so a restart with the same job key can find it"""
+        run_root = self.root / run_id
+        run_root.mkdir(parents=True, exist_ok=True)
+        info = {"run_id": run_id, "job_name": job_name, "key": key, "started": datetime.now().isoformat()}
+        tmp_path = run_root / (RUN_FILE + ".tmp")
+        write_synced(tmp_path, json.dumps(info).encode())
+        os.replace(tmp_path, run_root / RUN_FILE)
+
+    def runs(self, job_name: Optional[str] = None) -> List[Dict]:
+        """Registered unfinished runs, oldest first"""
+        runs = []
+        for path in sorted(self.root.glob(f"*/{RUN_FILE}")):
+            try:
+                with open(path, 'r') as f:
+                    info = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            if job_name is None or info["job_name"] == job_name:
+                runs.append(info)
+        return sorted(runs, key=lambda r: r["started"])
+
+    def unfinished(self, job_name: str, key: str) -> Optional[str]:
+        """Latest unfinished run of the job started with the same job key
+
+        Unfinished runs of the job under a different key (changed configs or
+        code) can never be resumed and are removed.
+        """
+        resumable = None
+        for info in self.runs(job_name):
+            if info["key"] == key:
+                resumable = info["run_id"]
+            else:
+                self.finish(info["run_id"])
+        return resumable
+
+    def save(self, run_id: str, algorithm: str, checkpoint: Checkpoint) -> Path:
+        directory = self.root / run_id / algorithm
+        directory.mkdir(parents=True, exist_ok=True)
+        final = directory / f"round-{checkpoint.round:05d}"
+        tmp = directory / f".round-{checkpoint.round:05d}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        with open(tmp / "weights.npy", 'wb') as f:
+            np.save(f, checkpoint.weights)
+            f.flush()
+            os.fsync(f.fileno())
+        with open(tmp / "clients.npz", 'wb') as f:
+            np.savez(f, **checkpoint.clients)
+            f.flush()
+            os.fsync(f.fileno())
+        state = {"round": checkpoint.round, "key": checkpoint.key, "saved": datetime.now().isoformat(),
+                 "elapsed": checkpoint.elapsed, "history": checkpoint.history}
+        write_synced(tmp / "state.json", json.dumps(state).encode())
+        fsync_dir(tmp)
+        shutil.rmtree(final, ignore_errors=True)
+        os.replace(tmp, final)
+        fsync_dir(directory)
+        self.prune(run_id, algorithm)
+        return final
+
+    def rounds(self, run_id: str, algorithm: str) -> List[Path]:
+        """Complete checkpoint directories of an algorithm, oldest first"""
+        return sorted((self.root / run_id / algorithm).glob("round-*"))
+
+    def prune(self, run_id: str, algorithm: str):
+        for path in self.rounds(run_id, algorithm)[:-self.keep]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def latest(self, run_id: str, algorithm: str, key: str) -> Optional[Checkpoint]:
+        """Newest readable checkpoint of an algorithm saved under ``key``"""
+        for path in reversed(self.rounds(run_id, algorithm)):
+            try:
+                with open(path / "state.json", 'r') as f:
+                    state = json.load(f)
+                weights = np.load(path / "weights.npy")
+                with np.load(path / "clients.npz") as clients:
+                    residuals = {name: clients[name] for name in clients.files}
+            except (OSError, ValueError, KeyError):
+                continue
+            if state["key"] != key:
+                return None
+            return Checkpoint(state["round"], weights, state["history"], key, residuals, state.get("elapsed", 0.0))
+        return None
+
+    def finish(self, run_id: str):
+        """Drop every checkpoint of a run that completed"""
+        shutil.rmtree(self.root / run_id, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or remove checkpoints of unfinished runs")
+    parser.add_argument("--config-dir", type=Path, default=Path(__file__).parent / "configs")
+    parser.add_argument(
+        "--workspace",
+        type=Path,
+        default=Path(os.getenv("IANVS_WORKSPACE", Path(__file__).parent / "workspace"))
+    )
+    parser.add_argument("--clear", action="store_true", help="Remove the checkpoints of every unfinished run")
+    args = parser.parse_args()
+
+    with open(args.config_dir / "benchmarkingjob.yaml", 'r') as f:
+        settings = yaml.safe_load(f)["benchmarkingjob"].get("checkpoint", {})
+    store = CheckpointStore.open(args.workspace, settings)
+    if store is None:
+        print("Checkpointing disabled in benchmarkingjob.yaml")
+        return
+    runs = store.runs()
+    if args.clear:
+        for info in runs:
+            store.finish(info["run_id"])
+        print(f"Removed the checkpoints of {len(runs)} unfinished run(s)")
+        return
+    print(f"{len(runs)} unfinished run(s) in {store.root}")
+    for info in runs:
+        saved = []
+        for directory in sorted(p for p in (store.root / info["run_id"]).iterdir() if p.is_dir()):
+            rounds = store.rounds(info["run_id"], directory.name)
+            if rounds:
+                saved.append(f"{directory.name} round {int(rounds[-1].name.split('-')[1])}")
+        print(f"  {info['run_id']} (started {info['started']}): {', '.join(saved) or 'no rounds saved'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Ianvs Dataset Preparation - Converts the testenv dataset into memory-mapped shards
+The source is read once into .npy arrays. Each IID or Dirichlet non-IID client
+split gets a copy of the training rows in shard order, so a client's shard is
+one contiguous row range and each edge worker maps only its own pages.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import pickle
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+from model import make_synthetic_dataset
+
+RUNNER_DIR = Path(__file__).parent
+CONFIG_DIR = RUNNER_DIR / "configs"
+
+MANIFEST = "manifest.json"
+SPLIT_METHODS = ("default", "iid", "dirichlet")
+MIN_SHARD_SAMPLES = 10
+
+
+@dataclass
+class DatasetSpec:
+    name: str
+    train_url: str
+    test_url: str
+    format: str = "pkl"
+
+    @classmethod
+    def from_testenv(cls, path: Path) -> "DatasetSpec":
+        with open(path, 'r') as f:
+            dataset = yaml.safe_load(f)["testenv"]["dataset"]
+        url = dataset.get("url", "")
+        return cls(
+            name=dataset.get("name", "dataset").lower(),
+            train_url=dataset.get("train_url", url),
+            test_url=dataset.get("test_url", url),
+            format=dataset.get("format", "pkl"),
+        )
+
+
+def resolve_source(url: str, fmt: str) -> Optional[Path]:
+    """Source file for a dataset url; directories are searched for a *.{fmt} file
+
+    Relative urls are tried against the working directory, runner/ and the
+    repo root, matching how the configs are used locally and in the image.
+    """
+    for base in (Path.cwd(), RUNNER_DIR, RUNNER_DIR.parent):
+        path = base / url
+        if path.is_file():
+            return path
+        if path.is_dir():
+            matches = sorted(path.glob(f"*.{fmt}")) + sorted(path.glob(f"*.{fmt}.gz"))
+            if matches:
+                return matches[0]
+    return None
+
+
+def read_source(path: Path) -> Tuple[np.ndarray, np.ndarray]:
+    """Features and labels from a pickled (X, y) pair or {"X"/"data", "y"/"labels"} dict"""
+    if path.suffix == ".npz":
+        with np.load(path) as data:
+            obj = {key: data[key] for key in data.files}
+    else:
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, 'rb') as f:
+            obj = pickle.load(f)
+
+    if isinstance(obj, dict):
+        X = next(obj[k] for k in ("X", "x", "data", "images", "features") if k in obj)
+        y = next(obj[k] for k in ("y", "labels", "targets", "target") if k in obj)
+    else:
+        X, y = obj
+
+    X = np.asarray(X)
+    if X.dtype == np.uint8:
+        X = X.astype(np.float32) / 255.0
+    return X.reshape(len(X), -1).astype(np.float32), np.asarray(y).astype(np.int64)
+
+
+def save_array(path: Path, array: np.ndarray):
+    """Write an .npy file atomically"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def save_rows(path: Path, source: np.ndarray, shards: List[np.ndarray]):
+    """Write the rows of ``source`` selected by each shard, shard after shard, as one .npy file atomically"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    total = sum(len(shard) for shard in shards)
+    out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=source.dtype, shape=(total,) + source.shape[1:])
+    start = 0
+    for shard in shards:
+        out[start:start + len(shard)] = source[shard]
+        start += len(shard)
+    out.flush()
+    del out
+    os.replace(tmp_path, path)
+
+
+def iid_split(y: np.ndarray, clients: int, seed: int = 0) -> List[np.ndarray]:
+    """Equal-sized random shards"""
+    order = np.random.default_rng(seed).permutation(len(y))
+    return [np.sort(shard) for shard in np.array_split(order, clients)]
+
+
+def dirichlet_split(y: np.ndarray, clients: int, alpha: float = 0.5, seed: int = 0) -> List[np.ndarray]:
+    """Label-skewed shards: each class is spread over clients with Dirichlet(alpha) proportions
+
+    Smaller alpha gives more skewed shards. Proportions are redrawn until every
+    client has at least MIN_SHARD_SAMPLES rows, as in the usual FL benchmarks.
+    """
+    rng = np.random.default_rng(seed)
+    by_class = [np.flatnonzero(y == c) for c in np.unique(y)]
+    minimum = min(MIN_SHARD_SAMPLES, len(y) // clients)
+    for _ in range(100):
+        shards = [[] for _ in range(clients)]
+        for indices in by_class:
+            indices = rng.permutation(indices)
+            proportions = rng.dirichlet(np.full(clients, alpha))
+            cuts = (np.cumsum(proportions)[:-1] * len(indices)).astype(int)
+            for shard, part in zip(shards, np.split(indices, cuts)):
+                shard.append(part)
+        shards = [np.sort(np.concatenate(parts)) for parts in shards]
+        if min(len(s) for s in shards) >= minimum:
+            return shards
+    raise ValueError(f"Could not draw a Dirichlet(alpha={alpha}) split with {minimum} samples per client")
+
+
+def split_key(method: str, clients: int, alpha: float, seed: int) -> str:
+    if method == "dirichlet":
+        return f"dirichlet-a{alpha:g}-c{clients}-s{seed}"
+    return f"iid-c{clients}-s{seed}"
+
+
+class PreparedDataset:
+    """Read side of a prepared dataset directory"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path / MANIFEST, 'r') as f:
+            self.manifest = json.load(f)
+
+    @classmethod
+    def find(cls, path: Path) -> Optional["PreparedDataset"]:
+        return cls(path) if (path / MANIFEST).exists() else None
+
+    @property
+    def n_features(self) -> int:
+        return self.manifest["n_features"]
+
+    @property
+    def n_classes(self) -> int:
+        return self.manifest["n_classes"]
+
+    def arrays(self, part: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Memory-mapped features and labels of the "train" or "test" part"""
+        return (np.load(self.path / f"{part}_X.npy", mmap_mode="r"),
+                np.load(self.path / f"{part}_y.npy", mmap_mode="r"))
+
+    def shard(self, client: int, key: Optional[str] = None, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows of one client's shard (0-based), read through the memory map
+
+        The shard is a contiguous row range of the split's files, so only its
+        own pages are touched. The rows are shuffled afterwards so a
+        train/validation cut is not label-ordered.
+        """
+        key = key or self.manifest["latest_split"]
+        start, stop = self.manifest["splits"][key]["offsets"][client:client + 2]
+        X = np.load(self.path / key / "train_X.npy", mmap_mode="r")[start:stop]
+        y = np.load(self.path / key / "train_y.npy", mmap_mode="r")[start:stop]
+        order = np.random.default_rng(seed + client).permutation(stop - start)
+        return X[order], y[order]
+
+
+def prepare_dataset(spec: DatasetSpec, out_dir: Path, clients: int, method: str = "default",
+                    alpha: float = 0.5, seed: int = 0, synthetic_samples: int = 1000) -> PreparedDataset:
+    """Convert the source once and write the shard index files for one split
+
+    Re-running is cheap: conversion is skipped while the source is unchanged
+    and an existing split is reused. Without a source file, a synthetic
+    dataset of ``synthetic_samples`` rows per client is written instead.
+    """
+    if method not in SPLIT_METHODS:
+        raise ValueError(f"Unknown splitting_method '{method}', expected one of {SPLIT_METHODS}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    train_source = resolve_source(spec.train_url, spec.format)
+    test_source = resolve_source(spec.test_url, spec.format)
+
+    if train_source and test_source:
+        sources = [train_source, test_source]
+        source = {str(p): [p.stat().st_mtime_ns, p.stat().st_size] for p in sources}
+    else:
+        sources = []
+        source = {"synthetic": [clients, synthetic_samples]}
+
+    existing = PreparedDataset.find(out_dir)
+    manifest = existing.manifest if existing and existing.manifest["source"] == source else None
+
+    if manifest is None:
+        if sources:
+            print(f"Converting {spec.name} from {train_source} and {test_source}...")
+            X_train, y_train = read_source(train_source)
+            X_test, y_test = read_source(test_source)
+        else:
+            print(f"No {spec.format} source for {spec.name} at {spec.train_url}; writing a synthetic dataset")
+            X_train, y_train = make_synthetic_dataset(clients * synthetic_samples, seed=1)
+            X_test, y_test = make_synthetic_dataset(2000, seed=12345)
+        for part, X, y in (("train", X_train, y_train), ("test", X_test, y_test)):
+            save_array(out_dir / f"{part}_X.npy", X)
+            save_array(out_dir / f"{part}_y.npy", y)
+        manifest = {
+            "name": spec.name,
+            "source": source,
+            "n_features": int(X_train.shape[1]),
+            "n_classes": int(max(y_train.max(), y_test.max()) + 1),
+            "train_samples": int(len(y_train)),
+            "test_samples": int(len(y_test)),
+            "splits": {},
+        }
+
+    key = split_key("dirichlet" if method == "dirichlet" else "iid", clients, alpha, seed)
+    # Splits from before shards were contiguous only stored index files
+    if "offsets" not in manifest["splits"].get(key, {}):
+        X = np.load(out_dir / "train_X.npy", mmap_mode="r")
+        y = np.load(out_dir / "train_y.npy", mmap_mode="r")
+        if method == "dirichlet":
+            shards = dirichlet_split(np.asarray(y), clients, alpha, seed)
+        else:
+            shards = iid_split(y, clients, seed)
+        shutil.rmtree(out_dir / key, ignore_errors=True)
+        (out_dir / key).mkdir()
+        save_rows(out_dir / key / "train_X.npy", X, shards)
+        save_rows(out_dir / key / "train_y.npy", y, shards)
+        sizes = [int(len(s)) for s in shards]
+        manifest["splits"][key] = {
+            "method": method, "alpha": alpha, "seed": seed, "clients": clients,
+            "offsets": [0] + np.cumsum(sizes).tolist(), "sizes": sizes,
+        }
+    manifest["latest_split"] = key
+
+    tmp_path = out_dir / (MANIFEST + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, out_dir / MANIFEST)
+    return PreparedDataset(out_dir)
+
+
+def prepare_from_configs(config_dir: Path, workspace: Path, clients: int,
+                         synthetic_samples: int = 1000) -> PreparedDataset:
+    """Prepare the testenv.yaml dataset with the algorithm.yaml fl_data_setting"""
+    spec = DatasetSpec.from_testenv(config_dir / "testenv.yaml")
+    with open(config_dir / "algorithm.yaml", 'r') as f:
+        data_setting = yaml.safe_load(f)["algorithm"].get("fl_data_setting", {})
+    return prepare_dataset(
+        spec,
+        workspace / "datasets" / spec.name,
+        clients,
+        method=data_setting.get("splitting_method", "default"),
+        alpha=float(data_setting.get("dirichlet_alpha", 0.5)),
+        seed=int(data_setting.get("split_seed", 0)),
+        synthetic_samples=synthetic_samples,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prepare memory-mapped dataset shards for the edge workers")
+    parser.add_argument("--config-dir", type=Path, default=CONFIG_DIR)
+    parser.add_argument(
+        "--workspace",
+        type=Path,
+        default=Path(os.getenv("IANVS_WORKSPACE", RUNNER_DIR / "workspace"))
+    )
+    parser.add_argument("--clients", type=int, help="Override train.client_number from algorithm.yaml")
+    args = parser.parse_args()
+
+    clients = args.clients
+    if clients is None:
+        with open(args.config_dir / "algorithm.yaml", 'r') as f:
+            modules = yaml.safe_load(f)["algorithm"].get("modules", [])
+        train = next((m.get("hyperparameters", {}) for m in modules if m["type"] == "train"), {})
+        clients = int(train.get("client_number", 3))
+
+    dataset = prepare_from_configs(args.config_dir, args.workspace, clients)
+    split = dataset.manifest["splits"][dataset.manifest["latest_split"]]
+    print(f"Prepared {dataset.manifest['name']} in {dataset.path}: "
+          f"{dataset.manifest['train_samples']} train / {dataset.manifest['test_samples']} test rows, "
+          f"{split['clients']} shards of {split['sizes']} rows ({split['method']})")
+
+
+if __name__ == "__main__":
+    main()
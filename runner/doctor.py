@@ -6,67 +6,208 @@ Run this before benchmarking to ensure all dependencies are ready
 
 import os
 import sys
+import time
+import argparse
 import subprocess
 import yaml
 import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
+import importlib.util
+from importlib import metadata
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, asdict
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich import print as rprint
 
+try:
+    from kubernetes import client as k8s_client, config as k8s_config
+except ImportError:  # Falls back to kubectl subprocesses
+    k8s_client = None
+
 console = Console()
 
+EDGE_NODE_LABEL = "node-role.kubernetes.io/edge"
+
+# import name -> distribution name
+REQUIRED_PACKAGES = {
+    "yaml": "pyyaml",
+    "rich": "rich",
+    "pandas": "pandas",
+    "numpy": "numpy",
+}
+
+def parse_requirements(path: Path) -> Dict[str, str]:
+    """Map distribution name to the version pinned (== or >=) in a requirements file"""
+    pins: Dict[str, str] = {}
+    if not path.exists():
+        return pins
+    for line in path.read_text().splitlines():
+        line = line.split("#", 1)[0].strip()
+        for op in ("==", ">="):
+            if op in line:
+                name, version = line.split(op, 1)
+                pins[name.strip().lower()] = version.strip()
+                break
+    return pins
+
+def version_tuple(version: str) -> Tuple[int, ...]:
+    """Numeric release segments of a version string, e.g. '2.1.4rc1' -> (2, 1, 4)"""
+    parts = []
+    for part in version.split("."):
+        digits = ""
+        for ch in part:
+            if not ch.isdigit():
+                break
+            digits += ch
+        if not digits:
+            break
+        parts.append(int(digits))
+    return tuple(parts)
+
 @dataclass
 class CheckResult:
     name: str
     passed: bool
     message: str
     severity: str = "error"  # error, warning, info
+    duration: float = 0.0  # seconds spent in the check that produced it
+
+@dataclass
+class CheckSpec:
+    name: str
+    func: Callable[[], List[CheckResult]]
+    depends_on: Tuple[str, ...] = ()  # checks that must pass before this one runs
+    static: bool = False  # outcome only depends on the environment fingerprint
 
 class EnvironmentDoctor:
-    def __init__(self):
+    def __init__(self, budget: float = 30.0, use_kubectl: bool = False, force: bool = False,
+                 deep: bool = False, min_versions: bool = False):
         self.results: List[CheckResult] = []
         self.config_dir = Path(__file__).parent / "configs"
+        self.requirements_path = Path(__file__).parent / "requirements.txt"
+        self.deep = deep
+        self.min_versions = min_versions
+        self.workspace_dir = Path(__file__).parent / "workspace"
+        self.cache_path = self.workspace_dir / ".doctor_cache.json"
+        self.force = force
+        self.budget = budget
+        self.deadline: Optional[float] = None
+        self.elapsed = 0.0
+        self.use_kubectl = use_kubectl or k8s_client is None
+        self._api_client = None
+        self._api_lock = threading.Lock()
+        self._node_labels: Optional[List[Dict[str, str]]] = None
     
-    def run_command(self, cmd: List[str]) -> Tuple[bool, str]:
+    def run_command(self, cmd: List[str], timeout: float = 10) -> Tuple[bool, str]:
         """Execute shell command and return success status and output"""
+        # Never outlive the global wall-clock budget
+        timeout = self.request_timeout(timeout)
         try:
             result = subprocess.run(
                 cmd,
                 capture_output=True,
                 text=True,
-                timeout=10
+                timeout=timeout
             )
             return result.returncode == 0, result.stdout + result.stderr
         except Exception as e:
             return False, str(e)
     
+    def request_timeout(self, timeout: float = 10) -> float:
+        """Per-request timeout clipped to what is left of the budget"""
+        if self.deadline is None:
+            return timeout
+        return max(0.1, min(timeout, self.deadline - time.monotonic()))
+    
+    def get_api_client(self):
+        """Load in-cluster or kubeconfig credentials once and share one pooled API client"""
+        if self.use_kubectl:
+            return None
+        with self._api_lock:
+            if self._api_client is None:
+                configuration = k8s_client.Configuration()
+                try:
+                    k8s_config.load_incluster_config(client_configuration=configuration)
+                except k8s_config.ConfigException:
+                    try:
+                        k8s_config.load_kube_config(client_configuration=configuration)
+                    except Exception:
+                        # No usable credentials; fall back to kubectl
+                        self.use_kubectl = True
+                        return None
+                configuration.retries = 1
+                self._api_client = k8s_client.ApiClient(configuration)
+            return self._api_client
+    
+    def list_node_labels(self) -> List[Dict[str, str]]:
+        """List the labels of every node with one metadata-only request per page
+        
+        Asking for a PartialObjectMetadataList keeps each node down to its
+        metadata instead of the full status payload `kubectl get nodes -o json`
+        transfers. The result is shared by the Kubernetes and KubeEdge checks.
+        """
+        if self._node_labels is not None:
+            return self._node_labels
+        
+        api = self.get_api_client()
+        labels: List[Dict[str, str]] = []
+        continue_token = None
+        while True:
+            query = [("limit", 500)]
+            if continue_token:
+                query.append(("continue", continue_token))
+            response, _, _ = api.call_api(
+                "/api/v1/nodes", "GET",
+                query_params=query,
+                header_params={"Accept": "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1"},
+                auth_settings=["BearerToken"],
+                _preload_content=False,
+                _request_timeout=self.request_timeout()
+            )
+            page = json.loads(response.data)
+            labels.extend(item["metadata"].get("labels") or {} for item in page.get("items", []))
+            continue_token = page.get("metadata", {}).get("continue")
+            if not continue_token:
+                break
+        
+        self._node_labels = labels
+        return labels
+    
     def check_python_version(self):
         """Check Python version compatibility"""
+        results: List[CheckResult] = []
         version = sys.version_info
         if version.major == 3 and version.minor >= 8:
-            self.results.append(CheckResult(
+            results.append(CheckResult(
                 "Python Version",
                 True,
                 f"Python {version.major}.{version.minor}.{version.micro} ✓"
             ))
         else:
-            self.results.append(CheckResult(
+            results.append(CheckResult(
                 "Python Version",
                 False,
                 f"Python 3.8+ required, found {version.major}.{version.minor}",
                 "error"
             ))
+        
+        return results
     
     def check_kubernetes_cluster(self):
         """Check if kubectl is available and cluster is accessible"""
+        if self.get_api_client() is not None:
+            return self.check_kubernetes_cluster_api()
+        
+        results: List[CheckResult] = []
         success, output = self.run_command(["kubectl", "cluster-info"])
         
         if success:
-            self.results.append(CheckResult(
+            results.append(CheckResult(
                 "Kubernetes Cluster",
                 True,
                 "K8s cluster is accessible ✓"
@@ -78,7 +219,7 @@ class EnvironmentDoctor:
                 try:
                     nodes = json.loads(output)
                     node_count = len(nodes.get("items", []))
-                    self.results.append(CheckResult(
+                    results.append(CheckResult(
                         "Kubernetes Nodes",
                         True,
                         f"Found {node_count} node(s) ✓",
@@ -87,19 +228,52 @@ class EnvironmentDoctor:
                 except:
                     pass
         else:
-            self.results.append(CheckResult(
+            results.append(CheckResult(
                 "Kubernetes Cluster",
                 False,
                 "Cannot connect to K8s cluster. Run: kubectl cluster-info",
                 "error"
             ))
+        
+        return results
+    
+    def check_kubernetes_cluster_api(self):
+        """Check cluster access and count nodes through the Kubernetes Python client"""
+        results: List[CheckResult] = []
+        try:
+            node_count = len(self.list_node_labels())
+        except Exception as e:
+            results.append(CheckResult(
+                "Kubernetes Cluster",
+                False,
+                f"Cannot connect to K8s cluster: {str(e).splitlines()[0]}",
+                "error"
+            ))
+            return results
+        
+        results.append(CheckResult(
+            "Kubernetes Cluster",
+            True,
+            "K8s cluster is accessible ✓"
+        ))
+        results.append(CheckResult(
+            "Kubernetes Nodes",
+            True,
+            f"Found {node_count} node(s) ✓",
+            "info"
+        ))
+        return results
     
     def check_kubeedge(self):
         """Check if KubeEdge is installed"""
+        if self._node_labels is not None:
+            return self.check_kubeedge_labels(self._node_labels)
+        
+        results: List[CheckResult] = []
         # Check for edge nodes (nodes with kubeedge label)
         success, output = self.run_command([
             "kubectl", "get", "nodes",
-            "-l", "node-role.kubernetes.io/edge",
+            "-l", EDGE_NODE_LABEL,
             "-o", "json"
         ])
         
@@ -108,35 +282,57 @@ class EnvironmentDoctor:
                 nodes = json.loads(output)
                 edge_nodes = nodes.get("items", [])
                 if edge_nodes:
-                    self.results.append(CheckResult(
+                    results.append(CheckResult(
                         "KubeEdge Nodes",
                         True,
                         f"Found {len(edge_nodes)} edge node(s) ✓"
                     ))
                 else:
-                    self.results.append(CheckResult(
+                    results.append(CheckResult(
                         "KubeEdge Nodes",
                         False,
                         "No edge nodes found. Label nodes: kubectl label nodes <node> node-role.kubernetes.io/edge=",
                         "warning"
                     ))
             except:
-                self.results.append(CheckResult(
+                results.append(CheckResult(
                     "KubeEdge",
                     False,
                     "Error parsing edge nodes",
                     "warning"
                 ))
         else:
-            self.results.append(CheckResult(
+            results.append(CheckResult(
                 "KubeEdge",
                 False,
                 "Cannot query edge nodes. Ensure KubeEdge is installed",
                 "warning"
             ))
+        
+        return results
+    
+    def check_kubeedge_labels(self, node_labels: List[Dict[str, str]]):
+        """Count edge nodes in the node metadata already fetched by the cluster check"""
+        results: List[CheckResult] = []
+        edge_count = sum(1 for labels in node_labels if EDGE_NODE_LABEL in labels)
+        if edge_count:
+            results.append(CheckResult(
+                "KubeEdge Nodes",
+                True,
+                f"Found {edge_count} edge node(s) ✓"
+            ))
+        else:
+            results.append(CheckResult(
+                "KubeEdge Nodes",
+                False,
+                f"No edge nodes found. Label nodes: kubectl label nodes <node> {EDGE_NODE_LABEL}=",
+                "warning"
+            ))
+        return results
     
     def check_ianvs_configs(self):
         """Validate Ianvs configuration files"""
+        results: List[CheckResult] = []
         required_configs = ["algorithm.yaml", "testenv.yaml", "benchmarkingjob.yaml"]
         
         for config_file in required_configs:
@@ -148,99 +344,139 @@ class EnvironmentDoctor:
                         config = yaml.safe_load(f)
                     
                     if config and len(str(config)) > 20:  # Not just empty dict
-                        self.results.append(CheckResult(
+                        results.append(CheckResult(
                             f"Config: {config_file}",
                             True,
                             f"{config_file} is valid ✓",
                             "info"
                         ))
                     else:
-                        self.results.append(CheckResult(
+                        results.append(CheckResult(
                             f"Config: {config_file}",
                             False,
                             f"{config_file} is empty or invalid",
                             "error"
                         ))
                 except Exception as e:
-                    self.results.append(CheckResult(
+                    results.append(CheckResult(
                         f"Config: {config_file}",
                         False,
                         f"{config_file} YAML parsing error: {str(e)}",
                         "error"
                     ))
             else:
-                self.results.append(CheckResult(
+                results.append(CheckResult(
                     f"Config: {config_file}",
                     False,
                     f"{config_file} not found in {self.config_dir}",
                     "error"
                 ))
+        
+        return results
     
     def check_dependencies(self):
-        """Check Python dependencies"""
-        required_packages = {
-            "yaml": "pyyaml",
-            "rich": "rich",
-            "pandas": "pandas",
-            "numpy": "numpy",
-        }
+        """Check Python dependencies
+        
+        Packages are located with importlib.util.find_spec and versioned from
+        their installed metadata, so nothing heavy is imported. Deep mode
+        additionally imports every package.
+        """
+        results: List[CheckResult] = []
+        pins = parse_requirements(self.requirements_path) if self.min_versions else {}
         
-        for import_name, package_name in required_packages.items():
+        for import_name, package_name in REQUIRED_PACKAGES.items():
+            start = time.perf_counter()
+            found = importlib.util.find_spec(import_name) is not None
             try:
-                __import__(import_name)
-                self.results.append(CheckResult(
+                version = metadata.version(package_name)
+            except metadata.PackageNotFoundError:
+                version = None
+            error = None
+            if found and self.deep:
+                try:
+                    __import__(import_name)
+                except Exception as e:
+                    error = str(e)
+            probe_ms = (time.perf_counter() - start) * 1000
+            
+            required = pins.get(package_name)
+            if not found:
+                results.append(CheckResult(
                     f"Package: {package_name}",
-                    True,
-                    f"{package_name} installed ✓",
-                    "info"
+                    False,
+                    f"{package_name} not installed. Run: pip install {package_name}",
+                    "error"
                 ))
-            except ImportError:
-                self.results.append(CheckResult(
+            elif error:
+                results.append(CheckResult(
                     f"Package: {package_name}",
                     False,
-                    f"{package_name} not installed. Run: pip install {package_name}",
+                    f"{package_name} fails to import: {error}",
                     "error"
                 ))
+            elif required and version and version_tuple(version) < version_tuple(required):
+                results.append(CheckResult(
+                    f"Package: {package_name}",
+                    False,
+                    f"{package_name} {version} is older than {required} from requirements.txt. "
+                    f"Run: pip install '{package_name}>={required}'",
+                    "error"
+                ))
+            else:
+                results.append(CheckResult(
+                    f"Package: {package_name}",
+                    True,
+                    f"{package_name} {version or ''} installed ✓ ({probe_ms:.1f} ms)",
+                    "info"
+                ))
+        
+        return results
     
     def check_workspace(self):
         """Check workspace directory structure"""
-        workspace_dir = Path(__file__).parent / "workspace"
+        results: List[CheckResult] = []
+        workspace_dir = self.workspace_dir
         
         if workspace_dir.exists():
-            self.results.append(CheckResult(
+            results.append(CheckResult(
                 "Workspace Directory",
                 True,
                 f"Workspace exists at {workspace_dir} ✓",
                 "info"
             ))
         else:
-            self.results.append(CheckResult(
+            results.append(CheckResult(
                 "Workspace Directory",
                 False,
                 f"Workspace directory not found. Creating at {workspace_dir}",
                 "warning"
             ))
             workspace_dir.mkdir(parents=True, exist_ok=True)
+        
+        return results
     
     def check_docker(self):
         """Check if Docker is available"""
+        results: List[CheckResult] = []
         success, output = self.run_command(["docker", "--version"])
         
         if success:
             version = output.strip()
-            self.results.append(CheckResult(
+            results.append(CheckResult(
                 "Docker",
                 True,
                 f"{version} ✓",
                 "info"
             ))
         else:
-            self.results.append(CheckResult(
+            results.append(CheckResult(
                 "Docker",
                 False,
                 "Docker not found. Required for containerized benchmarking",
                 "warning"
             ))
+        
+        return results
     
     def display_results(self):
         """Display check results in a formatted table"""
@@ -257,6 +493,7 @@ class EnvironmentDoctor:
         table.add_column("Check", style="cyan", width=30)
         table.add_column("Status", justify="center", width=10)
         table.add_column("Details", style="dim")
+        table.add_column("Time", justify="right", width=8)
         
         errors = 0
         warnings = 0
@@ -271,7 +508,7 @@ class EnvironmentDoctor:
                 else:
                     warnings += 1
             
-            table.add_row(result.name, status, result.message)
+            table.add_row(result.name, status, result.message, f"{result.duration:.2f}s")
         
         console.print(table)
         console.print("\n")
@@ -279,6 +516,7 @@ class EnvironmentDoctor:
         # Summary
         total = len(self.results)
         passed = sum(1 for r in self.results if r.passed)
+        console.print(f"[dim]Checks finished in {self.elapsed:.2f}s (budget {self.budget:.0f}s)[/dim]\n")
         
         if errors == 0 and warnings == 0:
             console.print(Panel(
@@ -302,22 +540,202 @@ class EnvironmentDoctor:
             ))
             return 1
     
+    def declare_checks(self) -> List[CheckSpec]:
+        """Declare checks and the checks they depend on"""
+        return [
+            CheckSpec("Python Version", self.check_python_version, static=True),
+            CheckSpec("Dependencies", self.check_dependencies, static=True),
+            CheckSpec("Docker", self.check_docker),
+            CheckSpec("Kubernetes Cluster", self.check_kubernetes_cluster),
+            CheckSpec("KubeEdge", self.check_kubeedge, depends_on=("Kubernetes Cluster",)),
+            CheckSpec("Configs", self.check_ianvs_configs, static=True),
+            CheckSpec("Workspace", self.check_workspace),
+        ]
+    
+    def run_check(self, spec: CheckSpec) -> List[CheckResult]:
+        """Run a single check and stamp its results with the time it took"""
+        start = time.perf_counter()
+        try:
+            results = spec.func()
+        except Exception as e:
+            results = [CheckResult(spec.name, False, f"Check raised: {str(e)}", "error")]
+        duration = time.perf_counter() - start
+        for result in results:
+            result.duration = duration
+        return results
+    
+    def fingerprint(self) -> str:
+        """Hash of everything the static checks depend on
+        
+        Covers the config files, requirements.txt, installed versions of the
+        required packages, the interpreter, this script and the probe mode.
+        """
+        digest = hashlib.sha256()
+        digest.update(sys.version.encode())
+        digest.update(sys.executable.encode())
+        digest.update(Path(__file__).read_bytes())
+        digest.update(f"deep={self.deep} min_versions={self.min_versions}".encode())
+        if self.requirements_path.exists():
+            digest.update(self.requirements_path.read_bytes())
+        for config_path in sorted(self.config_dir.glob("*.yaml")):
+            digest.update(config_path.name.encode())
+            digest.update(config_path.read_bytes())
+        for package_name in sorted(REQUIRED_PACKAGES.values()):
+            try:
+                version = metadata.version(package_name)
+            except metadata.PackageNotFoundError:
+                version = "missing"
+            digest.update(f"{package_name}=={version}".encode())
+        return digest.hexdigest()
+    
+    def load_cached_results(self, fingerprint: str) -> Dict[str, List[CheckResult]]:
+        """Static check outcomes from a previous run with the same fingerprint"""
+        try:
+            with open(self.cache_path, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cache.get("fingerprint") != fingerprint:
+            return {}
+        
+        outcomes = {}
+        for name, results in cache.get("checks", {}).items():
+            outcomes[name] = [CheckResult(**r) for r in results]
+            for result in outcomes[name]:
+                result.message = f"{result.message} (cached)"
+                result.duration = 0.0
+        return outcomes
+    
+    def save_cached_results(self, fingerprint: str, specs: List[CheckSpec],
+                            outcomes: Dict[str, List[CheckResult]]):
+        """Persist static check outcomes to the workspace"""
+        cache = {
+            "fingerprint": fingerprint,
+            "checks": {
+                spec.name: [asdict(r) for r in outcomes[spec.name]]
+                for spec in specs if spec.static
+            }
+        }
+        try:
+            self.workspace_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass  # A read-only workspace only costs the cache
+    
+    def run_checks(self, specs: List[CheckSpec],
+                   cached: Optional[Dict[str, List[CheckResult]]] = None) -> Dict[str, List[CheckResult]]:
+        """Run checks concurrently, honoring dependencies and the global budget"""
+        start = time.monotonic()
+        self.deadline = start + self.budget
+        outcomes: Dict[str, List[CheckResult]] = dict(cached or {})
+        pending = [spec for spec in specs if spec.name not in outcomes]
+        running = {}
+        
+        pool = ThreadPoolExecutor(max_workers=len(specs))
+        try:
+            while pending or running:
+                # Start every check whose dependencies have finished
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for spec in list(pending):
+                        if any(dep not in outcomes for dep in spec.depends_on):
+                            continue
+                        pending.remove(spec)
+                        progressed = True
+                        failed = [dep for dep in spec.depends_on
+                                  if not all(r.passed for r in outcomes[dep])]
+                        if failed:
+                            outcomes[spec.name] = [CheckResult(
+                                spec.name,
+                                False,
+                                f"Skipped: requires {', '.join(failed)}",
+                                "warning"
+                            )]
+                        else:
+                            running[pool.submit(self.run_check, spec)] = spec
+                
+                if not running:
+                    break
+                
+                remaining = self.deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcomes[running.pop(future).name] = future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        for spec in list(running.values()) + pending:
+            outcomes[spec.name] = [CheckResult(
+                spec.name,
+                False,
+                f"Did not finish within the {self.budget:.0f}s budget",
+                "error",
+                time.monotonic() - start
+            )]
+        
+        self.elapsed = time.monotonic() - start
+        return outcomes
+    
     def run_all_checks(self):
         """Run all environment checks"""
         console.print("[bold]Running environment checks...[/bold]\n")
         
-        self.check_python_version()
-        self.check_dependencies()
-        self.check_docker()
-        self.check_kubernetes_cluster()
-        self.check_kubeedge()
-        self.check_ianvs_configs()
-        self.check_workspace()
+        specs = self.declare_checks()
+        fingerprint = self.fingerprint()
+        cached = {} if self.force else self.load_cached_results(fingerprint)
+        # Only static checks are ever served from the cache; live checks always run
+        cached = {spec.name: cached[spec.name] for spec in specs if spec.static and spec.name in cached}
+        outcomes = self.run_checks(specs, cached)
+        if len(cached) < sum(1 for spec in specs if spec.static):
+            self.save_cached_results(fingerprint, specs, outcomes)
+        # Report in declaration order regardless of completion order
+        self.results = [result for spec in specs for result in outcomes[spec.name]]
         
         return self.display_results()
 
 def main():
-    doctor = EnvironmentDoctor()
+    parser = argparse.ArgumentParser(description="Validate the Ianvs benchmarking environment")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=float(os.getenv("DOCTOR_BUDGET", "30")),
+        help="Wall-clock budget in seconds for all checks (default: $DOCTOR_BUDGET or 30)"
+    )
+    parser.add_argument(
+        "--kubectl",
+        action="store_true",
+        help="Query the cluster with kubectl subprocesses instead of the Kubernetes Python client"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore cached results and re-run every check"
+    )
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="Import every required package instead of only locating it"
+    )
+    parser.add_argument(
+        "--min-versions",
+        action="store_true",
+        help="Fail packages older than the versions pinned in requirements.txt"
+    )
+    args = parser.parse_args()
+    
+    doctor = EnvironmentDoctor(
+        budget=args.budget,
+        use_kubectl=args.kubectl,
+        force=args.force,
+        deep=args.deep,
+        min_versions=args.min_versions
+    )
     exit_code = doctor.run_all_checks()
     sys.exit(exit_code)
 
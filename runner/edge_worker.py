@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Ianvs Edge Worker - Local training service for edge nodes
+Trains the current global model on the node's local data whenever the cloud
+orchestrator asks for an update. The same worker runs in-process behind the
+orchestrator's simulated clients.
+"""
+
+import json
+import os
+import signal
+import sys
+import time
+import zlib
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from dataset import PreparedDataset
+from exporter import (PHASE_SECONDS, REQUESTS_IN_PROGRESS, TRANSPORT_BYTES, metrics_port, observe_latency,
+                      start_exporter)
+from latency import DEFAULT_SETTINGS, LatencyHistogram, measure_inference
+from metrics import evaluate_stream
+from model import SoftmaxModel, make_synthetic_dataset
+from telemetry import open_sampler
+from transport import Buffer, UpdateCodec, codec_from_config, decode, payload_size
+
+DEFAULT_PORT = 9100
+
+
+class EdgeWorker:
+    """Holds one node's local data and trains on it"""
+
+    def __init__(self, name: str, model: SoftmaxModel, X: np.ndarray, y: np.ndarray,
+                 train_ratio: float = 0.8):
+        self.name = name
+        self.model = model
+        split = int(len(y) * train_ratio)
+        self.X_train, self.y_train = X[:split], y[:split]
+        self.X_val, self.y_val = X[split:], y[split:]
+        self.residual = None
+        self.sampler = None
+
+    def train(self, weights: np.ndarray, params: Dict) -> Tuple[np.ndarray, Dict]:
+        """Run local epochs from the global weights and evaluate on the held-out split"""
+        round_num = int(params.get("round", 0))
+        new_weights = self.model.train(
+            weights,
+            self.X_train,
+            self.y_train,
+            epochs=int(params.get("local_epochs", 1)),
+            batch_size=int(params.get("batch_size", 32)),
+            learning_rate=float(params.get("learning_rate", 0.001)),
+            optimizer=params.get("optimizer", "adam"),
+            seed=zlib.crc32(self.name.encode()) + round_num,
+            mu=float(params.get("mu", 0.0))
+        )
+        return new_weights, self.evaluate(new_weights, params.get("latency", DEFAULT_SETTINGS))
+
+    @contextmanager
+    def phase(self, round_num: int, name: str):
+        """Telemetry phase marker, also timed for the /metrics endpoint"""
+        with PHASE_SECONDS.time(role="edge", phase=name):
+            with self.sampler.phase(round_num, name) if self.sampler else nullcontext():
+                yield
+
+    def handle(self, payload: Union[Buffer, np.ndarray], params: Dict) -> Tuple[List[Buffer], Dict]:
+        """Decode the broadcast global model, train on it and encode the update
+
+        ``payload`` may also be the global weights themselves, as read from
+        shared memory by simulator.py.
+        """
+        round_num = int(params.get("round", 0))
+        with self.phase(round_num, "train"):
+            # Thread CPU time stays per-node even when simulated nodes share a process
+            cpu_start, wall_start = time.thread_time(), time.perf_counter()
+            weights = payload if isinstance(payload, np.ndarray) else decode(payload)
+            new_weights, metrics = self.train(weights, params)
+            cpu, wall = time.thread_time() - cpu_start, time.perf_counter() - wall_start
+        with self.phase(round_num, "upload"):
+            codec = codec_from_config(params.get("transport"))
+            buffers = self.encode_update(codec, new_weights, weights)
+        metrics["cpu_percent"] = cpu / max(wall, 1e-9) * 100
+        if self.sampler:
+            # Node-wide figures: the whole cgroup (or process) including BLAS threads
+            metrics.update(self.sampler.round_summary(round_num))
+        return buffers, metrics
+
+    def encode_update(self, codec: UpdateCodec, new_weights: np.ndarray,
+                      global_weights: np.ndarray) -> List[Buffer]:
+        """Encode the update; lossy codecs carry what they dropped into the next round"""
+        if not codec.lossy:
+            return codec.encode(new_weights, global_weights)
+        if self.residual is not None:
+            new_weights = new_weights + self.residual
+        buffers = codec.encode(new_weights, global_weights)
+        self.residual = new_weights - decode(b"".join(buffers), global_weights)
+        return buffers
+
+    def evaluate(self, weights: np.ndarray, latency: Dict) -> Dict:
+        """Validation confusion matrix, accuracy and loss, plus inference latency histograms per batch size"""
+        if not len(self.y_val):
+            return {"samples": int(len(self.y_train)), "accuracy": 0.0, "loss": 0.0,
+                    "avg_latency": 0.0, "p99_latency": 0.0, "latency_histograms": {}}
+        # One sweep gives the confusion matrix and the loss; the cloud merges
+        # the matrices of all nodes and derives the classification metrics
+        matrix, loss = evaluate_stream(
+            lambda batch: self.model.predict_proba(weights, batch),
+            self.X_val, self.y_val, self.model.n_classes
+        )
+        histograms = measure_inference(
+            lambda batch: self.model.predict(weights, batch),
+            self.X_val,
+            latency["batch_sizes"],
+            warmup=int(latency["warmup"]),
+            iterations=int(latency["iterations"])
+        )
+        # The first configured batch size is the node's headline latency
+        primary = histograms[latency["batch_sizes"][0]]
+        return {
+            "samples": int(len(self.y_train)),
+            "accuracy": matrix.metrics()["accuracy"],
+            "loss": loss,
+            "confusion": matrix.to_dict(),
+            "avg_latency": primary.mean_ms(),
+            "p99_latency": primary.percentile_ms(99.0),
+            "latency_histograms": {str(size): h.to_dict() for size, h in histograms.items()},
+        }
+
+
+def synthetic_worker(name: str, samples: int, n_features: int = 64, n_classes: int = 10,
+                     train_ratio: float = 0.8) -> EdgeWorker:
+    """Edge worker over a synthetic shard seeded by the node name"""
+    X, y = make_synthetic_dataset(samples, n_features, n_classes, seed=zlib.crc32(name.encode()))
+    return EdgeWorker(name, SoftmaxModel(n_features, n_classes), X, y, train_ratio)
+
+
+def shard_worker(name: str, dataset: PreparedDataset, client: int, train_ratio: float = 0.8) -> EdgeWorker:
+    """Edge worker over its own shard of a prepared dataset"""
+    X, y = dataset.shard(client)
+    return EdgeWorker(name, SoftmaxModel(dataset.n_features, dataset.n_classes), X, y, train_ratio)
+
+
+class EdgeRequestHandler(BaseHTTPRequestHandler):
+    """POST /train: body is the encoded global model, reply body is the encoded update"""
+
+    worker: EdgeWorker = None
+
+    def do_POST(self):
+        if self.path.split("?")[0] != "/train":
+            self.send_error(404)
+            return
+        REQUESTS_IN_PROGRESS.inc()
+        try:
+            self.train(self.rfile.read(int(self.headers["Content-Length"])))
+        finally:
+            REQUESTS_IN_PROGRESS.inc(-1)
+
+    def train(self, body: bytes):
+        params = json.loads(self.headers.get("X-Ianvs-Train", "{}"))
+        TRANSPORT_BYTES.inc(len(body), role="edge", direction="received")
+        payload, metrics = self.worker.handle(body, params)
+        observe_latency({int(size): LatencyHistogram.from_dict(h)
+                         for size, h in metrics.get("latency_histograms", {}).items()})
+
+        with self.worker.phase(int(params.get("round", 0)), "upload"):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(payload_size(payload)))
+            self.send_header("X-Ianvs-Metrics", json.dumps(metrics))
+            self.end_headers()
+            for buffer in payload:
+                self.wfile.write(buffer)
+        TRANSPORT_BYTES.inc(payload_size(payload), role="edge", direction="sent")
+
+    def log_message(self, format, *args):
+        print(f"[{self.worker.name}] {format % args}")
+
+
+def main():
+    name = os.getenv("NODE_NAME", "edge-unknown")
+    port = int(os.getenv("EDGE_PORT", DEFAULT_PORT))
+    samples = int(os.getenv("EDGE_SAMPLES", "1000"))
+
+    # A prepared dataset (dataset.py) is used when mounted; EDGE_SHARD picks
+    # this node's 1-based shard. Otherwise the node trains on synthetic data.
+    dataset = PreparedDataset.find(Path(os.getenv("IANVS_DATASET_DIR", "/app/workspace/datasets/mnist")))
+    if dataset is not None:
+        shard = int(os.getenv("EDGE_SHARD", "1")) - 1
+        EdgeRequestHandler.worker = shard_worker(name, dataset, shard)
+        print(f"Edge worker {name} mapped shard {shard + 1} of {dataset.path}")
+    else:
+        EdgeRequestHandler.worker = synthetic_worker(name, samples)
+
+    # TELEMETRY_INTERVAL=0 turns the resource sampler off
+    workspace = Path(os.getenv("IANVS_WORKSPACE", "/app/workspace"))
+    EdgeRequestHandler.worker.sampler = open_sampler(
+        workspace / "telemetry", name, float(os.getenv("TELEMETRY_INTERVAL", "0.5"))
+    )
+    start_exporter(metrics_port())
+    server = ThreadingHTTPServer(("0.0.0.0", port), EdgeRequestHandler)
+    print(f"Edge worker {name} ready for federated learning on port {port}...")
+    # Pods are stopped with SIGTERM; exit through the finally so telemetry is flushed
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    finally:
+        if EdgeRequestHandler.worker.sampler:
+            EdgeRequestHandler.worker.sampler.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Ianvs Metrics Exporter - Prometheus text-format /metrics endpoint for runner nodes
+Counters, gauges and histograms live in a process-wide registry that training
+code updates with a short locked add; text is only rendered when a scraper
+asks, on a daemon HTTP thread, so the training path never formats or does I/O.
+The cloud orchestrator and edge workers both serve it (IANVS_METRICS_PORT).
+"""
+
+import math
+import os
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_METRICS_PORT = 9090
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, from sub-millisecond inference batches to long rounds
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+ROUND_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+class Metric:
+    """One metric family; a value per combination of label values"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} takes labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """(name suffix, rendered labels, value) of every series"""
+        with self._lock:
+            values = dict(self._values)
+        if not values and not self.labels:
+            values = {(): 0.0}
+        return [("", format_labels(self.labels, key), value) for key, value in sorted(values.items())]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{self.name}{suffix}{labels} {format_value(value)}" for suffix, labels, value in self.samples())
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    @contextmanager
+    def time(self, **labels):
+        """Add the seconds spent inside the block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.inc(time.perf_counter() - start, **labels)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 function: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation, labels)
+        self.function = function
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        if self.function is not None:
+            # Read at scrape time, e.g. process RSS
+            return [("", "", float(self.function()))]
+        return super().samples()
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram; ``observe_many`` folds in pre-bucketed samples at once"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = ROUND_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.bounds = np.array(sorted(buckets) + [math.inf])
+
+    def _series(self, labels: Dict) -> List:
+        key = self._key(labels)
+        if key not in self._values:
+            self._values[key] = [np.zeros(len(self.bounds), dtype=np.int64), 0.0]
+        return self._values[key]
+
+    def observe(self, value: float, **labels):
+        index = int(np.searchsorted(self.bounds, value, side="left"))
+        with self._lock:
+            series = self._series(labels)
+            series[0][index] += 1
+            series[1] += value
+
+    def observe_many(self, values: np.ndarray, counts: np.ndarray, total: Optional[float] = None, **labels):
+        """Add ``counts[i]`` observations of ``values[i]``; ``total`` overrides the derived sum"""
+        indices = np.searchsorted(self.bounds, values, side="left")
+        with self._lock:
+            series = self._series(labels)
+            np.add.at(series[0], indices, counts)
+            series[1] += float(np.dot(values, counts)) if total is None else total
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            values = {key: (counts.copy(), total) for key, (counts, total) in self._values.items()}
+        samples = []
+        for key, (counts, total) in sorted(values.items()):
+            cumulative = np.cumsum(counts)
+            for bound, count in zip(self.bounds, cumulative):
+                le = format_labels(self.labels + ("le",), key + (format_value(bound),))
+                samples.append(("_bucket", le, count))
+            labels = format_labels(self.labels, key)
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, cumulative[-1]))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self.metrics for line in metric.render()) + "\n"
+
+
+def resident_memory_bytes() -> float:
+    with open("/proc/self/statm", 'r') as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+REGISTRY = Registry()
+
+ROUND_DURATION = REGISTRY.register(Histogram(
+    "ianvs_round_duration_seconds", "Wall time of a federated round", ("algorithm",), ROUND_BUCKETS))
+ROUNDS = REGISTRY.register(Counter(
+    "ianvs_rounds_total", "Federated rounds completed", ("algorithm",)))
+ACCURACY = REGISTRY.register(Gauge(
+    "ianvs_accuracy", "Test accuracy of the latest global model", ("algorithm",)))
+PHASE_SECONDS = REGISTRY.register(Counter(
+    "ianvs_phase_seconds_total", "Time spent in each round phase", ("role", "phase")))
+TRANSPORT_BYTES = REGISTRY.register(Counter(
+    "ianvs_transport_bytes_total", "Model bytes sent and received", ("role", "direction")))
+UPDATES = REGISTRY.register(Counter(
+    "ianvs_updates_total", "Edge updates per round by outcome (active, late, straggler, dropped, failed)",
+    ("status",)))
+UPDATES_IN_FLIGHT = REGISTRY.register(Gauge(
+    "ianvs_updates_in_flight", "Edge update requests dispatched by the cloud and not yet collected"))
+REQUESTS_IN_PROGRESS = REGISTRY.register(Gauge(
+    "ianvs_edge_requests_in_progress", "Training requests an edge worker is handling"))
+INFERENCE_LATENCY = REGISTRY.register(Histogram(
+    "ianvs_inference_latency_seconds",
+    "Edge inference latency per batch; on the cloud, merged over every responding node",
+    ("batch_size",), LATENCY_BUCKETS))
+RESIDENT_MEMORY = REGISTRY.register(Gauge(
+    "process_resident_memory_bytes", "Resident memory size in bytes", function=resident_memory_bytes))
+
+
+def observe_latency(histograms: Dict, registry_histogram: Histogram = INFERENCE_LATENCY):
+    """Fold LatencyHistogram objects (batch size -> histogram) into the Prometheus histogram"""
+    for batch_size, histogram in histograms.items():
+        buckets = np.flatnonzero(histogram.counts)
+        if len(buckets):
+            registry_histogram.observe_many(histogram.bucket_values(buckets) / 1e9, histogram.counts[buckets],
+                                            histogram.total_ns / 1e9, batch_size=batch_size)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics: the registry in Prometheus text format"""
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would flood the node's stdout
+
+
+def start_exporter(port: Optional[int]) -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics on a daemon thread, or None when ``port`` is 0/None"""
+    if not port:
+        return None
+    try:
+        server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    except OSError as e:
+        # Several nodes on one host share the default port; metrics are optional
+        print(f"Metrics endpoint disabled: cannot bind :{port} ({e.strerror})")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    print(f"Serving Prometheus metrics on :{port}/metrics")
+    return server
+
+
+def metrics_port() -> int:
+    """IANVS_METRICS_PORT, DEFAULT_METRICS_PORT when unset; 0 disables the endpoint"""
+    return int(os.getenv("IANVS_METRICS_PORT", DEFAULT_METRICS_PORT))
+
+
+def serve_until_stopped(exit_code: int = 0):
+    """Keep the process, and so the /metrics thread, alive until SIGTERM; then exit with ``exit_code``
+
+    A finished job's final values stay scrapable, and a pod running the job
+    is not restarted into running it again.
+    """
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(exit_code))
+    print("Job finished; serving /metrics until stopped")
+    while True:
+        signal.pause()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Ianvs Job History - Embedded SQLite index of benchmarking runs
+Every finished run's metadata, config snapshot and final metrics per algorithm
+are ingested into workspace/history.db (WAL mode). Job name, algorithm,
+timestamp and metric columns are indexed so the dashboard can filter, page and
+compare thousands of runs without walking the results directories.
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from results_store import ARROW_SEGMENT_PREFIX, ARROW_SEGMENT_SUFFIX, pa, read_arrow_segment
+
+HISTORY_DB = "history.db"
+
+# Run directories written by orchestrator.run_job: <job>-<YYYYmmdd-HHMMSS>[-<n>]
+RUN_DIR_PATTERN = re.compile(r"(?P<job>.+)-\d{8}-\d{6}(-\d+)?$")
+
+CONFIG_FILES = ("benchmarkingjob.yaml", "algorithm.yaml", "testenv.yaml")
+
+# Final-round metrics stored per (run, algorithm); all are indexed
+METRIC_COLUMNS = ("accuracy", "loss", "f1_score", "precision", "recall", "inference_latency",
+                  "latency_p50", "latency_p95", "latency_p99", "latency_p999", "bandwidth_usage")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    job_name TEXT NOT NULL,
+    started TEXT,
+    finished TEXT,
+    status TEXT,
+    run_dir TEXT,
+    config TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    job_name TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    timestamp TEXT,
+    status TEXT,
+    rounds INTEGER,
+    convergence_round INTEGER,
+    duration REAL,
+    uplink_bytes INTEGER,
+    downlink_bytes INTEGER,
+    {metrics},
+    PRIMARY KEY (run_id, algorithm)
+);
+CREATE TABLE IF NOT EXISTS baselines (
+    job_name TEXT NOT NULL,
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    pinned TEXT NOT NULL,
+    PRIMARY KEY (job_name, run_id)
+);
+CREATE INDEX IF NOT EXISTS runs_job_name ON runs(job_name, finished);
+CREATE INDEX IF NOT EXISTS runs_finished ON runs(finished);
+CREATE INDEX IF NOT EXISTS results_job_name ON results(job_name, timestamp);
+CREATE INDEX IF NOT EXISTS results_algorithm ON results(algorithm, timestamp);
+CREATE INDEX IF NOT EXISTS results_timestamp ON results(timestamp);
+{metric_indexes}
+""".format(
+    metrics=",\n    ".join(f"{m} REAL" for m in METRIC_COLUMNS),
+    metric_indexes="\n".join(f"CREATE INDEX IF NOT EXISTS results_{m} ON results({m});" for m in METRIC_COLUMNS),
+)
+
+
+def read_run_rounds(run_dir: Path) -> List[Dict]:
+    """Round records of a run directory, from round_{n}.json files or Arrow segments
+
+    A run resumed from a checkpoint repeats the rounds after it; the later
+    record of an (algorithm, round) wins.
+    """
+    rounds = []
+    for path in sorted(run_dir.glob("round_*.json")):
+        with open(path, 'r') as f:
+            rounds.append(json.load(f))
+    if pa is not None:
+        for path in sorted(run_dir.glob(f"{ARROW_SEGMENT_PREFIX}*{ARROW_SEGMENT_SUFFIX}")):
+            rounds.extend(read_arrow_segment(path))
+    latest = {(r.get("algorithm"), r.get("round")): r for r in rounds}
+    return sorted(latest.values(), key=lambda r: (r.get("timestamp", ""), r.get("round", 0)))
+
+
+def config_snapshot(config_dir: Path) -> Dict:
+    """Parsed Ianvs config files the run was started with"""
+    snapshot = {}
+    for name in CONFIG_FILES:
+        path = config_dir / name
+        if path.exists():
+            with open(path, 'r') as f:
+                snapshot[name] = yaml.safe_load(f)
+    return snapshot
+
+
+def summarize(rounds: List[Dict]) -> Dict[str, Dict]:
+    """Final metrics, totals and status of every algorithm in a run"""
+    summary = {}
+    for record in rounds:
+        name = record.get("algorithm", "FederatedAveraging")
+        entry = summary.setdefault(name, {"duration": 0.0, "uplink_bytes": 0, "downlink_bytes": 0})
+        entry["duration"] += record.get("round_duration", 0.0)
+        entry["uplink_bytes"] += record.get("uplink_bytes", 0)
+        entry["downlink_bytes"] += record.get("downlink_bytes", 0)
+        entry.update({k: record.get(k) for k in METRIC_COLUMNS})
+        entry["timestamp"] = record.get("timestamp")
+        entry["rounds"] = record.get("round")
+        entry["convergence_round"] = record.get("convergence_round")
+        entry["status"] = record.get("status") or "running"
+    return summary
+
+
+class JobHistory:
+    """Read/write handle on the history index; one writer at a time, readers never block
+
+    Besides the runs and their results, the index holds each job's pinned
+    baseline runs used by regression.py.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, workspace: Path) -> "JobHistory":
+        return cls(workspace / HISTORY_DB)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record_run(self, run_id: str, job_name: str, run_dir: Path, rounds: List[Dict],
+                   config: Optional[Dict] = None):
+        """Insert or replace one run and its per-algorithm results in a single transaction"""
+        summary = summarize(rounds)
+        timestamps = [r["timestamp"] for r in rounds if r.get("timestamp")]
+        statuses = {entry["status"] for entry in summary.values()}
+        status = statuses.pop() if len(statuses) == 1 else "partial"
+        columns = ("run_id", "job_name", "algorithm", "timestamp", "status", "rounds", "convergence_round",
+                   "duration", "uplink_bytes", "downlink_bytes") + METRIC_COLUMNS
+        with self.conn:
+            self.conn.execute("DELETE FROM results WHERE run_id = ?", (run_id,))
+            # Re-ingesting a directory keeps the config snapshot taken when the run finished
+            self.conn.execute(
+                "INSERT INTO runs (run_id, job_name, started, finished, status, run_dir, config) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(run_id) DO UPDATE SET "
+                "job_name = excluded.job_name, started = excluded.started, finished = excluded.finished, "
+                "status = excluded.status, run_dir = excluded.run_dir, "
+                "config = COALESCE(excluded.config, runs.config)",
+                (run_id, job_name, min(timestamps, default=None), max(timestamps, default=None),
+                 status if summary else "empty", str(run_dir), json.dumps(config) if config else None)
+            )
+            self.conn.executemany(
+                f"INSERT INTO results ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [(run_id, job_name, algorithm, *(entry.get(c) for c in columns[3:]))
+                 for algorithm, entry in summary.items()]
+            )
+
+    def indexed_runs(self) -> Dict[str, Optional[str]]:
+        """run_id -> finished timestamp of every run already in the index"""
+        return dict(self.conn.execute("SELECT run_id, finished FROM runs"))
+
+    def latest_runs(self, job_name: str, count: int = 1, status: str = "completed") -> List[str]:
+        """Most recently finished run ids of a job, newest first"""
+        rows = self.conn.execute(
+            "SELECT run_id FROM runs WHERE job_name = ? AND status = ? ORDER BY finished DESC LIMIT ?",
+            (job_name, status, count)
+        )
+        return [row[0] for row in rows]
+
+    def run_dirs(self, run_ids: List[str]) -> Dict[str, Path]:
+        """run_id -> results directory for the given runs"""
+        rows = self.conn.execute(
+            f"SELECT run_id, run_dir FROM runs WHERE run_id IN ({', '.join('?' * len(run_ids))})",
+            tuple(run_ids)
+        )
+        return {run_id: Path(run_dir) for run_id, run_dir in rows}
+
+    def pin_baseline(self, job_name: str, run_ids: List[str]):
+        """Make ``run_ids`` the job's baseline, replacing any earlier pin"""
+        pinned = datetime.now().isoformat()
+        with self.conn:
+            self.conn.execute("DELETE FROM baselines WHERE job_name = ?", (job_name,))
+            self.conn.executemany(
+                "INSERT INTO baselines (job_name, run_id, pinned) VALUES (?, ?, ?)",
+                [(job_name, run_id, pinned) for run_id in run_ids]
+            )
+
+    def unpin_baseline(self, job_name: str):
+        with self.conn:
+            self.conn.execute("DELETE FROM baselines WHERE job_name = ?", (job_name,))
+
+    def baseline(self, job_name: str) -> List[str]:
+        """Run ids pinned as the job's baseline"""
+        rows = self.conn.execute("SELECT run_id FROM baselines WHERE job_name = ? ORDER BY run_id", (job_name,))
+        return [row[0] for row in rows]
+
+
+def ingest_results(history: JobHistory, results_dir: Path, job_name: str, reindex: bool = False) -> int:
+    """Add run directories not yet in the index (or all of them with ``reindex``)
+
+    Directories not matching RUN_DIR_PATTERN are indexed under ``job_name``.
+    """
+    if not results_dir.is_dir():
+        return 0
+    known = history.indexed_runs()
+    added = 0
+    for run_dir in sorted(p for p in results_dir.iterdir() if p.is_dir()):
+        if run_dir.name in known and not reindex:
+            continue
+        rounds = read_run_rounds(run_dir)
+        if not rounds:
+            continue
+        match = RUN_DIR_PATTERN.match(run_dir.name)
+        history.record_run(run_dir.name, match["job"] if match else job_name, run_dir, rounds)
+        added += 1
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index finished benchmarking runs into the job history")
+    parser.add_argument("--config-dir", type=Path, default=Path(__file__).parent / "configs")
+    parser.add_argument(
+        "--workspace",
+        type=Path,
+        default=Path(os.getenv("IANVS_WORKSPACE", Path(__file__).parent / "workspace"))
+    )
+    parser.add_argument("--reindex", action="store_true", help="Re-ingest runs that are already indexed")
+    args = parser.parse_args()
+
+    with open(args.config_dir / "benchmarkingjob.yaml", 'r') as f:
+        job_name = yaml.safe_load(f)["benchmarkingjob"]["name"]
+    with JobHistory.open(args.workspace) as history:
+        added = ingest_results(history, args.workspace / "results", job_name, args.reindex)
+        total = history.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+    print(f"Indexed {added} run(s); {total} run(s) in {args.workspace / HISTORY_DB}")
+
+
+if __name__ == "__main__":
+    main()
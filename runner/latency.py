@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Ianvs Latency Metric - Batched inference timing with mergeable histograms
+Edge nodes time inference with perf_counter_ns after a warmup and record into
+log-linear (HDR-style) histograms. Histograms from different nodes merge
+exactly, so the cloud reports p50/p95/p99/p99.9 over every node's samples.
+"""
+
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+PERCENTILES = {"p50": 50.0, "p95": 95.0, "p99": 99.0, "p999": 99.9}
+
+DEFAULT_SETTINGS = {"warmup": 10, "iterations": 100, "batch_sizes": [32]}
+
+
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond values
+
+    Values below 2**bits get their own bucket; above that every power of two
+    is split into 2**(bits - 1) buckets, so the relative error of a reported
+    value stays below 2**-(bits - 1) (under 1% with the default 8 bits).
+    """
+
+    def __init__(self, bits: int = 8):
+        self.bits = bits
+        self.half = 1 << (bits - 1)
+        self.counts = np.zeros(1 << bits, dtype=np.int64)
+        self.total_ns = 0
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def bucket_indices(self, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=np.int64)
+        shift = np.maximum(np.frexp(values.astype(np.float64))[1] - self.bits, 0)
+        return shift * self.half + (values >> shift)
+
+    def bucket_values(self, indices: np.ndarray) -> np.ndarray:
+        """Midpoint of each bucket in nanoseconds"""
+        indices = np.asarray(indices, dtype=np.int64)
+        shift = np.maximum(indices // self.half - 1, 0)
+        low = (indices - shift * self.half) << shift
+        return low + ((1 << shift) - 1) / 2
+
+    def record(self, values_ns):
+        values = np.atleast_1d(np.asarray(values_ns, dtype=np.int64))
+        if not len(values):
+            return
+        indices = self.bucket_indices(values)
+        if indices.max() >= len(self.counts):
+            self._grow(int(indices.max()) + 1)
+        np.add.at(self.counts, indices, 1)
+        self.total_ns += int(values.sum())
+
+    def _grow(self, size: int):
+        counts = np.zeros(size, dtype=np.int64)
+        counts[:len(self.counts)] = self.counts
+        self.counts = counts
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        if other.bits != self.bits:
+            raise ValueError(f"Cannot merge histograms with {other.bits} and {self.bits} bits")
+        if len(other.counts) > len(self.counts):
+            self._grow(len(other.counts))
+        self.counts[:len(other.counts)] += other.counts
+        self.total_ns += other.total_ns
+        return self
+
+    def mean_ms(self) -> float:
+        count = self.count
+        return self.total_ns / count / 1e6 if count else 0.0
+
+    def percentile_ms(self, percentile: float) -> float:
+        """Value at ``percentile`` (0-100), as the midpoint of the bucket reaching that rank"""
+        count = self.count
+        if not count:
+            return 0.0
+        rank = max(1, int(np.ceil(percentile / 100 * count)))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return float(self.bucket_values(index)) / 1e6
+
+    def summary(self) -> Dict[str, float]:
+        """Mean and PERCENTILES in milliseconds"""
+        return {"mean": self.mean_ms(), **{k: self.percentile_ms(p) for k, p in PERCENTILES.items()}}
+
+    def to_dict(self) -> Dict:
+        """Sparse JSON-safe form: only non-empty buckets are listed"""
+        nonzero = np.flatnonzero(self.counts)
+        return {
+            "bits": self.bits,
+            "total_ns": self.total_ns,
+            "buckets": nonzero.tolist(),
+            "counts": self.counts[nonzero].tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        histogram = cls(data["bits"])
+        if data["buckets"]:
+            histogram._grow(max(len(histogram.counts), max(data["buckets"]) + 1))
+            histogram.counts[data["buckets"]] = data["counts"]
+        histogram.total_ns = data["total_ns"]
+        return histogram
+
+
+def measure_inference(predict: Callable[[np.ndarray], np.ndarray], X: np.ndarray,
+                      batch_sizes: List[int], warmup: int = 10,
+                      iterations: int = 100) -> Dict[int, LatencyHistogram]:
+    """Time ``predict`` on batches of X; one histogram per batch size
+
+    Batches cycle through X. The first ``warmup`` calls of each batch size
+    are run but not recorded, so cold caches and lazy allocation do not
+    land in the tail.
+    """
+    histograms = {}
+    for batch_size in batch_sizes:
+        size = min(batch_size, len(X))
+        starts = (np.arange(warmup + iterations) * size) % max(1, len(X) - size + 1)
+        timings = np.empty(iterations, dtype=np.int64)
+        for i, start in enumerate(starts):
+            batch = X[start:start + size]
+            t0 = time.perf_counter_ns()
+            predict(batch)
+            elapsed = time.perf_counter_ns() - t0
+            if i >= warmup:
+                timings[i - warmup] = elapsed
+        histogram = LatencyHistogram()
+        histogram.record(timings)
+        histograms[batch_size] = histogram
+    return histograms
+
+
+def merge_histograms(reports: List[Dict]) -> Dict[int, LatencyHistogram]:
+    """Merge per-node {batch_size: histogram dict} reports by batch size"""
+    merged = {}
+    for report in reports:
+        for batch_size, data in report.items():
+            histogram = LatencyHistogram.from_dict(data)
+            batch_size = int(batch_size)
+            if batch_size in merged:
+                merged[batch_size].merge(histogram)
+            else:
+                merged[batch_size] = histogram
+    return merged
+
+
+def latency_settings(metrics: List[Dict]) -> Dict:
+    """Harness settings from the inference_latency entry of testenv.yaml metrics"""
+    entry = next((m for m in metrics if m.get("name") == "inference_latency"), {})
+    return {key: entry.get(key, default) for key, default in DEFAULT_SETTINGS.items()}
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Ianvs Classification Metrics - Streaming confusion-matrix evaluator
+Prediction batches are folded into an integer confusion matrix, so a dataset is
+evaluated in one inference sweep with O(classes^2) memory. Matrices from
+different edge nodes merge exactly, and accuracy, precision, recall and F1
+(macro, micro and per class) are all derived from the matrix.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+CLASSIFICATION_METRICS = ("accuracy", "precision", "recall", "f1_score")
+
+AVERAGES = ("macro", "micro")
+
+# Rows per predict_proba call when sweeping a dataset
+EVAL_BATCH_SIZE = 1024
+
+
+class ConfusionMatrix:
+    """counts[true, predicted] over every prediction seen so far"""
+
+    def __init__(self, n_classes: int):
+        self.n_classes = n_classes
+        self.counts = np.zeros((n_classes, n_classes), dtype=np.int64)
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray):
+        cells = np.asarray(y_true, dtype=np.int64) * self.n_classes + np.asarray(y_pred, dtype=np.int64)
+        self.counts += np.bincount(cells, minlength=self.n_classes ** 2).reshape(self.n_classes, -1)
+
+    def merge(self, other: "ConfusionMatrix") -> "ConfusionMatrix":
+        if other.n_classes != self.n_classes:
+            raise ValueError(f"Cannot merge confusion matrices of {other.n_classes} and {self.n_classes} classes")
+        self.counts += other.counts
+        return self
+
+    def metrics(self) -> Dict:
+        """Accuracy plus macro, micro and per-class precision, recall and F1
+
+        Macro averages run over the classes that occur in the labels or the
+        predictions; a class with no predictions has precision 0, as in
+        scikit-learn with zero_division=0. Single-label micro precision,
+        recall and F1 all equal accuracy.
+        """
+        tp = np.diag(self.counts).astype(np.float64)
+        predicted = self.counts.sum(axis=0)
+        support = self.counts.sum(axis=1)
+        precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+        recall = np.divide(tp, support, out=np.zeros_like(tp), where=support > 0)
+        denominator = precision + recall
+        f1 = np.divide(2 * precision * recall, denominator, out=np.zeros_like(tp), where=denominator > 0)
+        present = (predicted > 0) | (support > 0)
+        accuracy = float(tp.sum() / self.total) if self.total else 0.0
+        return {
+            "accuracy": accuracy,
+            **{f"{name}_macro": float(values[present].mean()) if present.any() else 0.0
+               for name, values in (("precision", precision), ("recall", recall), ("f1", f1))},
+            "precision_micro": accuracy,
+            "recall_micro": accuracy,
+            "f1_micro": accuracy,
+            "class_precision": precision.tolist(),
+            "class_recall": recall.tolist(),
+            "class_f1": f1.tolist(),
+            "class_support": support.tolist(),
+        }
+
+    def summary(self, averages: Dict[str, str]) -> Dict:
+        """CLASSIFICATION_METRICS with precision/recall/f1_score averaged per ``averages``, plus the rest"""
+        metrics = self.metrics()
+        return {
+            "accuracy": metrics["accuracy"],
+            "precision": metrics[f"precision_{averages.get('precision', 'macro')}"],
+            "recall": metrics[f"recall_{averages.get('recall', 'macro')}"],
+            "f1_score": metrics[f"f1_{averages.get('f1_score', 'macro')}"],
+            **{k: v for k, v in metrics.items() if k.startswith(("f1_", "class_"))},
+        }
+
+    def to_dict(self) -> Dict:
+        """Sparse JSON-safe form: only non-empty cells are listed"""
+        cells = np.flatnonzero(self.counts)
+        return {"classes": self.n_classes, "cells": cells.tolist(), "counts": self.counts.flat[cells].tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ConfusionMatrix":
+        matrix = cls(data["classes"])
+        matrix.counts.flat[data["cells"]] = data["counts"]
+        return matrix
+
+
+def evaluate_stream(predict_proba, X: np.ndarray, y: np.ndarray, n_classes: int,
+                    batch_size: int = EVAL_BATCH_SIZE) -> Tuple[ConfusionMatrix, float]:
+    """Confusion matrix and mean cross-entropy from a single sweep over X
+
+    Each batch is predicted once and both the argmax and the log-likelihood
+    come from the same probabilities. Memory-mapped X is read batch by batch.
+    """
+    matrix = ConfusionMatrix(n_classes)
+    log_loss = 0.0
+    for start in range(0, len(y), batch_size):
+        labels = np.asarray(y[start:start + batch_size])
+        proba = predict_proba(X[start:start + batch_size])
+        matrix.update(labels, proba.argmax(axis=1))
+        log_loss -= float(np.log(proba[np.arange(len(labels)), labels] + 1e-12).sum())
+    return matrix, log_loss / len(y) if len(y) else 0.0
+
+
+def merge_matrices(reports: List[Dict]) -> ConfusionMatrix:
+    """Merge ConfusionMatrix.to_dict reports from several nodes"""
+    merged = None
+    for report in reports:
+        matrix = ConfusionMatrix.from_dict(report)
+        merged = matrix if merged is None else merged.merge(matrix)
+    return merged
+
+
+def classification_settings(metrics: List[Dict]) -> Dict[str, str]:
+    """Average ("macro"/"micro") of each of precision, recall and f1_score from testenv.yaml metrics"""
+    averages = {}
+    for entry in metrics:
+        if entry.get("name") in CLASSIFICATION_METRICS[1:]:
+            average = entry.get("average", "macro")
+            if average not in AVERAGES:
+                raise ValueError(f"Unknown average '{average}' for metric {entry['name']}, expected one of {AVERAGES}")
+            averages[entry["name"]] = average
+    return averages
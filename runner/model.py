@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Ianvs Federated Model - Built-in softmax-regression base model
+Parameters live in one flat float32 vector so updates can be aggregated,
+encoded and checkpointed as plain buffers
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+class SoftmaxModel:
+    """Multinomial logistic regression over dense features"""
+
+    def __init__(self, n_features: int, n_classes: int):
+        self.n_features = n_features
+        self.n_classes = n_classes
+
+    @property
+    def size(self) -> int:
+        return (self.n_features + 1) * self.n_classes
+
+    def init_weights(self, seed: int = 0) -> np.ndarray:
+        rng = np.random.default_rng(seed)
+        weights = np.zeros(self.size, dtype=np.float32)
+        weights[:self.n_features * self.n_classes] = rng.normal(
+            0.0, 0.01, self.n_features * self.n_classes
+        )
+        return weights
+
+    def unpack(self, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Views of the weight matrix and bias inside the flat vector"""
+        split = self.n_features * self.n_classes
+        return weights[:split].reshape(self.n_features, self.n_classes), weights[split:]
+
+    def predict_proba(self, weights: np.ndarray, X: np.ndarray) -> np.ndarray:
+        W, b = self.unpack(weights)
+        logits = X @ W + b
+        logits -= logits.max(axis=1, keepdims=True)
+        np.exp(logits, out=logits)
+        logits /= logits.sum(axis=1, keepdims=True)
+        return logits
+
+    def predict(self, weights: np.ndarray, X: np.ndarray) -> np.ndarray:
+        W, b = self.unpack(weights)
+        return np.argmax(X @ W + b, axis=1)
+
+    def loss(self, weights: np.ndarray, X: np.ndarray, y: np.ndarray) -> float:
+        proba = self.predict_proba(weights, X)
+        return float(-np.mean(np.log(proba[np.arange(len(y)), y] + 1e-12)))
+
+    def gradient(self, weights: np.ndarray, X: np.ndarray, y: np.ndarray) -> np.ndarray:
+        proba = self.predict_proba(weights, X)
+        proba[np.arange(len(y)), y] -= 1.0
+        proba /= len(y)
+        return np.concatenate([(X.T @ proba).ravel(), proba.sum(axis=0)]).astype(np.float32)
+
+    def train(self, weights: np.ndarray, X: np.ndarray, y: np.ndarray, epochs: int = 1,
+              batch_size: int = 32, learning_rate: float = 0.001, optimizer: str = "adam",
+              seed: int = 0, mu: float = 0.0) -> np.ndarray:
+        """Mini-batch training from the given weights; returns new weights
+
+        A positive ``mu`` adds the FedProx proximal term pulling the weights
+        back towards the starting (global) weights.
+        """
+        rng = np.random.default_rng(seed)
+        anchor = weights
+        weights = weights.astype(np.float32, copy=True)
+        m = np.zeros_like(weights)
+        v = np.zeros_like(weights)
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        step = 0
+        for _ in range(epochs):
+            order = rng.permutation(len(y))
+            for start in range(0, len(y), batch_size):
+                batch = order[start:start + batch_size]
+                grad = self.gradient(weights, X[batch], y[batch])
+                if mu > 0:
+                    grad += mu * (weights - anchor)
+                step += 1
+                if optimizer == "adam":
+                    m = beta1 * m + (1 - beta1) * grad
+                    v = beta2 * v + (1 - beta2) * grad * grad
+                    m_hat = m / (1 - beta1 ** step)
+                    v_hat = v / (1 - beta2 ** step)
+                    weights -= learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+                else:
+                    weights -= learning_rate * grad
+        return weights
+
+
+def make_synthetic_dataset(n_samples: int, n_features: int = 64, n_classes: int = 10,
+                           seed: int = 0, centers_seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Gaussian class clusters standing in for a real dataset
+
+    Every node draws its own samples (``seed``) around the same class centers
+    (``centers_seed``), so models trained on different shards agree.
+    """
+    centers = np.random.default_rng(centers_seed).normal(0.0, 1.0, (n_classes, n_features))
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, n_classes, n_samples)
+    X = centers[y] + rng.normal(0.0, 2.0, (n_samples, n_features))
+    return X.astype(np.float32), y.astype(np.int64)
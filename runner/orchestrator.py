@@ -0,0 +1,795 @@
+#!/usr/bin/env python3
+"""
+Ianvs Federated Orchestrator - Drives federated rounds for the benchmarking job
+Reads rounds, clients and epochs from algorithm.yaml and parallelism, retries and
+timeout from benchmarkingjob.yaml, then collects edge updates concurrently with
+asyncio. Edge workers are reached over HTTP or simulated in-process.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import sys
+import time
+import urllib.request
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+import yaml
+
+from aggregation import build_aggregator
+from checkpoint import Checkpoint, CheckpointStore
+from dataset import DatasetSpec, PreparedDataset, prepare_from_configs
+from edge_worker import EdgeWorker, shard_worker
+from exporter import (ACCURACY, PHASE_SECONDS, ROUND_DURATION, ROUNDS, TRANSPORT_BYTES, UPDATES, UPDATES_IN_FLIGHT,
+                      metrics_port, observe_latency, serve_until_stopped, start_exporter)
+from history import JobHistory, config_snapshot
+from latency import PERCENTILES, latency_settings, merge_histograms
+from metrics import ConfusionMatrix, classification_settings, evaluate_stream, merge_matrices
+from model import SoftmaxModel
+from result_cache import ResultCache, cache_key, code_digest, replay
+from regression import REGRESSION_EXIT_CODE, check_against_baseline, print_report
+from results_store import open_results_writer
+from simulator import LocalFederation
+from sweep import edge_limits, run_sweep, write_sweep
+from telemetry import ResourceSampler, open_sampler
+from transport import Buffer, codec_from_config, decode, downlink_codec, payload_size
+
+CONFIG_DIR = Path(__file__).parent / "configs"
+
+LATE_UPDATE_POLICIES = ("stale", "drop")
+
+# JobConfig fields that do not change an algorithm's results, left out of its cache key
+UNKEYED_JOB_FIELDS = ("name", "algorithms", "output", "sweep", "telemetry", "regression", "cache", "checkpoint")
+
+
+@dataclass
+class AlgorithmConfig:
+    name: str
+    rounds: int = 10
+    client_number: int = 3
+    local_epochs: int = 2
+    batch_size: int = 32
+    learning_rate: float = 0.001
+    optimizer: str = "adam"
+    train_ratio: float = 0.8
+    aggregation: Dict = field(default_factory=dict)
+
+    @classmethod
+    def from_file(cls, name: str, path: Path) -> "AlgorithmConfig":
+        with open(path, 'r') as f:
+            algorithm = yaml.safe_load(f)["algorithm"]
+        modules = {m["type"]: m.get("hyperparameters", {}) for m in algorithm.get("modules", [])}
+        basemodel = modules.get("basemodel", {})
+        train = modules.get("train", {})
+        return cls(
+            name=name,
+            rounds=int(train.get("rounds", 10)),
+            client_number=int(train.get("client_number", 3)),
+            local_epochs=int(train.get("local_epochs", 2)),
+            batch_size=int(basemodel.get("batch_size", 32)),
+            learning_rate=float(basemodel.get("learning_rate", 0.001)),
+            optimizer=basemodel.get("optimizer", "adam"),
+            train_ratio=float(algorithm.get("fl_data_setting", {}).get("train_ratio", 0.8)),
+            aggregation=modules.get("aggregation", {}),
+        )
+
+
+@dataclass
+class JobConfig:
+    name: str
+    algorithms: List[AlgorithmConfig]
+    parallelism: int = 3
+    retry_limit: int = 2
+    timeout: float = 3600
+    round_deadline: float = 0.0
+    min_updates: int = 1
+    late_updates: str = "stale"
+    staleness_decay: float = 0.5
+    max_staleness: int = 2
+    output: Dict = field(default_factory=dict)
+    transport: Dict = field(default_factory=dict)
+    latency: Dict = field(default_factory=dict)
+    classification: Dict[str, str] = field(default_factory=dict)
+    sweep: Dict = field(default_factory=dict)
+    telemetry: Dict = field(default_factory=dict)
+    regression: Dict = field(default_factory=dict)
+    cache: Dict = field(default_factory=dict)
+    checkpoint: Dict = field(default_factory=dict)
+    edge_delays: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_dir(cls, config_dir: Path = CONFIG_DIR) -> "JobConfig":
+        """Load benchmarkingjob.yaml, testenv.yaml and the algorithm files it references
+
+        Referenced paths are resolved by file name inside ``config_dir`` so the
+        same configs work from the repo root and from the container's /app.
+        """
+        with open(config_dir / "benchmarkingjob.yaml", 'r') as f:
+            job = yaml.safe_load(f)["benchmarkingjob"]
+        execution = job.get("execution", {})
+        with open(config_dir / "testenv.yaml", 'r') as f:
+            testenv = yaml.safe_load(f)["testenv"]
+        late_updates = execution.get("late_updates", "stale")
+        if late_updates not in LATE_UPDATE_POLICIES:
+            raise ValueError(f"Unknown execution.late_updates '{late_updates}', expected one of {LATE_UPDATE_POLICIES}")
+        return cls(
+            name=job["name"],
+            algorithms=[
+                AlgorithmConfig.from_file(a["name"], config_dir / Path(a["algorithm"]).name)
+                for a in job.get("algorithms", [])
+            ],
+            parallelism=int(execution.get("parallelism", 3)),
+            retry_limit=int(execution.get("retry_limit", 2)),
+            timeout=float(execution.get("timeout", 3600)),
+            round_deadline=float(execution.get("round_deadline", 0.0)),
+            min_updates=int(execution.get("min_updates", 1)),
+            late_updates=late_updates,
+            staleness_decay=float(execution.get("staleness_decay", 0.5)),
+            max_staleness=int(execution.get("max_staleness", 2)),
+            output=job.get("output", {}),
+            transport=job.get("transport", {}),
+            latency=latency_settings(testenv.get("metrics", [])),
+            classification=classification_settings(testenv.get("metrics", [])),
+            sweep=job.get("sweep", {}),
+            telemetry=job.get("telemetry", {}),
+            regression=job.get("regression", {}),
+            cache=job.get("cache", {}),
+            checkpoint=job.get("checkpoint", {}),
+            edge_delays={n["name"]: float(n["simulated_delay"])
+                         for n in testenv.get("edge_nodes", []) if n.get("simulated_delay")},
+        )
+
+
+class SimulatedEdgeClient:
+    """Runs an EdgeWorker in-process on a worker thread
+
+    ``delay`` adds seconds to every exchange to stand in for a slower node or
+    link (testenv.yaml edge_nodes[].simulated_delay).
+    """
+
+    def __init__(self, worker: EdgeWorker, delay: float = 0.0):
+        self.name = worker.name
+        self.worker = worker
+        self.delay = delay
+
+    def _exchange(self, payload: List[Buffer], params: Dict) -> Tuple[bytes, Dict]:
+        # Join the buffers as the socket would, so bytes and codec loss match the HTTP path
+        reply, metrics = self.worker.handle(b"".join(payload), params)
+        if self.delay:
+            time.sleep(self.delay)
+        return b"".join(reply), metrics
+
+    async def train(self, payload: List[Buffer], params: Dict, timeout: float) -> Tuple[bytes, Dict]:
+        return await asyncio.wait_for(
+            asyncio.to_thread(self._exchange, payload, params), timeout
+        )
+
+
+class HttpEdgeClient:
+    """Reaches a remote edge_worker.py over HTTP"""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url.rstrip("/")
+
+    def _post(self, payload: List[Buffer], params: Dict, timeout: float) -> Tuple[bytes, Dict]:
+        request = urllib.request.Request(
+            f"{self.url}/train",
+            data=payload,
+            headers={
+                "Content-Type": "application/octet-stream",
+                "Content-Length": str(payload_size(payload)),
+                "X-Ianvs-Train": json.dumps(params),
+            },
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            metrics = json.loads(response.headers["X-Ianvs-Metrics"])
+            return response.read(), metrics
+
+    async def train(self, payload: List[Buffer], params: Dict, timeout: float) -> Tuple[bytes, Dict]:
+        return await asyncio.to_thread(self._post, payload, params, timeout)
+
+
+@dataclass
+class InFlight:
+    """A client request that has not been folded into an aggregate yet"""
+    client: str
+    round: int
+    reference: np.ndarray  # Global model the client was sent, to decode delta updates
+    sent: float
+    deadline: Optional[float]
+
+
+@dataclass
+class EdgeUpdate:
+    client: str
+    payload: bytes
+    metrics: Dict
+
+
+class FederatedOrchestrator:
+    """Runs the federated rounds of one algorithm against a set of edge clients"""
+
+    def __init__(self, job: JobConfig, algorithm: AlgorithmConfig, clients: List,
+                 model: SoftmaxModel, test_set: Tuple[np.ndarray, np.ndarray], writer,
+                 sampler: Optional[ResourceSampler] = None, simulator: Optional[LocalFederation] = None,
+                 checkpoints: Optional[CheckpointStore] = None, run_id: str = "", checkpoint_key: str = ""):
+        self.job = job
+        self.algorithm = algorithm
+        self.clients = clients
+        self.model = model
+        self.X_test, self.y_test = test_set
+        self.writer = writer
+        self.sampler = sampler
+        self.simulator = simulator
+        self.checkpoints = checkpoints
+        self.run_id = run_id
+        self.checkpoint_key = checkpoint_key
+        self.aggregator = build_aggregator(model.size, len(clients), algorithm.aggregation)
+        self.uplink = codec_from_config(job.transport)
+        self.downlink = downlink_codec(self.uplink)
+        self.downlink_bytes = 0
+        self.started = 0.0
+        self.deadline = 0.0
+        self.in_flight: Dict[asyncio.Task, InFlight] = {}
+        # Simulated clients queue on the process pool instead
+        self._slots = asyncio.Semaphore(len(clients) if simulator else max(1, job.parallelism))
+
+    @contextmanager
+    def phase(self, round_num: int, name: str):
+        with PHASE_SECONDS.time(role="cloud", phase=name):
+            with self.sampler.phase(round_num, name) if self.sampler else nullcontext():
+                yield
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    async def collect_update(self, client, payload: List[Buffer], round_num: int) -> Optional[EdgeUpdate]:
+        """Request one client's update, retrying up to execution.retry_limit times"""
+        params = {
+            "round": round_num,
+            "local_epochs": self.algorithm.local_epochs,
+            "batch_size": self.algorithm.batch_size,
+            "learning_rate": self.algorithm.learning_rate,
+            "optimizer": self.algorithm.optimizer,
+            "transport": self.uplink.config(),
+            "latency": self.job.latency,
+            **self.aggregator.client_params(),
+        }
+        for attempt in range(self.job.retry_limit + 1):
+            try:
+                async with self._slots:
+                    self.downlink_bytes += payload_size(payload)
+                    TRANSPORT_BYTES.inc(payload_size(payload), role="cloud", direction="sent")
+                    reply, metrics = await client.train(payload, params, self.remaining())
+                TRANSPORT_BYTES.inc(len(reply), role="cloud", direction="received")
+                return EdgeUpdate(client.name, reply, metrics)
+            except Exception as e:
+                print(f"  [{client.name}] attempt {attempt + 1} failed: {e!r}")
+                if attempt < self.job.retry_limit:
+                    await asyncio.sleep(min(0.5 * 2 ** attempt, self.remaining()))
+        return None
+
+    def evaluate(self, weights: np.ndarray) -> Dict:
+        """Loss and classification metrics of the global model, from one sweep over the test set"""
+        matrix, loss = evaluate_stream(
+            lambda batch: self.model.predict_proba(weights, batch),
+            self.X_test, self.y_test, self.model.n_classes
+        )
+        return {"loss": loss, **matrix.summary(self.job.classification)}
+
+    def node_f1(self, metrics: Dict) -> Optional[float]:
+        if "confusion" not in metrics:
+            return None
+        return ConfusionMatrix.from_dict(metrics["confusion"]).summary(self.job.classification)["f1_score"]
+
+    def edge_metrics(self, reports: List[Dict]) -> Dict:
+        """Accuracy and F1 over the validation sets of all aggregated nodes, from their merged matrices"""
+        if not reports:
+            return {}
+        summary = merge_matrices(reports).summary(self.job.classification)
+        return {"edge_accuracy": summary["accuracy"], "edge_f1_score": summary["f1_score"]}
+
+    def latency_metrics(self, merged: Dict) -> Dict:
+        """Edge latency over all responding nodes, from their merged histograms"""
+        primary = merged.get(int(self.job.latency["batch_sizes"][0]))
+        if primary is None:
+            return {}
+        summary = primary.summary()
+        return {
+            "latency": summary["mean"],
+            "inference_latency": summary["mean"],
+            **{f"latency_{name}": summary[name] for name in PERCENTILES},
+        }
+
+    def staleness_scale(self, staleness: int) -> Optional[float]:
+        """Aggregation weight factor of an update ``staleness`` rounds late, or None to drop it"""
+        if staleness == 0:
+            return 1.0
+        if self.job.late_updates == "drop" or staleness > self.job.max_staleness:
+            return None
+        return (1 + staleness) ** -self.job.staleness_decay
+
+    def dispatch(self, round_num: int, weights: np.ndarray, start: float) -> Optional[float]:
+        """Send the global model to every client not still working on an earlier round; returns the round deadline"""
+        # The global model is encoded once and the same buffers go to every client
+        payload = self.downlink.encode(weights)
+        if self.simulator:
+            self.simulator.publish(round_num, weights)
+        deadline = start + self.job.round_deadline if self.job.round_deadline > 0 else None
+        busy = {flight.client for flight in self.in_flight.values()}
+        for client in self.clients:
+            if client.name in busy:
+                continue
+            task = asyncio.create_task(self.collect_update(client, payload, round_num))
+            self.in_flight[task] = InFlight(client.name, round_num, weights, start, deadline)
+        return deadline
+
+    async def run_round(self, round_num: int, weights: np.ndarray) -> Tuple[np.ndarray, Dict]:
+        """One round: fan out, then aggregate whatever has arrived by the round deadline
+
+        Without execution.round_deadline every client is waited for. With it,
+        aggregation starts at the deadline once execution.min_updates updates
+        are in; clients still training become stragglers and their updates are
+        folded into a later round with weight (1 + staleness) ** -staleness_decay,
+        or dropped per execution.late_updates and max_staleness.
+        """
+        start = time.monotonic()
+        self.downlink_bytes = 0
+        deadline = self.dispatch(round_num, weights, start)
+        UPDATES_IN_FLIGHT.set(len(self.in_flight))
+        uplink_bytes = 0
+        self.aggregator.reset(weights)
+        edge_nodes = []
+        latency_reports = []
+        confusion_reports = []
+        on_time_responses = []
+        # Fold each update into the aggregate as soon as it arrives and let
+        # its buffer go; only the metrics are kept for the round record
+        with self.phase(round_num, "train"):
+            while self.in_flight:
+                now = time.monotonic()
+                if deadline is not None and now >= deadline and self.aggregator.count >= self.job.min_updates:
+                    break
+                timeout = deadline - now if deadline is not None and now < deadline else None
+                done, _ = await asyncio.wait(list(self.in_flight), timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                arrived = time.monotonic()
+                UPDATES_IN_FLIGHT.set(len(self.in_flight) - len(done))
+                for task in done:
+                    flight = self.in_flight.pop(task)
+                    update = task.result()
+                    staleness = round_num - flight.round
+                    timing = {
+                        "response_time": arrived - flight.sent,
+                        "lateness": max(0.0, arrived - flight.deadline) if flight.deadline else 0.0,
+                        "staleness": staleness,
+                    }
+                    if update is None:
+                        edge_nodes.append({"name": flight.client, "samples": 0, "accuracy": 0.0,
+                                           "avg_latency": 0.0, "p99_latency": 0.0, "status": "failed", **timing})
+                        continue
+                    scale = self.staleness_scale(staleness)
+                    uplink_bytes += len(update.payload)
+                    if scale is not None:
+                        self.aggregator.add(decode(update.payload, flight.reference),
+                                            update.metrics["samples"], scale)
+                        latency_reports.append(update.metrics.get("latency_histograms", {}))
+                        if "confusion" in update.metrics:
+                            confusion_reports.append(update.metrics["confusion"])
+                        if not staleness:
+                            on_time_responses.append(timing["response_time"])
+                    edge_nodes.append({
+                        "name": update.client,
+                        "samples": update.metrics["samples"],
+                        "accuracy": update.metrics["accuracy"],
+                        "f1_score": self.node_f1(update.metrics),
+                        "avg_latency": update.metrics["avg_latency"],
+                        "p99_latency": update.metrics.get("p99_latency", 0.0),
+                        "cpu_percent": update.metrics.get("cpu_percent"),
+                        "memory_mb": update.metrics.get("memory_mb"),
+                        "status": "dropped" if scale is None else "late" if staleness else "active",
+                        **timing,
+                    })
+        collect_time = time.monotonic() - start
+
+        if not self.aggregator.count:
+            raise RuntimeError(f"Round {round_num}: no edge updates received")
+
+        with self.phase(round_num, "aggregate"):
+            weights = self.aggregator.result()
+        with self.phase(round_num, "evaluate"):
+            evaluation = self.evaluate(weights)
+        for flight in self.in_flight.values():
+            edge_nodes.append({"name": flight.client, "samples": 0, "accuracy": 0.0,
+                               "avg_latency": 0.0, "p99_latency": 0.0, "status": "straggler",
+                               "response_time": start + collect_time - flight.sent, "lateness": 0.0,
+                               "staleness": round_num - flight.round})
+
+        latency = merge_histograms(latency_reports)
+        observe_latency(latency)
+        for node in edge_nodes:
+            UPDATES.inc(status=node["status"])
+
+        record = {
+            "round": round_num,
+            "total_rounds": self.algorithm.rounds,
+            "timestamp": datetime.now().isoformat(),
+            "algorithm": self.algorithm.name,
+            **evaluation,
+            **self.latency_metrics(latency),
+            **self.edge_metrics(confusion_reports),
+            "round_duration": time.monotonic() - start,
+            "round_deadline": self.job.round_deadline or None,
+            "collect_time": collect_time,
+            # Time the round kept waiting after its median on-time client had answered
+            "straggler_wait": collect_time - float(np.median(on_time_responses)) if on_time_responses else 0.0,
+            "participants": self.aggregator.count,
+            "uplink_bytes": uplink_bytes,
+            "downlink_bytes": self.downlink_bytes,
+            "bandwidth_usage": (uplink_bytes + self.downlink_bytes) / 1e6,
+            "edge_nodes": sorted(edge_nodes, key=lambda n: n["name"]),
+        }
+        if self.sampler:
+            cloud = self.sampler.round_summary(round_num)
+            record["cloud_cpu_percent"] = cloud.get("cpu_percent")
+            record["cloud_memory_mb"] = cloud.get("memory_mb")
+        if self.simulator:
+            record["core_utilization"] = self.simulator.core_utilization()
+        return weights, record
+
+    def in_process_workers(self) -> Dict[str, EdgeWorker]:
+        """Workers whose state lives in this process; HTTP and process-pool clients keep their own"""
+        return {client.name: client.worker for client in self.clients if isinstance(client, SimulatedEdgeClient)}
+
+    def save_checkpoint(self, round_num: int, weights: np.ndarray, history: List[Dict]):
+        """Flush the round records, then checkpoint the model, records and client error feedback"""
+        # The results on disk must cover every round the checkpoint says is done
+        self.writer.flush()
+        residuals = {name: worker.residual for name, worker in self.in_process_workers().items()
+                     if worker.residual is not None}
+        self.checkpoints.save(self.run_id, self.algorithm.name,
+                              Checkpoint(round_num, weights, history, self.checkpoint_key, residuals,
+                                         time.monotonic() - self.started))
+
+    def timeout_record(self, round_num: int, weights: np.ndarray, history: List[Dict]) -> Dict:
+        """Record of the round cut short by execution.timeout, evaluating the last global model"""
+        record = {
+            "round": round_num,
+            "total_rounds": self.algorithm.rounds,
+            "timestamp": datetime.now().isoformat(),
+            "algorithm": self.algorithm.name,
+            "status": "timeout",
+            **self.evaluate(weights),
+        }
+        if history:
+            record["convergence_round"] = convergence_round(history)
+        return record
+
+    async def run(self, resume: Optional[Checkpoint] = None) -> List[Dict]:
+        """Run every round within execution.timeout and write each round's record
+
+        When the timeout runs out, the unfinished round is recorded with
+        status "timeout" and the run ends there, so it is still recorded in
+        the job history and its checkpoints are removed.
+
+        With ``resume`` the run continues after the checkpointed round. All
+        randomness is seeded by node and round, so the model, the records and
+        the client error feedback are the whole state; updates still in
+        flight when the checkpoint was taken are not, and are re-requested.
+        The time already spent before the checkpoint counts against the
+        timeout, so a run that keeps failing cannot resume forever.
+        """
+        self.started = time.monotonic() - (resume.elapsed if resume else 0.0)
+        self.deadline = self.started + self.job.timeout
+        weights = self.model.init_weights()
+        history = []
+        if resume:
+            weights, history = resume.weights, list(resume.history)
+            for name, worker in self.in_process_workers().items():
+                worker.residual = resume.clients.get(name)
+        for round_num in range(len(history) + 1, self.algorithm.rounds + 1):
+            try:
+                weights, record = await asyncio.wait_for(
+                    self.run_round(round_num, weights), self.remaining()
+                )
+            except asyncio.TimeoutError:
+                record = self.timeout_record(round_num, weights, history)
+                history.append(record)
+                self.writer.write_round(record)
+                print(f"Round {round_num}/{self.algorithm.rounds}: execution.timeout of {self.job.timeout:g}s "
+                      f"reached; stopping {self.algorithm.name} at accuracy={record['accuracy']:.4f}")
+                break
+            history.append(record)
+            ROUND_DURATION.observe(record["round_duration"], algorithm=self.algorithm.name)
+            ROUNDS.inc(algorithm=self.algorithm.name)
+            ACCURACY.set(record["accuracy"], algorithm=self.algorithm.name)
+            if round_num == self.algorithm.rounds:
+                record["status"] = "completed"
+                record["convergence_round"] = convergence_round(history)
+            self.writer.write_round(record)
+            if self.checkpoints and self.checkpoints.due(round_num, self.algorithm.rounds):
+                self.save_checkpoint(round_num, weights, history)
+            print(f"Round {round_num}/{self.algorithm.rounds}: accuracy={record['accuracy']:.4f} "
+                  f"loss={record['loss']:.4f} ({record['round_duration']:.2f}s, "
+                  f"{record['bandwidth_usage']:.3f} MB, "
+                  f"{record['participants']}/{len(self.clients)} updates)")
+        # Stragglers still training after the last round have nothing left to join
+        for task in self.in_flight:
+            task.cancel()
+        await asyncio.gather(*self.in_flight, return_exceptions=True)
+        self.in_flight.clear()
+        return history
+
+
+def convergence_round(history: List[Dict], tolerance: float = 0.01) -> int:
+    """First round whose accuracy is within ``tolerance`` of the best accuracy"""
+    best = max(r["accuracy"] for r in history)
+    return next(r["round"] for r in history if r["accuracy"] >= best - tolerance)
+
+
+def resolve_edge_service(service: str, wait: float = 120.0) -> List[str]:
+    """Endpoint URL of every edge worker behind a headless Service given as "host:port"
+
+    A headless Service resolves to one address per ready pod. Edge pods may
+    still be starting when the cloud pod comes up, so resolution is retried
+    for up to ``wait`` seconds.
+    """
+    host, _, port = service.rpartition(":")
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            addresses = sorted({info[4][0] for info in socket.getaddrinfo(host, int(port), type=socket.SOCK_STREAM)})
+            return [f"http://[{a}]:{port}" if ":" in a else f"http://{a}:{port}" for a in addresses]
+        except socket.gaierror as e:
+            if time.monotonic() >= deadline:
+                sys.exit(f"No edge workers behind {service} after {wait:.0f}s ({e.strerror})")
+            print(f"Waiting for edge workers behind {service}...")
+            time.sleep(5)
+
+
+def build_clients(algorithm: AlgorithmConfig, endpoints: List[str], dataset: PreparedDataset,
+                  delays: Optional[Dict[str, float]] = None) -> List:
+    """HTTP clients for the given edge endpoints, or simulated workers over the dataset shards"""
+    if endpoints:
+        return [HttpEdgeClient(urlparse(url).netloc, url) for url in endpoints]
+    delays = delays or {}
+    return [
+        SimulatedEdgeClient(shard_worker(f"edge-node-{i + 1}", dataset, i, algorithm.train_ratio),
+                            delays.get(f"edge-node-{i + 1}", 0.0))
+        for i in range(algorithm.client_number)
+    ]
+
+
+def result_key(job: JobConfig, algorithm: AlgorithmConfig, config_dir: Path, dataset: PreparedDataset,
+               simulate: bool) -> str:
+    """Result cache key of one (algorithm, testenv) cell: settings, testenv, runner code and dataset manifest"""
+    with open(config_dir / "testenv.yaml", 'r') as f:
+        testenv = yaml.safe_load(f)
+    return cache_key({
+        "algorithm": asdict(algorithm),
+        "job": {k: v for k, v in asdict(job).items() if k not in UNKEYED_JOB_FIELDS},
+        "testenv": testenv,
+        "code": code_digest(Path(__file__).parent),
+        "dataset": dataset.manifest,
+        "simulate": simulate,
+    })
+
+
+def run_key(job: JobConfig, config_dir: Path, simulate: bool) -> str:
+    """Key a run is checkpointed under; a restart only resumes a run with the same settings, configs and code"""
+    return cache_key({
+        "job": asdict(job),
+        "configs": config_snapshot(config_dir),
+        "code": code_digest(Path(__file__).parent),
+        "simulate": simulate,
+    })
+
+
+def run_job(job: JobConfig, config_dir: Path, workspace: Path, endpoints: List[str], samples: int,
+            simulate: bool = False, processes: Optional[int] = None, cache: Optional[ResultCache] = None,
+            reuse: bool = True, resume: bool = True) -> Path:
+    """Run every algorithm of the job; results go to a per-run directory indexed in the job history
+
+    With ``simulate`` the clients are virtual ones on a LocalFederation
+    process pool of ``processes`` workers (one per core by default). With a
+    ``cache``, freshly completed algorithms are stored in it and, with
+    ``reuse``, those whose cell is unchanged since a cached run are replayed.
+    Rounds are checkpointed per benchmarkingjob.yaml checkpoint; with
+    ``resume`` an unfinished run of the same job and settings is continued
+    in its own results directory instead of starting a new one.
+    """
+    checkpoints = CheckpointStore.open(workspace, job.checkpoint)
+    job_key = run_key(job, config_dir, simulate) if checkpoints else None
+    resumed = checkpoints.unfinished(job.name, job_key) if checkpoints else None
+    if resumed and not resume:
+        checkpoints.finish(resumed)
+        resumed = None
+
+    if resumed:
+        run_dir = workspace / "results" / resumed
+        print(f"Resuming unfinished run {resumed} from its last checkpoint")
+    else:
+        stamp = f"{job.name}-{datetime.now():%Y%m%d-%H%M%S}"
+        run_dir = workspace / "results" / stamp
+        for n in itertools.count(2):
+            # Repeated runs can start within the same second
+            if not run_dir.exists():
+                break
+            run_dir = workspace / "results" / f"{stamp}-{n}"
+        if checkpoints:
+            checkpoints.start_run(run_dir.name, job.name, job_key)
+
+    sampler = None
+    if job.telemetry.get("enabled", True):
+        sampler = open_sampler(run_dir / "telemetry", "cloud-master", float(job.telemetry.get("interval", 0.5)))
+
+    # Every algorithm's split is written here; the sweep reads it even when no algorithm ran
+    dataset_dir = workspace / "datasets" / DatasetSpec.from_testenv(config_dir / "testenv.yaml").name
+    rounds = []
+    with open_results_writer(run_dir, job.output) as writer:
+        for algorithm in job.algorithms:
+            dataset = prepare_from_configs(config_dir, workspace, algorithm.client_number, samples)
+            model = SoftmaxModel(dataset.n_features, dataset.n_classes)
+            test_set = dataset.arrays("test")
+            key = result_key(job, algorithm, config_dir, dataset, simulate) if cache or checkpoints else None
+            cached = cache.get(key) if cache and reuse else None
+            if cached:
+                if resumed:
+                    writer.discard_after(algorithm.name, 0)
+                records = replay(cached)
+                for record in records:
+                    writer.write_round(record)
+                rounds.extend(records)
+                print(f"{algorithm.name} unchanged since run {cached['run_id']}; "
+                      f"replayed {len(records)} rounds from the result cache ({key[:12]})")
+                continue
+            state = checkpoints.latest(run_dir.name, algorithm.name, key) if resumed else None
+            if state and state.round >= algorithm.rounds:
+                rounds.extend(state.history)
+                print(f"{algorithm.name} already completed in run {resumed}")
+                continue
+            if state:
+                print(f"{algorithm.name}: resuming after round {state.round}/{algorithm.rounds}")
+            if resumed:
+                # Rounds past the checkpoint are run again; drop the copies the interrupted run wrote
+                writer.discard_after(algorithm.name, state.round if state else 0)
+            if simulate:
+                # Deep enough that every update still eligible for aggregation reads its own round's model
+                federation = LocalFederation(dataset, model.size, algorithm.client_number, processes,
+                                             algorithm.train_ratio, job.max_staleness + 2)
+                clients = federation.clients
+                print(f"Cloud master simulating {algorithm.name}: {algorithm.rounds} rounds, "
+                      f"{len(clients)} clients on {len(federation.executors)} processes")
+            else:
+                federation = nullcontext()
+                clients = build_clients(algorithm, endpoints, dataset, job.edge_delays)
+                print(f"Cloud master orchestrating {algorithm.name}: {algorithm.rounds} rounds, "
+                      f"{len(clients)} clients, parallelism {job.parallelism}")
+            with federation:
+                orchestrator = FederatedOrchestrator(job, algorithm, clients, model, test_set, writer, sampler,
+                                                     federation if simulate else None, checkpoints, run_dir.name, key)
+                started = time.perf_counter()
+                results = asyncio.run(orchestrator.run(state))
+                rounds.extend(results)
+            if cache and results and results[-1].get("status") == "completed":
+                cache.put(key, run_dir.name, results)
+            if simulate and results:
+                utilization = np.mean([r["core_utilization"] for r in rounds
+                                       if r.get("algorithm") == algorithm.name], axis=0)
+                print(f"Simulated {algorithm.name} in {time.perf_counter() - started:.1f}s wall clock; "
+                      f"mean core utilization {', '.join(f'{u:.0f}%' for u in utilization)}")
+    if sampler:
+        sampler.stop()
+
+    with JobHistory.open(workspace) as history:
+        history.record_run(run_dir.name, job.name, run_dir, rounds, config_snapshot(config_dir))
+    if checkpoints:
+        checkpoints.finish(run_dir.name)
+
+    if job.sweep.get("enabled"):
+        limits = edge_limits(config_dir)
+        print(f"Sweeping batch size and threads under edge limits ({limits['cpu']:g} CPU)...")
+        write_sweep(run_sweep(job.sweep, limits, dataset_dir), run_dir)
+    return run_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the federated benchmarking job")
+    parser.add_argument("--config-dir", type=Path, default=CONFIG_DIR)
+    parser.add_argument(
+        "--workspace",
+        type=Path,
+        default=Path(os.getenv("IANVS_WORKSPACE", Path(__file__).parent / "workspace"))
+    )
+    parser.add_argument("--rounds", type=int, help="Override train.rounds from algorithm.yaml")
+    parser.add_argument("--clients", type=int, help="Override train.client_number for simulated clients")
+    parser.add_argument(
+        "--edge-endpoints",
+        default=os.getenv("IANVS_EDGE_ENDPOINTS", ""),
+        help="Comma-separated edge worker URLs; simulated in-process clients when empty"
+    )
+    parser.add_argument(
+        "--edge-service",
+        default=os.getenv("IANVS_EDGE_SERVICE", ""),
+        help="host:port of a headless Service whose addresses are the edge workers, when no endpoints are given"
+    )
+    parser.add_argument("--sweep", action="store_true", help="Also run the batch-size/thread sweep")
+    parser.add_argument("--samples", type=int, default=1000, help="Samples per client when no dataset source exists")
+    parser.add_argument("--simulate", type=int, metavar="CLIENTS",
+                        help="Simulate this many virtual clients on a local process pool")
+    parser.add_argument("--processes", type=int,
+                        help="Worker processes for --simulate (default: one per available core)")
+    parser.add_argument("--repeats", type=int, default=1,
+                        help="Run the job this many times; all runs are compared with the baseline together. "
+                             "Repeated runs always re-execute rather than replay cached results")
+    parser.add_argument("--metrics-port", type=int, default=metrics_port(),
+                        help="Port of the Prometheus /metrics endpoint; 0 disables it (env IANVS_METRICS_PORT)")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Start a new run instead of resuming an unfinished one (its checkpoints are removed)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-run every algorithm even when a cached result matches (the cache is still refreshed)")
+    parser.add_argument("--pin-baseline", action="store_true",
+                        help="Pin these runs as the job's regression baseline instead of comparing them "
+                             "(always re-executes rather than replaying cached results)")
+    parser.add_argument("--serve-after", action="store_true",
+                        help="Keep serving /metrics after the job finishes, until SIGTERM (for long-lived pods)")
+    args = parser.parse_args()
+
+    job = JobConfig.from_dir(args.config_dir)
+    for algorithm in job.algorithms:
+        if args.rounds is not None:
+            algorithm.rounds = args.rounds
+        if args.clients or args.simulate:
+            algorithm.client_number = args.simulate or args.clients
+    if args.sweep:
+        job.sweep["enabled"] = True
+    endpoints = [e.strip() for e in args.edge_endpoints.split(",") if e.strip()]
+    if not endpoints and args.edge_service:
+        endpoints = resolve_edge_service(args.edge_service)
+        print(f"Found {len(endpoints)} edge worker(s) behind {args.edge_service}")
+    exporter = start_exporter(args.metrics_port)
+
+    # Remote edge workers run code the cache key cannot see
+    cache = ResultCache.open(args.workspace, job.cache) if not endpoints else None
+    # Runs that pin or are gated against a baseline must be measured, not replayed
+    with JobHistory.open(args.workspace) as history:
+        gated = args.pin_baseline or bool(history.baseline(job.name))
+    reuse = not args.no_cache and args.repeats <= 1 and not gated
+
+    run_ids = []
+    for _ in range(max(1, args.repeats)):
+        run_dir = run_job(job, args.config_dir, args.workspace, endpoints, args.samples,
+                          bool(args.simulate), args.processes, cache, reuse, not args.fresh)
+        run_ids.append(run_dir.name)
+        print(f"Benchmarking complete! Results in {run_dir}")
+
+    report = None
+    with JobHistory.open(args.workspace) as history:
+        if args.pin_baseline:
+            history.pin_baseline(job.name, run_ids)
+            print(f"Pinned {', '.join(run_ids)} as the baseline of {job.name}")
+        else:
+            report = check_against_baseline(history, job.name, run_ids, job.regression)
+    exit_code = 0
+    if report is not None:
+        print_report(report)
+        if report["regression"]:
+            exit_code = REGRESSION_EXIT_CODE
+    if args.serve_after and exporter is not None:
+        serve_until_stopped(exit_code)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
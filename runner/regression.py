@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Ianvs Regression Gate - Compares benchmark runs against a pinned baseline
+A job's baseline is one or more runs pinned in the job history. New runs are
+compared metric by metric with bootstrap confidence intervals on the change in
+the mean; a significant change past the metric's tolerance in the bad
+direction is a regression, and the CLI exits non-zero so it can gate rollout.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import yaml
+
+from history import JobHistory, read_run_rounds
+
+REGRESSION_FILE = "regression.json"
+
+# Exit status when a significant regression is found; distinct from crashes (1)
+# and usage errors (2)
+REGRESSION_EXIT_CODE = 3
+
+DEFAULT_REGRESSION = {
+    "window": 5,
+    "confidence": 0.95,
+    "resamples": 2000,
+    "seed": 0,
+    "metrics": [
+        {"name": "accuracy", "order": "desc", "tolerance": 0.01},
+        {"name": "inference_latency", "order": "asc", "tolerance": 0.05},
+        {"name": "latency_p99", "order": "asc", "tolerance": 0.05},
+        {"name": "bandwidth_usage", "order": "asc", "tolerance": 0.05},
+    ],
+}
+
+
+def run_observations(run_dir: Path, window: int) -> Dict[str, Optional[Dict[str, np.ndarray]]]:
+    """algorithm -> metric -> values of the final ``window`` rounds of one run
+
+    Algorithms the run replayed from the result cache map to None: their
+    numbers were measured by an earlier run, possibly on other hardware.
+    """
+    by_algorithm: Dict[str, List[Dict]] = {}
+    for record in read_run_rounds(run_dir):
+        by_algorithm.setdefault(record.get("algorithm", "FederatedAveraging"), []).append(record)
+    observations = {}
+    for algorithm, rounds in by_algorithm.items():
+        if any(r.get("cached") for r in rounds):
+            observations[algorithm] = None
+            continue
+        rounds = sorted(rounds, key=lambda r: r.get("round", 0))[-window:]
+        metrics = {key for r in rounds for key, value in r.items() if isinstance(value, (int, float))}
+        observations[algorithm] = {
+            key: np.array([r[key] for r in rounds if r.get(key) is not None], dtype=np.float64)
+            for key in metrics
+        }
+    return observations
+
+
+def bootstrap_delta(baseline: List[np.ndarray], candidate: List[np.ndarray], confidence: float,
+                    resamples: int, rng: np.random.Generator):
+    """Change in the mean (candidate - baseline) and its bootstrap confidence interval
+
+    Each list holds one array of observations per run. With at least two
+    runs on both sides whole runs are resampled, so the interval reflects
+    run-to-run variation; otherwise the rounds of the single run are.
+    """
+    if len(baseline) >= 2 and len(candidate) >= 2:
+        base = np.array([b.mean() for b in baseline])
+        cand = np.array([c.mean() for c in candidate])
+    else:
+        base = np.concatenate(baseline)
+        cand = np.concatenate(candidate)
+    base_means = base[rng.integers(0, len(base), (resamples, len(base)))].mean(axis=1)
+    cand_means = cand[rng.integers(0, len(cand), (resamples, len(cand)))].mean(axis=1)
+    tail = (1 - confidence) / 2
+    low, high = np.quantile(cand_means - base_means, [tail, 1 - tail])
+    return float(cand.mean() - base.mean()), float(low), float(high), float(base.mean()), float(cand.mean())
+
+
+def verdict(order: str, low: float, high: float, margin: float) -> str:
+    """"regression", "improvement" or "unchanged" for a confidence interval of the change"""
+    worse, better = (high < -margin, low > margin) if order == "desc" else (low > margin, high < -margin)
+    if worse:
+        return "regression"
+    if better:
+        return "improvement"
+    return "unchanged"
+
+
+def compare_runs(baseline_dirs: List[Path], candidate_dirs: List[Path], settings: Optional[Dict] = None) -> Dict:
+    """Compare every configured metric of every algorithm present in both sets of runs"""
+    settings = {**DEFAULT_REGRESSION, **(settings or {})}
+    rng = np.random.default_rng(settings["seed"])
+    window = int(settings["window"])
+    baseline = [run_observations(d, window) for d in baseline_dirs]
+    candidate = [run_observations(d, window) for d in candidate_dirs]
+
+    present = set.intersection(*(set(o) for o in baseline + candidate))
+    not_measured = sorted(a for a in present if any(o[a] is None for o in baseline + candidate))
+    algorithms = {}
+    for algorithm in sorted(present.difference(not_measured)):
+        results = {}
+        for metric in settings["metrics"]:
+            name = metric["name"]
+            base = [o[algorithm].get(name) for o in baseline]
+            cand = [o[algorithm].get(name) for o in candidate]
+            if any(v is None or len(v) == 0 for v in base + cand):
+                continue
+            if sum(map(len, base)) < 2 or sum(map(len, cand)) < 2:
+                # A single observation per side has no spread to test against
+                continue
+            delta, low, high, base_mean, cand_mean = bootstrap_delta(
+                base, cand, float(settings["confidence"]), int(settings["resamples"]), rng
+            )
+            order = metric.get("order", "desc")
+            margin = float(metric.get("tolerance", 0.0)) * abs(base_mean)
+            results[name] = {
+                "order": order,
+                "baseline": base_mean,
+                "candidate": cand_mean,
+                "delta": delta,
+                "relative": delta / base_mean if base_mean else None,
+                "ci_low": low,
+                "ci_high": high,
+                "verdict": verdict(order, low, high, margin),
+            }
+        algorithms[algorithm] = results
+
+    return {
+        "baseline": [d.name for d in baseline_dirs],
+        "candidate": [d.name for d in candidate_dirs],
+        "confidence": float(settings["confidence"]),
+        "window": window,
+        "algorithms": algorithms,
+        "not_measured": not_measured,
+        "regression": any(m["verdict"] == "regression" for a in algorithms.values() for m in a.values()),
+    }
+
+
+def write_regression(report: Dict, run_dir: Path) -> Path:
+    path = run_dir / REGRESSION_FILE
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def check_against_baseline(history: JobHistory, job_name: str, run_ids: List[str],
+                           settings: Optional[Dict] = None) -> Optional[Dict]:
+    """Compare runs with the job's pinned baseline and store the report in each run directory
+
+    Returns None when the job has no baseline (other than the runs themselves).
+    """
+    baseline = [run_id for run_id in history.baseline(job_name) if run_id not in run_ids]
+    if not baseline:
+        return None
+    dirs = history.run_dirs(baseline + run_ids)
+    report = compare_runs([dirs[r] for r in baseline if r in dirs], [dirs[r] for r in run_ids], settings)
+    for run_id in run_ids:
+        write_regression(report, dirs[run_id])
+    return report
+
+
+def print_report(report: Dict):
+    print(f"Compared {', '.join(report['candidate'])} against baseline {', '.join(report['baseline'])} "
+          f"({report['confidence']:.0%} CI, last {report['window']} rounds per run)")
+    for algorithm, metrics in report["algorithms"].items():
+        for name, m in metrics.items():
+            relative = f" ({m['relative']:+.2%})" if m["relative"] is not None else ""
+            print(f"  {algorithm} {name}: {m['baseline']:.4g} -> {m['candidate']:.4g}{relative}, "
+                  f"CI [{m['ci_low']:+.4g}, {m['ci_high']:+.4g}] {m['verdict']}")
+    for algorithm in report.get("not_measured", []):
+        print(f"  {algorithm}: not measured (replayed from the result cache)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pin a baseline or gate runs on regressions against it")
+    parser.add_argument("--config-dir", type=Path, default=Path(__file__).parent / "configs")
+    parser.add_argument(
+        "--workspace",
+        type=Path,
+        default=Path(os.getenv("IANVS_WORKSPACE", Path(__file__).parent / "workspace"))
+    )
+    parser.add_argument("--runs", nargs="+", help="Run ids to pin or compare (default: the latest --last runs)")
+    parser.add_argument("--last", type=int, default=1, help="Number of latest completed runs to use")
+    parser.add_argument("--pin", action="store_true", help="Pin the runs as the job's baseline")
+    parser.add_argument("--unpin", action="store_true", help="Remove the job's baseline")
+    args = parser.parse_args()
+
+    with open(args.config_dir / "benchmarkingjob.yaml", 'r') as f:
+        job = yaml.safe_load(f)["benchmarkingjob"]
+    with JobHistory.open(args.workspace) as history:
+        if args.unpin:
+            history.unpin_baseline(job["name"])
+            print(f"Removed the baseline of {job['name']}")
+            return
+        run_ids = args.runs or history.latest_runs(job["name"], args.last)
+        if not run_ids:
+            sys.exit(f"No completed runs of {job['name']} in {args.workspace}")
+        if args.pin:
+            history.pin_baseline(job["name"], run_ids)
+            print(f"Pinned {', '.join(run_ids)} as the baseline of {job['name']}")
+            return
+        report = check_against_baseline(history, job["name"], run_ids, job.get("regression"))
+    if report is None:
+        sys.exit(f"No baseline pinned for {job['name']}; pin one with --pin")
+    print_report(report)
+    if report["regression"]:
+        sys.exit(REGRESSION_EXIT_CODE)
+
+
+if __name__ == "__main__":
+    main()
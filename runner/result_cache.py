@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Ianvs Result Cache - Content-addressed memo of per-algorithm benchmark results
+An algorithm's round records are stored under the SHA-256 of everything that
+determines them: the resolved algorithm and execution settings, testenv.yaml,
+the runner code and the dataset manifest. Re-running an unchanged (algorithm,
+testenv) cell replays the stored rounds instead of training again; entries
+are evicted least recently used first past the entry and size caps.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+CACHE_DIR = "cache"
+
+DEFAULT_CACHE = {
+    "enabled": True,
+    "max_entries": 64,
+    "max_size_mb": 512,
+}
+
+
+def code_digest(directory: Path) -> str:
+    """SHA-256 of the names and contents of the Python modules in ``directory``"""
+    digest = hashlib.sha256()
+    for path in sorted(directory.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def cache_key(parts: Dict) -> str:
+    """SHA-256 of the canonical JSON form of ``parts``"""
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def replay(entry: Dict) -> List[Dict]:
+    """Cached round records restamped as now and marked with the run that measured them"""
+    now = datetime.now().isoformat()
+    return [{**record, "timestamp": now, "cached": True, "cached_from": entry["run_id"]}
+            for record in entry["rounds"]]
+
+
+class ResultCache:
+    """One <key>.json file per cached cell; a file's mtime is its last use"""
+
+    def __init__(self, root: Path, max_entries: int = 64, max_size_mb: float = 512):
+        self.root = root
+        self.max_entries = max_entries
+        self.max_bytes = int(max_size_mb * 2 ** 20)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def open(cls, workspace: Path, settings: Optional[Dict] = None) -> Optional["ResultCache"]:
+        """Cache under workspace/cache, or None when disabled in benchmarkingjob.yaml"""
+        settings = {**DEFAULT_CACHE, **(settings or {})}
+        if not settings["enabled"]:
+            return None
+        return cls(workspace / CACHE_DIR, int(settings["max_entries"]), float(settings["max_size_mb"]))
+
+    def path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Stored entry ({"run_id", "created", "rounds"}) for ``key``, marking it recently used"""
+        path = self.path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        os.utime(path)
+        return entry
+
+    def put(self, key: str, run_id: str, rounds: List[Dict]):
+        """Store the rounds of a completed cell, then evict past the caps"""
+        path = self.path(key)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"key": key, "run_id": run_id, "created": datetime.now().isoformat(), "rounds": rounds}, f)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def entries(self) -> List[Tuple[Path, os.stat_result]]:
+        """(path, stat) of every entry, most recently used first"""
+        entries = []
+        for path in self.root.glob("*.json"):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:  # Evicted by a concurrent run
+                continue
+        return sorted(entries, key=lambda e: e[1].st_mtime, reverse=True)
+
+    def evict(self) -> int:
+        """Remove least recently used entries beyond max_entries or max_size_mb"""
+        removed = 0
+        total = 0
+        for count, (path, stat) in enumerate(self.entries(), start=1):
+            total += stat.st_size
+            if count > self.max_entries or total > self.max_bytes:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def clear(self) -> int:
+        entries = self.entries()
+        for path, _ in entries:
+            path.unlink(missing_ok=True)
+        return len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the benchmark result cache")
+    parser.add_argument("--config-dir", type=Path, default=Path(__file__).parent / "configs")
+    parser.add_argument(
+        "--workspace",
+        type=Path,
+        default=Path(os.getenv("IANVS_WORKSPACE", Path(__file__).parent / "workspace"))
+    )
+    parser.add_argument("--clear", action="store_true", help="Remove every cached result")
+    args = parser.parse_args()
+
+    with open(args.config_dir / "benchmarkingjob.yaml", 'r') as f:
+        settings = yaml.safe_load(f)["benchmarkingjob"].get("cache", {})
+    cache = ResultCache.open(args.workspace, settings)
+    if cache is None:
+        print("Result cache disabled in benchmarkingjob.yaml")
+        return
+    if args.clear:
+        print(f"Removed {cache.clear()} cached result(s) from {cache.root}")
+        return
+    entries = cache.entries()
+    size = sum(stat.st_size for _, stat in entries)
+    print(f"{len(entries)} cached result(s), {size / 2 ** 20:.1f} MB of "
+          f"{cache.max_bytes / 2 ** 20:.0f} MB in {cache.root}")
+    for path, stat in entries:
+        print(f"  {path.stem[:12]}  {stat.st_size / 1024:8.1f} KiB  last used "
+              f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stat.st_mtime))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Ianvs Results Store - Per-round metric writers for benchmarking jobs
+Selected by output.format in benchmarkingjob.yaml: "json" writes one file per
+round, "arrow" appends rounds to columnar Arrow IPC stream segments
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+try:
+    import pyarrow as pa
+except ImportError:  # Only required for output.format: "arrow"
+    pa = None
+
+DEFAULT_JOB_CONFIG = Path(__file__).parent / "configs" / "benchmarkingjob.yaml"
+
+ARROW_SEGMENT_PREFIX = "rounds-"
+ARROW_SEGMENT_SUFFIX = ".arrows"
+
+
+def round_schema():
+    """Arrow schema of a round record; keys outside the schema are not stored"""
+    edge_node = pa.struct([
+        ("name", pa.string()),
+        ("samples", pa.int64()),
+        ("accuracy", pa.float64()),
+        ("f1_score", pa.float64()),
+        ("avg_latency", pa.float64()),
+        ("p99_latency", pa.float64()),
+        ("cpu_percent", pa.float64()),
+        ("memory_mb", pa.float64()),
+        ("status", pa.string()),
+        ("response_time", pa.float64()),
+        ("lateness", pa.float64()),
+        ("staleness", pa.int32()),
+    ])
+    return pa.schema([
+        ("round", pa.int32()),
+        ("total_rounds", pa.int32()),
+        ("timestamp", pa.string()),
+        ("status", pa.string()),
+        ("algorithm", pa.string()),
+        ("accuracy", pa.float64()),
+        ("loss", pa.float64()),
+        ("f1_score", pa.float64()),
+        ("precision", pa.float64()),
+        ("recall", pa.float64()),
+        ("f1_macro", pa.float64()),
+        ("f1_micro", pa.float64()),
+        ("class_precision", pa.list_(pa.float64())),
+        ("class_recall", pa.list_(pa.float64())),
+        ("class_f1", pa.list_(pa.float64())),
+        ("class_support", pa.list_(pa.int64())),
+        ("edge_accuracy", pa.float64()),
+        ("edge_f1_score", pa.float64()),
+        ("latency", pa.float64()),
+        ("inference_latency", pa.float64()),
+        ("latency_p50", pa.float64()),
+        ("latency_p95", pa.float64()),
+        ("latency_p99", pa.float64()),
+        ("latency_p999", pa.float64()),
+        ("bandwidth_usage", pa.float64()),
+        ("convergence_round", pa.int32()),
+        ("round_duration", pa.float64()),
+        ("round_deadline", pa.float64()),
+        ("collect_time", pa.float64()),
+        ("straggler_wait", pa.float64()),
+        ("participants", pa.int32()),
+        ("cloud_cpu_percent", pa.float64()),
+        ("cloud_memory_mb", pa.float64()),
+        ("core_utilization", pa.list_(pa.float64())),
+        ("cached", pa.bool_()),
+        ("cached_from", pa.string()),
+        ("uplink_bytes", pa.int64()),
+        ("downlink_bytes", pa.int64()),
+        ("edge_nodes", pa.list_(edge_node)),
+    ])
+
+
+class JsonResultsWriter:
+    """Writes each round to its own round_{n}.json file"""
+
+    def __init__(self, results_dir: Path):
+        self.results_dir = results_dir
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+
+    def write_round(self, record: Dict):
+        result_file = self.results_dir / f"round_{record['round']}.json"
+        tmp_file = result_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(record, f, indent=2)
+        os.replace(tmp_file, result_file)
+
+    def discard_after(self, algorithm: str, round_num: int):
+        """Delete rounds of ``algorithm`` after ``round_num``; a resumed run writes them again"""
+        for path in self.results_dir.glob("round_*.json"):
+            try:
+                with open(path, 'r') as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if record.get("algorithm") == algorithm and record.get("round", 0) > round_num:
+                path.unlink()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ArrowResultsWriter:
+    """Appends rounds to an Arrow IPC stream segment, one record batch per round
+
+    Every writer opens a new segment (rounds-00001.arrows, rounds-00002.arrows,
+    ...) so a restarted job never rewrites earlier data, except for the rounds
+    a resumed run repeats (see ``discard_after``). Batches are buffered and
+    written to disk every ``flush_every`` rounds, and on close.
+    """
+
+    def __init__(self, results_dir: Path, flush_every: int = 10):
+        if pa is None:
+            raise ImportError("output.format 'arrow' requires pyarrow. Run: pip install pyarrow")
+        self.results_dir = results_dir
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.flush_every = max(1, flush_every)
+        self.schema = round_schema()
+        self.path = self._next_segment()
+        self._sink = open(self.path, 'wb')
+        self._writer = pa.ipc.new_stream(self._sink, self.schema)
+        self._pending: List[Dict] = []
+
+    def _next_segment(self) -> Path:
+        existing = sorted(self.results_dir.glob(f"{ARROW_SEGMENT_PREFIX}*{ARROW_SEGMENT_SUFFIX}"))
+        index = 1
+        if existing:
+            index = int(existing[-1].name[len(ARROW_SEGMENT_PREFIX):-len(ARROW_SEGMENT_SUFFIX)]) + 1
+        return self.results_dir / f"{ARROW_SEGMENT_PREFIX}{index:05d}{ARROW_SEGMENT_SUFFIX}"
+
+    def discard_after(self, algorithm: str, round_num: int):
+        """Drop rounds of ``algorithm`` after ``round_num`` from earlier segments
+
+        Rounds written after the last checkpoint are run again on resume, so
+        without this they would appear twice. Affected segments are rewritten
+        to a temporary file and swapped in atomically.
+        """
+        for path in sorted(self.results_dir.glob(f"{ARROW_SEGMENT_PREFIX}*{ARROW_SEGMENT_SUFFIX}")):
+            if path == self.path:
+                continue
+            rows = read_arrow_segment(path)
+            kept = [row for row in rows if row.get("algorithm") != algorithm or row["round"] <= round_num]
+            if len(kept) == len(rows):
+                continue
+            tmp_file = path.with_suffix(ARROW_SEGMENT_SUFFIX + ".tmp")
+            with pa.OSFile(str(tmp_file), 'wb') as sink, pa.ipc.new_stream(sink, self.schema) as writer:
+                for row in kept:
+                    writer.write_batch(pa.RecordBatch.from_pylist([row], schema=self.schema))
+            os.replace(tmp_file, path)
+
+    def write_round(self, record: Dict):
+        self._pending.append(record)
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rounds as record batches and sync them to disk"""
+        for record in self._pending:
+            self._writer.write_batch(pa.RecordBatch.from_pylist([record], schema=self.schema))
+        self._pending.clear()
+        self._sink.flush()
+        os.fsync(self._sink.fileno())
+
+    def close(self):
+        if self._sink.closed:
+            return
+        self.flush()
+        self._writer.close()
+        self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_arrow_segment(path: Path) -> List[Dict]:
+    """Read a segment memory-mapped; a segment still being written is read up to its last complete batch"""
+    # dashboard/app.py has a copy of this reader (its image does not ship the runner); keep the two in sync
+    rows: List[Dict] = []
+    try:
+        with pa.memory_map(str(path), 'r') as source:
+            reader = pa.ipc.open_stream(source)
+            for batch in reader:
+                rows.extend(batch.to_pylist())
+    except (pa.ArrowInvalid, OSError):
+        pass
+    return [{k: v for k, v in row.items() if v is not None} for row in rows]
+
+
+def load_output_config(config_path: Optional[Path] = None) -> Dict:
+    """Read the output section of benchmarkingjob.yaml"""
+    with open(config_path or DEFAULT_JOB_CONFIG, 'r') as f:
+        config = yaml.safe_load(f)
+    return config["benchmarkingjob"].get("output", {})
+
+
+def open_results_writer(results_dir: Path, output_config: Optional[Dict] = None):
+    """Create the writer selected by output.format"""
+    output_config = output_config if output_config is not None else load_output_config()
+    fmt = output_config.get("format", "json")
+    if fmt == "json":
+        return JsonResultsWriter(results_dir)
+    if fmt == "arrow":
+        return ArrowResultsWriter(results_dir, output_config.get("flush_every", 10))
+    raise ValueError(f"Unsupported output.format '{fmt}', expected 'json' or 'arrow'")
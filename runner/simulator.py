@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Ianvs Federation Simulator - Many virtual edge clients on a local process pool
+Clients are spread round-robin over one worker process per core, each pinned to
+its core. The global model is written once per round into a
+multiprocessing.shared_memory block that every worker reads in place, so only
+the round parameters and the encoded updates cross process boundaries.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from dataset import PreparedDataset
+from edge_worker import shard_worker
+from sweep import BLAS_THREAD_VARS
+from telemetry import core_times, core_utilization
+from transport import Buffer
+
+# Per worker process: the dataset, the EdgeWorker of every client it has run
+# and the shared memory blocks it has attached
+_process: Dict = {}
+
+
+def init_process(dataset_path: str, train_ratio: float, core: Optional[int]):
+    if core is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {core})
+    _process.update(dataset=PreparedDataset(Path(dataset_path)), train_ratio=train_ratio, workers={}, blocks={})
+
+
+def run_client(client: int, name: str, block: str, size: int, params: Dict) -> Tuple[bytes, Dict]:
+    """Train one virtual client on the global model in shared memory; runs in a worker process"""
+    if block not in _process["blocks"]:
+        _process["blocks"][block] = SharedMemory(name=block)
+    # Copy out before training: the block is rewritten once it falls out of the ring
+    weights = np.ndarray((size,), dtype=np.float32, buffer=_process["blocks"][block].buf).copy()
+    worker = _process["workers"].get(client)
+    if worker is None:
+        # Clients always land on the same process, so their state (e.g. error feedback) persists
+        worker = shard_worker(name, _process["dataset"], client, _process["train_ratio"])
+        _process["workers"][client] = worker
+    reply, metrics = worker.handle(weights, params)
+    return b"".join(reply), metrics
+
+
+@contextmanager
+def blas_single_thread():
+    """Start worker processes with one BLAS thread each, so N processes fill N cores and no more"""
+    saved = {var: os.environ.get(var) for var in BLAS_THREAD_VARS}
+    os.environ.update({var: "1" for var in BLAS_THREAD_VARS})
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+class ModelBroadcast:
+    """Ring of shared memory blocks holding the global model of the latest rounds
+
+    Round r is written to block r % len(blocks). A client still training on
+    an older round keeps its copy valid for len(blocks) - 1 more rounds, which
+    covers every update the orchestrator would still aggregate.
+    """
+
+    def __init__(self, size: int, depth: int):
+        self.size = size
+        self.blocks = [SharedMemory(create=True, size=size * np.dtype(np.float32).itemsize)
+                       for _ in range(max(1, depth))]
+
+    def publish(self, round_num: int, weights: np.ndarray) -> str:
+        block = self.blocks[round_num % len(self.blocks)]
+        np.copyto(np.ndarray((self.size,), dtype=np.float32, buffer=block.buf), weights, casting="same_kind")
+        return block.name
+
+    def block(self, round_num: int) -> str:
+        return self.blocks[round_num % len(self.blocks)].name
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+
+class PoolEdgeClient:
+    """Virtual edge client trained on one of the LocalFederation worker processes
+
+    The encoded payload is still passed in, and counted as downlink by the
+    orchestrator, but the worker reads the model from shared memory instead.
+    """
+
+    def __init__(self, name: str, index: int, federation: "LocalFederation"):
+        self.name = name
+        self.index = index
+        self.federation = federation
+
+    async def train(self, payload: List[Buffer], params: Dict, timeout: float) -> Tuple[bytes, Dict]:
+        federation = self.federation
+        future = asyncio.get_running_loop().run_in_executor(
+            federation.executor_for(self.index), run_client, self.index, self.name,
+            federation.broadcast.block(int(params.get("round", 0))), federation.broadcast.size, params
+        )
+        return await asyncio.wait_for(future, timeout)
+
+
+class LocalFederation:
+    """``clients`` virtual edge clients over ``processes`` single-process executors
+
+    Each executor is pinned to its own core, and client i always runs on
+    executor i % processes. ``publish`` is called by the orchestrator once per
+    round with the new global model; ``core_utilization`` reports the busy
+    percentage of every core since then.
+    """
+
+    def __init__(self, dataset: PreparedDataset, model_size: int, clients: int,
+                 processes: Optional[int] = None, train_ratio: float = 0.8, depth: int = 2):
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+        processes = processes or len(cores) or os.cpu_count() or 1
+        self.broadcast = ModelBroadcast(model_size, depth)
+        # Spawned workers load BLAS afresh, so the single-thread setting applies to them
+        context = multiprocessing.get_context("spawn")
+        with blas_single_thread():
+            self.executors = [
+                ProcessPoolExecutor(
+                    max_workers=1, mp_context=context, initializer=init_process,
+                    initargs=(str(dataset.path), train_ratio, cores[i % len(cores)] if cores else None)
+                )
+                for i in range(processes)
+            ]
+            # Executors start their process lazily; start them now while the env is set
+            for executor in self.executors:
+                executor.submit(os.getpid).result()
+        self.clients = [PoolEdgeClient(f"edge-node-{i + 1}", i, self) for i in range(clients)]
+        self._times = core_times()
+
+    def executor_for(self, client: int) -> ProcessPoolExecutor:
+        return self.executors[client % len(self.executors)]
+
+    def publish(self, round_num: int, weights: np.ndarray):
+        self.broadcast.publish(round_num, weights)
+        self._times = core_times()
+
+    def core_utilization(self) -> List[float]:
+        """Busy percentage of each core since the last publish"""
+        return core_utilization(self._times, core_times())
+
+    def close(self):
+        for executor in self.executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+        self.broadcast.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Ianvs Sweep Benchmark - Batch-size and thread-count grid for edge inference
+Each grid point runs in a fresh process pinned to the edge node's CPU limit,
+so BLAS thread settings take effect and peak RSS is measured per point. The
+result marks the throughput/latency Pareto frontier for the dashboard.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import yaml
+
+from dataset import DatasetSpec, PreparedDataset
+from latency import LatencyHistogram
+from model import SoftmaxModel, make_synthetic_dataset
+
+CONFIG_DIR = Path(__file__).parent / "configs"
+
+SWEEP_FILE = "sweep.json"
+
+DEFAULT_SWEEP = {
+    "batch_sizes": [1, 8, 32, 128],
+    "intra_op_threads": [1, 2],
+    "inter_op_threads": [1, 2],
+    "warmup": 10,
+    "iterations": 200,
+}
+
+# Environment variables read by the BLAS backends numpy may be built against
+BLAS_THREAD_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+def parse_cpu(value) -> float:
+    """Kubernetes CPU quantity ("2", "500m") in cores"""
+    value = str(value)
+    return int(value[:-1]) / 1000 if value.endswith("m") else float(value)
+
+
+def parse_memory(value) -> int:
+    """Kubernetes memory quantity ("4Gi", "512Mi", "1G") in bytes"""
+    units = {"Ki": 2 ** 10, "Mi": 2 ** 20, "Gi": 2 ** 30, "Ti": 2 ** 40,
+             "K": 10 ** 3, "M": 10 ** 6, "G": 10 ** 9, "T": 10 ** 12}
+    value = str(value)
+    for suffix in sorted(units, key=len, reverse=True):
+        if value.endswith(suffix):
+            return int(float(value[:-len(suffix)]) * units[suffix])
+    return int(value)
+
+
+def edge_limits(config_dir: Path) -> Dict:
+    """Smallest CPU and memory limits among the testenv.yaml edge nodes"""
+    with open(config_dir / "testenv.yaml", 'r') as f:
+        nodes = yaml.safe_load(f)["testenv"].get("edge_nodes", [])
+    resources = [n.get("resources", {}) for n in nodes]
+    return {
+        "cpu": min((parse_cpu(r["cpu"]) for r in resources if "cpu" in r), default=os.cpu_count()),
+        "memory": min((parse_memory(r["memory"]) for r in resources if "memory" in r), default=None),
+    }
+
+
+def run_point(point: Dict) -> Dict:
+    """Time one grid point; runs in the child process started with the BLAS env set"""
+    dataset = PreparedDataset.find(Path(point["dataset"])) if point.get("dataset") else None
+    if dataset is not None:
+        X, _ = dataset.arrays("test")
+        X = np.asarray(X)
+        model = SoftmaxModel(dataset.n_features, dataset.n_classes)
+    else:
+        X, _ = make_synthetic_dataset(2000)
+        model = SoftmaxModel(X.shape[1], 10)
+    weights = model.init_weights()
+
+    batch_size = min(point["batch_size"], len(X))
+    starts = np.arange(0, len(X) - batch_size + 1, batch_size)
+    workers = point["inter_op_threads"]
+
+    def worker(offset: int, count: int) -> np.ndarray:
+        timings = np.empty(count, dtype=np.int64)
+        for i in range(count):
+            start = starts[(offset + i) % len(starts)]
+            t0 = time.perf_counter_ns()
+            model.predict(weights, X[start:start + batch_size])
+            timings[i] = time.perf_counter_ns() - t0
+        return timings
+
+    # Warm up every thread, then run the timed iterations split across them
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(worker, range(workers), [point["warmup"]] * workers))
+        per_worker = max(1, point["iterations"] // workers)
+        t0 = time.perf_counter()
+        timings = list(pool.map(worker, range(workers), [per_worker] * workers))
+        elapsed = time.perf_counter() - t0
+
+    histogram = LatencyHistogram()
+    for t in timings:
+        histogram.record(t)
+    return {
+        "batch_size": point["batch_size"],
+        "intra_op_threads": point["intra_op_threads"],
+        "inter_op_threads": workers,
+        "samples_per_sec": per_worker * workers * batch_size / elapsed,
+        **{f"latency_{k}": v for k, v in histogram.summary().items()},
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def launch_point(point: Dict, cpus: int) -> Dict:
+    """Run one grid point in a fresh interpreter with BLAS threads and CPU affinity set
+
+    BLAS reads its thread count once at load time, so every point needs its
+    own process; that also makes ru_maxrss a per-point peak.
+    """
+    env = dict(os.environ, **{var: str(point["intra_op_threads"]) for var in BLAS_THREAD_VARS})
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(Path(__file__).parent), env.get("PYTHONPATH")]))
+
+    def pin():
+        # Stand-in for the pod CPU limit: only the first `cpus` cores are usable
+        if hasattr(os, "sched_setaffinity"):
+            available = sorted(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, available[:max(1, cpus)])
+
+    result = subprocess.run(
+        [sys.executable, __file__, "--point", json.dumps(point)],
+        env=env, preexec_fn=pin, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def pareto_front(points: List[Dict]) -> List[bool]:
+    """Points not dominated in (higher samples/sec, lower p99 latency)"""
+    flags = []
+    for p in points:
+        dominated = any(
+            q["samples_per_sec"] >= p["samples_per_sec"] and q["latency_p99"] <= p["latency_p99"]
+            and (q["samples_per_sec"] > p["samples_per_sec"] or q["latency_p99"] < p["latency_p99"])
+            for q in points
+        )
+        flags.append(not dominated)
+    return flags
+
+
+def run_sweep(settings: Dict, limits: Dict, dataset_dir: Path = None) -> Dict:
+    """Run the grid within the edge CPU limit and flag the Pareto-optimal points
+
+    Points whose intra-op x inter-op threads exceed the CPU limit are skipped,
+    since the pod could never schedule them.
+    """
+    settings = {**DEFAULT_SWEEP, **(settings or {})}
+    cpus = max(1, int(limits["cpu"]))
+    grid = [
+        (b, intra, inter)
+        for b, intra, inter in itertools.product(
+            settings["batch_sizes"], settings["intra_op_threads"], settings["inter_op_threads"]
+        )
+        if intra * inter <= cpus
+    ]
+
+    points = []
+    for batch_size, intra, inter in grid:
+        point = launch_point({
+            "batch_size": batch_size,
+            "intra_op_threads": intra,
+            "inter_op_threads": inter,
+            "warmup": settings["warmup"],
+            "iterations": settings["iterations"],
+            "dataset": str(dataset_dir) if dataset_dir else None,
+        }, cpus)
+        if limits.get("memory"):
+            point["within_memory_limit"] = point["peak_rss_mb"] * 2 ** 20 <= limits["memory"]
+        points.append(point)
+        print(f"  batch={batch_size:<4} intra={intra} inter={inter}: "
+              f"{point['samples_per_sec']:,.0f} samples/s, p99 {point['latency_p99']:.3f} ms, "
+              f"peak RSS {point['peak_rss_mb']:.0f} MB")
+
+    for point, optimal in zip(points, pareto_front(points)):
+        point["pareto"] = optimal
+    return {"limits": limits, "settings": settings, "points": points}
+
+
+def write_sweep(result: Dict, run_dir: Path) -> Path:
+    run_dir.mkdir(parents=True, exist_ok=True)
+    path = run_dir / SWEEP_FILE
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(result, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep batch size and thread counts for edge inference")
+    parser.add_argument("--point", help=argparse.SUPPRESS)
+    parser.add_argument("--config-dir", type=Path, default=CONFIG_DIR)
+    parser.add_argument(
+        "--workspace",
+        type=Path,
+        default=Path(os.getenv("IANVS_WORKSPACE", Path(__file__).parent / "workspace"))
+    )
+    args = parser.parse_args()
+
+    if args.point:
+        print(json.dumps(run_point(json.loads(args.point))))
+        return
+
+    with open(args.config_dir / "benchmarkingjob.yaml", 'r') as f:
+        job = yaml.safe_load(f)["benchmarkingjob"]
+    spec = DatasetSpec.from_testenv(args.config_dir / "testenv.yaml")
+    limits = edge_limits(args.config_dir)
+    print(f"Sweeping under edge limits: {limits['cpu']:g} CPU, memory {limits['memory']} bytes")
+    result = run_sweep(job.get("sweep", {}), limits, args.workspace / "datasets" / spec.name)
+    run_dir = args.workspace / "results" / f"{job['name']}-sweep-{time.strftime('%Y%m%d-%H%M%S')}"
+    print(f"Sweep results written to {write_sweep(result, run_dir)}")
+
+
+if __name__ == "__main__":
+    main()
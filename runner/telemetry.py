@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Ianvs Telemetry - Background CPU, memory, network and disk sampler for runner nodes
+Reads cgroup v2 accounting when the node runs in a v2 container and falls back
+to /proc for the current process. Samples are tagged with the federated round
+and phase and appended to a compact binary time series in the workspace.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+PHASES = ("idle", "train", "upload", "aggregate", "evaluate")
+
+# One fixed-size record per sample; counters are cumulative since boot/start
+SAMPLE_DTYPE = np.dtype([
+    ("time", "<f8"),
+    ("round", "<u4"),
+    ("phase", "u1"),
+    ("cpu_usec", "<u8"),
+    ("memory_bytes", "<u8"),
+    ("net_rx_bytes", "<u8"),
+    ("net_tx_bytes", "<u8"),
+    ("disk_read_bytes", "<u8"),
+    ("disk_write_bytes", "<u8"),
+])
+
+TELEMETRY_SUFFIX = ".telemetry"
+
+
+def read_keyed(path: Path) -> Dict[str, int]:
+    """Parse "key value" lines such as cpu.stat or /proc/self/io"""
+    values = {}
+    with open(path, 'r') as f:
+        for line in f:
+            key, _, value = line.partition(" ")
+            if value.strip().isdigit():
+                values[key.rstrip(":")] = int(value)
+    return values
+
+
+class CounterSource:
+    """Reads the cumulative counters once per sample from whichever files exist"""
+
+    def __init__(self, cgroup: Path = CGROUP_ROOT):
+        v2 = (cgroup / "cgroup.controllers").exists()
+        self.cpu_stat = cgroup / "cpu.stat" if v2 and (cgroup / "cpu.stat").exists() else None
+        self.memory = cgroup / "memory.current" if v2 and (cgroup / "memory.current").exists() else None
+        self.io_stat = cgroup / "io.stat" if v2 and (cgroup / "io.stat").exists() else None
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+
+    @property
+    def scope(self) -> str:
+        return "cgroup" if self.cpu_stat else "process"
+
+    def cpu_usec(self) -> int:
+        if self.cpu_stat:
+            return read_keyed(self.cpu_stat)["usage_usec"]
+        t = os.times()
+        return int((t.user + t.system) * 1e6)
+
+    def memory_bytes(self) -> int:
+        if self.memory:
+            return int(self.memory.read_text())
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * self.page_size
+
+    def disk_bytes(self):
+        if self.io_stat:
+            read = write = 0
+            for line in self.io_stat.read_text().splitlines():
+                fields = dict(kv.split("=") for kv in line.split()[1:] if "=" in kv)
+                read += int(fields.get("rbytes", 0))
+                write += int(fields.get("wbytes", 0))
+            return read, write
+        try:
+            io = read_keyed(Path("/proc/self/io"))
+        except OSError:  # Not readable under some container security profiles
+            return 0, 0
+        return io.get("read_bytes", 0), io.get("write_bytes", 0)
+
+    def net_bytes(self):
+        """Bytes received and sent on every interface except loopback"""
+        rx = tx = 0
+        with open("/proc/net/dev", 'r') as f:
+            for line in f.readlines()[2:]:
+                name, _, counters = line.partition(":")
+                if name.strip() == "lo":
+                    continue
+                fields = counters.split()
+                rx += int(fields[0])
+                tx += int(fields[8])
+        return rx, tx
+
+
+class ResourceSampler:
+    """Samples counters every ``interval`` seconds on a daemon thread
+
+    ``phase()`` marks which round and phase the node is in; samples are also
+    taken when a phase starts and ends so short phases are never missed.
+    Samples are buffered and appended to ``path`` in SAMPLE_DTYPE records.
+    """
+
+    def __init__(self, path: Path, interval: float = 0.5, flush_every: int = 64):
+        self.path = path
+        self.interval = interval
+        self.flush_every = flush_every
+        self.source = CounterSource()
+        self.round = 0
+        self.phase_id = 0
+        self._buffer = []
+        self._rounds: Dict[int, list] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def start(self) -> "ResourceSampler":
+        self.sample()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.sample()
+        self.flush()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        rx, tx = self.source.net_bytes()
+        read, write = self.source.disk_bytes()
+        record = (time.time(), self.round, self.phase_id, self.source.cpu_usec(),
+                  self.source.memory_bytes(), rx, tx, read, write)
+        with self._lock:
+            self._buffer.append(record)
+            # First and last sample of every round plus its peak memory, for round summaries
+            first, _, peak = self._rounds.get(self.round, (record, None, 0))
+            self._rounds[self.round] = (first, record, max(peak, record[4]))
+            flush = len(self._buffer) >= self.flush_every
+        if flush:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            records, self._buffer = self._buffer, []
+        if records:
+            with open(self.path, 'ab') as f:
+                np.array(records, dtype=SAMPLE_DTYPE).tofile(f)
+
+    @contextmanager
+    def phase(self, round_num: int, name: str):
+        """Attribute samples taken inside the block to ``round_num`` and phase ``name``"""
+        previous = (self.round, self.phase_id)
+        self.round, self.phase_id = round_num, PHASES.index(name)
+        self.sample()
+        try:
+            yield
+        finally:
+            self.sample()
+            self.round, self.phase_id = previous
+
+    def round_summary(self, round_num: int) -> Dict:
+        """CPU utilization, peak memory and I/O of one round, from its first and last samples"""
+        with self._lock:
+            if round_num not in self._rounds:
+                return {}
+            first, last, peak = self._rounds[round_num]
+        elapsed = max(last[0] - first[0], 1e-9)
+        return {
+            "cpu_percent": (last[3] - first[3]) / 1e6 / elapsed * 100,
+            "memory_mb": peak / 2 ** 20,
+            "net_rx_bytes": last[5] - first[5],
+            "net_tx_bytes": last[6] - first[6],
+            "disk_read_bytes": last[7] - first[7],
+            "disk_write_bytes": last[8] - first[8],
+        }
+
+
+def core_times() -> np.ndarray:
+    """Cumulative (busy, total) jiffies of every core from /proc/stat, one row per core"""
+    rows = []
+    with open("/proc/stat", 'r') as f:
+        for line in f:
+            if line.startswith("cpu") and line[3].isdigit():
+                fields = [int(v) for v in line.split()[1:9]]
+                idle = fields[3] + fields[4]  # idle + iowait
+                rows.append((sum(fields) - idle, sum(fields)))
+    return np.array(rows, dtype=np.int64)
+
+
+def core_utilization(start: np.ndarray, end: np.ndarray) -> list:
+    """Busy percentage of each core between two core_times() readings"""
+    busy, total = (end - start).T
+    return (busy / np.maximum(total, 1) * 100).tolist()
+
+
+def read_telemetry(path: Path) -> np.ndarray:
+    """All samples of a telemetry file as a SAMPLE_DTYPE structured array"""
+    return np.fromfile(path, dtype=SAMPLE_DTYPE)
+
+
+def phase_summary(samples: np.ndarray) -> Dict:
+    """CPU seconds and wall time per (round, phase), from consecutive sample deltas"""
+    summary = {}
+    if len(samples) < 2:
+        return summary
+    cpu = np.diff(samples["cpu_usec"].astype(np.int64)) / 1e6
+    wall = np.diff(samples["time"])
+    for r, p, c, w in zip(samples["round"][1:], samples["phase"][1:], cpu, wall):
+        entry = summary.setdefault((int(r), PHASES[p]), {"cpu_seconds": 0.0, "wall_seconds": 0.0})
+        entry["cpu_seconds"] += float(c)
+        entry["wall_seconds"] += float(w)
+    return summary
+
+
+def open_sampler(directory: Path, node: str, interval: Optional[float]) -> Optional[ResourceSampler]:
+    """Started sampler writing <directory>/<node>.telemetry, or None when disabled"""
+    if not interval:
+        return None
+    return ResourceSampler(directory / f"{node}{TELEMETRY_SUFFIX}", interval).start()
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from aggregation import FedAvg, FedProx, TrimmedMean, build_aggregator
+
+
+def client_models(n=5, size=64, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(n, size)).astype(np.float32), rng.integers(10, 1000, size=n)
+
+
+def aggregate(aggregator, models, samples, scales=None):
+    aggregator.reset(np.zeros(models.shape[1], dtype=np.float32))
+    for i, (weights, count) in enumerate(zip(models, samples)):
+        aggregator.add(weights, int(count), 1.0 if scales is None else scales[i])
+    return aggregator.result()
+
+
+def test_fedavg_matches_weighted_mean():
+    models, samples = client_models()
+    expected = np.average(models.astype(np.float64), axis=0, weights=samples)
+    np.testing.assert_allclose(aggregate(FedAvg(models.shape[1]), models, samples), expected, rtol=1e-5, atol=1e-6)
+
+
+def test_fedavg_unweighted_and_scaled():
+    models, samples = client_models()
+    np.testing.assert_allclose(aggregate(FedAvg(models.shape[1], weighted=False), models, samples),
+                               models.mean(axis=0), rtol=1e-5, atol=1e-6)
+    scales = np.array([1.0, 0.5, 0.25, 1.0, 0.0])
+    expected = np.average(models.astype(np.float64), axis=0, weights=samples * scales)
+    aggregator = FedAvg(models.shape[1])
+    np.testing.assert_allclose(aggregate(aggregator, models, samples, scales), expected, rtol=1e-5, atol=1e-6)
+    assert aggregator.count == 4  # A zero-scaled update is not counted
+
+
+def test_fedavg_reset_between_rounds():
+    models, samples = client_models()
+    aggregator = FedAvg(models.shape[1])
+    aggregate(aggregator, models, samples)
+    np.testing.assert_allclose(aggregate(aggregator, models[:2], samples[:2]),
+                               np.average(models[:2].astype(np.float64), axis=0, weights=samples[:2]), rtol=1e-5, atol=1e-6)
+
+
+def test_empty_round_keeps_global_model():
+    global_weights = np.arange(8, dtype=np.float32)
+    for aggregator in (FedAvg(8), TrimmedMean(8, clients=10, trim_ratio=0.2)):
+        aggregator.reset(global_weights)
+        np.testing.assert_array_equal(aggregator.result(), global_weights)
+
+
+@pytest.mark.parametrize("clients,trim_ratio", [(10, 0.2), (10, 0.1), (7, 0.3), (5, 0.0)])
+def test_trimmed_mean_drops_top_and_bottom_k(clients, trim_ratio):
+    models, samples = client_models(n=clients)
+    k = int(clients * trim_ratio)
+    ordered = np.sort(models.astype(np.float64), axis=0)
+    expected = ordered[k:clients - k].mean(axis=0)
+    result = aggregate(TrimmedMean(models.shape[1], clients, trim_ratio), models, samples)
+    np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_trimmed_mean_trims_less_when_few_updates_arrive():
+    models, samples = client_models(n=4)
+    # k would be 2 for 10 expected clients; with 4 updates only 1 per side can go
+    result = aggregate(TrimmedMean(models.shape[1], clients=10, trim_ratio=0.2), models, samples)
+    np.testing.assert_allclose(result, np.sort(models, axis=0)[1:3].mean(axis=0), rtol=1e-5, atol=1e-6)
+
+
+def test_trimmed_mean_resists_outlier():
+    models = np.ones((5, 4), dtype=np.float32)
+    models[2] = 1e6
+    result = aggregate(TrimmedMean(4, clients=5, trim_ratio=0.2), models, np.ones(5))
+    np.testing.assert_allclose(result, np.ones(4))
+
+
+def test_build_aggregator():
+    assert isinstance(build_aggregator(4, 3, {}), FedAvg)
+    prox = build_aggregator(4, 3, {"aggregation_algorithm": "FedProx", "mu": 0.1})
+    assert isinstance(prox, FedProx) and prox.client_params() == {"mu": 0.1}
+    assert build_aggregator(4, 10, {"aggregation_algorithm": "trimmed_mean", "trim_ratio": 0.2}).k == 2
+    with pytest.raises(ValueError):
+        build_aggregator(4, 3, {"aggregation_algorithm": "median"})
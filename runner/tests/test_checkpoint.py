@@ -0,0 +1,87 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from checkpoint import Checkpoint, CheckpointStore
+from dataset import prepare_from_configs
+from model import SoftmaxModel
+from orchestrator import CONFIG_DIR, FederatedOrchestrator, JobConfig, build_clients
+from results_store import open_results_writer
+
+
+def checkpoint(round_num, key="key"):
+    return Checkpoint(round_num, np.full(8, round_num, dtype=np.float32), [{"round": r} for r in range(1, round_num + 1)],
+                      key, {"edge-node-1": np.arange(8, dtype=np.float32) * round_num})
+
+
+def test_save_and_load_latest(tmp_path):
+    store = CheckpointStore(tmp_path, keep=2)
+    store.start_run("run", "job", "key")
+    for round_num in (1, 2, 3):
+        store.save("run", "algo", checkpoint(round_num))
+    assert [p.name for p in store.rounds("run", "algo")] == ["round-00002", "round-00003"]
+    latest = store.latest("run", "algo", "key")
+    assert latest.round == 3 and len(latest.history) == 3
+    np.testing.assert_array_equal(latest.weights, checkpoint(3).weights)
+    np.testing.assert_array_equal(latest.clients["edge-node-1"], checkpoint(3).clients["edge-node-1"])
+    assert store.latest("run", "algo", "other-key") is None
+
+
+def test_torn_checkpoint_falls_back_to_previous(tmp_path):
+    store = CheckpointStore(tmp_path, keep=3)
+    store.save("run", "algo", checkpoint(1))
+    (store.save("run", "algo", checkpoint(2)) / "weights.npy").write_bytes(b"truncated")
+    assert store.latest("run", "algo", "key").round == 1
+
+
+def test_unfinished_runs(tmp_path):
+    store = CheckpointStore(tmp_path)
+    store.start_run("old", "job", "stale-key")
+    store.start_run("current", "job", "key")
+    store.start_run("other", "other-job", "key")
+    assert store.unfinished("job", "key") == "current"
+    # Runs of the job under another key can never resume and are removed
+    assert [r["run_id"] for r in store.runs()] == ["current", "other"]
+    store.finish("current")
+    assert store.unfinished("job", "key") is None
+
+
+def run_rounds(tmp_path, rounds, checkpoints=None, resume=None):
+    job = JobConfig.from_dir(CONFIG_DIR)
+    job.edge_delays = {}
+    algorithm = job.algorithms[0]
+    algorithm.rounds = rounds
+    dataset = prepare_from_configs(CONFIG_DIR, tmp_path / "workspace", algorithm.client_number, 200)
+    model = SoftmaxModel(dataset.n_features, dataset.n_classes)
+    clients = build_clients(algorithm, [], dataset)
+    with open_results_writer(tmp_path / "results", {"format": "json"}) as writer:
+        orchestrator = FederatedOrchestrator(job, algorithm, clients, model, dataset.arrays("test"), writer, None,
+                                             None, checkpoints, "run", "key")
+        return asyncio.run(orchestrator.run(resume))
+
+
+def test_resume_matches_uninterrupted_run(tmp_path):
+    uninterrupted = run_rounds(tmp_path / "a", 4)
+    store = CheckpointStore(tmp_path / "checkpoints")
+    run_rounds(tmp_path / "b", 2, store)
+    state = store.latest("run", "FederatedAveraging", "key")
+    assert state.round == 2 and state.clients  # int8 transport keeps error feedback per client
+    resumed = run_rounds(tmp_path / "b", 4, resume=state)
+    assert [r["round"] for r in resumed] == [1, 2, 3, 4]
+    # Rounds up to the checkpoint come from it rather than being trained again
+    assert [r["timestamp"] for r in resumed[:2]] == [r["timestamp"] for r in state.history]
+    for expected, record in zip(uninterrupted, resumed):
+        assert record["accuracy"] == pytest.approx(expected["accuracy"])
+        assert record["loss"] == pytest.approx(expected["loss"])
+
+
+def test_resume_counts_time_already_spent(tmp_path):
+    store = CheckpointStore(tmp_path / "checkpoints")
+    run_rounds(tmp_path, 2, store)
+    state = store.latest("run", "FederatedAveraging", "key")
+    assert state.elapsed > 0
+    state.elapsed = 1e9  # Past execution.timeout
+    resumed = run_rounds(tmp_path, 4, resume=state)
+    assert [r["round"] for r in resumed] == [1, 2, 3]
+    assert resumed[-1]["status"] == "timeout"
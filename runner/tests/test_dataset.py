@@ -0,0 +1,90 @@
+import json
+
+import numpy as np
+import pytest
+
+from dataset import (MANIFEST, MIN_SHARD_SAMPLES, DatasetSpec, PreparedDataset, dirichlet_split, iid_split,
+                     prepare_dataset, split_key)
+
+
+def labels(n=2000, classes=10, seed=0):
+    return np.random.default_rng(seed).integers(0, classes, size=n)
+
+
+def assert_partition(shards, n):
+    rows = np.concatenate(shards)
+    assert len(rows) == n
+    np.testing.assert_array_equal(np.sort(rows), np.arange(n))
+
+
+def test_iid_split_is_a_balanced_partition():
+    shards = iid_split(labels(), 7)
+    assert_partition(shards, 2000)
+    assert max(map(len, shards)) - min(map(len, shards)) <= 1
+
+
+@pytest.mark.parametrize("alpha", [0.1, 0.5, 10.0])
+def test_dirichlet_split_is_a_partition_with_minimum_size(alpha):
+    shards = dirichlet_split(labels(), 10, alpha, seed=3)
+    assert_partition(shards, 2000)
+    assert min(map(len, shards)) >= MIN_SHARD_SAMPLES
+
+
+def test_dirichlet_skew_grows_as_alpha_shrinks():
+    y = labels(5000)
+
+    def mean_top_class_share(alpha):
+        shards = dirichlet_split(y, 10, alpha, seed=1)
+        return np.mean([np.bincount(y[s]).max() / len(s) for s in shards])
+
+    assert mean_top_class_share(0.1) > mean_top_class_share(100.0)
+
+
+def test_split_key():
+    assert split_key("iid", 3, 0.5, 0) == split_key("iid", 3, 0.1, 0)  # alpha only matters for Dirichlet
+    assert split_key("dirichlet", 3, 0.5, 0) != split_key("dirichlet", 3, 0.1, 0)
+    assert split_key("dirichlet", 3, 0.5, 0) != split_key("dirichlet", 4, 0.5, 0)
+
+
+@pytest.fixture
+def spec():
+    return DatasetSpec("synthetic", "missing/train", "missing/test")
+
+
+def test_shards_are_contiguous_copies_of_their_rows(tmp_path, spec):
+    dataset = prepare_dataset(spec, tmp_path, 4, method="dirichlet", alpha=0.5, synthetic_samples=200)
+    split = dataset.manifest["splits"][dataset.manifest["latest_split"]]
+    assert split["offsets"] == [0] + np.cumsum(split["sizes"]).tolist()
+    assert split["offsets"][-1] == dataset.manifest["train_samples"]
+    X, y = dataset.arrays("train")
+    shards = dirichlet_split(np.asarray(y), 4, 0.5, 0)
+    for client, rows in enumerate(shards):
+        X_shard, y_shard = dataset.shard(client)
+        # Same rows as the split selects, in shuffled order
+        order = np.lexsort(X_shard.T[::-1])
+        expected = np.lexsort(X[rows].T[::-1])
+        np.testing.assert_array_equal(X_shard[order], X[rows][expected])
+        np.testing.assert_array_equal(np.sort(y_shard), np.sort(y[rows]))
+
+
+def test_prepared_dataset_is_reused(tmp_path, spec):
+    first = prepare_dataset(spec, tmp_path, 3, synthetic_samples=100)
+    mtime = (tmp_path / "train_X.npy").stat().st_mtime_ns
+    split_mtime = (tmp_path / first.manifest["latest_split"] / "train_X.npy").stat().st_mtime_ns
+    again = prepare_dataset(spec, tmp_path, 3, synthetic_samples=100)
+    assert (tmp_path / "train_X.npy").stat().st_mtime_ns == mtime
+    assert (tmp_path / again.manifest["latest_split"] / "train_X.npy").stat().st_mtime_ns == split_mtime
+    # A second split of the same rows is added next to the first
+    skewed = prepare_dataset(spec, tmp_path, 3, method="dirichlet", synthetic_samples=100)
+    assert set(skewed.manifest["splits"]) == {"iid-c3-s0", "dirichlet-a0.5-c3-s0"}
+    assert (tmp_path / "train_X.npy").stat().st_mtime_ns == mtime
+
+
+def test_legacy_index_split_is_rewritten(tmp_path, spec):
+    prepare_dataset(spec, tmp_path, 3, synthetic_samples=100)
+    manifest = json.loads((tmp_path / MANIFEST).read_text())
+    manifest["splits"]["iid-c3-s0"] = {"files": ["iid-c3-s0/client-00001.npy"], "sizes": [100]}
+    (tmp_path / MANIFEST).write_text(json.dumps(manifest))
+    dataset = prepare_dataset(spec, tmp_path, 3, synthetic_samples=100)
+    assert "offsets" in dataset.manifest["splits"]["iid-c3-s0"]
+    assert len(PreparedDataset(tmp_path).shard(2)[1]) == 100
@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from doctor import CheckResult, CheckSpec, EnvironmentDoctor
+
+
+def check(name, passed=True, calls=None):
+    def func():
+        if calls is not None:
+            calls.append(name)
+        return [CheckResult(name, passed, "ok" if passed else "failed")]
+    return func
+
+
+def test_dependent_check_runs_after_its_dependency_passes():
+    calls = []
+    specs = [
+        CheckSpec("Child", check("Child", calls=calls), depends_on=("Parent",)),
+        CheckSpec("Parent", check("Parent", calls=calls)),
+    ]
+    outcomes = EnvironmentDoctor(budget=5).run_checks(specs)
+    assert calls == ["Parent", "Child"]
+    assert outcomes["Child"][0].passed
+
+
+def test_dependent_check_is_skipped_when_its_dependency_fails():
+    calls = []
+    specs = [
+        CheckSpec("Parent", check("Parent", passed=False, calls=calls)),
+        CheckSpec("Child", check("Child", calls=calls), depends_on=("Parent",)),
+        CheckSpec("Grandchild", check("Grandchild", calls=calls), depends_on=("Child",)),
+        CheckSpec("Other", check("Other", calls=calls)),
+    ]
+    outcomes = EnvironmentDoctor(budget=5).run_checks(specs)
+    assert sorted(calls) == ["Other", "Parent"]
+    child, = outcomes["Child"]
+    assert not child.passed and child.severity == "warning"
+    assert child.message == "Skipped: requires Parent"
+    assert outcomes["Grandchild"][0].message == "Skipped: requires Child"
+    assert outcomes["Other"][0].passed
+
+
+def test_raising_check_fails_instead_of_aborting():
+    def broken():
+        raise RuntimeError("boom")
+    outcomes = EnvironmentDoctor(budget=5).run_checks([CheckSpec("Broken", broken)])
+    assert outcomes["Broken"][0].message == "Check raised: boom"
+
+
+def test_cached_outcomes_are_not_rerun():
+    calls = []
+    cached = {"Parent": [CheckResult("Parent", True, "ok (cached)")]}
+    specs = [
+        CheckSpec("Parent", check("Parent", calls=calls), static=True),
+        CheckSpec("Child", check("Child", calls=calls), depends_on=("Parent",)),
+    ]
+    outcomes = EnvironmentDoctor(budget=5).run_checks(specs, cached)
+    assert calls == ["Child"]
+    assert outcomes["Parent"] is cached["Parent"]
+
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_budget_cuts_off_slow_checks(release):
+    def slow():
+        release.wait(10)
+        return [CheckResult("Slow", True, "ok")]
+    specs = [
+        CheckSpec("Fast", check("Fast")),
+        CheckSpec("Slow", slow),
+        CheckSpec("After Slow", check("After Slow"), depends_on=("Slow",)),
+    ]
+    doctor = EnvironmentDoctor(budget=0.3)
+    started = time.monotonic()
+    outcomes = doctor.run_checks(specs)
+    assert time.monotonic() - started < 2
+    assert outcomes["Fast"][0].passed
+    for name in ("Slow", "After Slow"):
+        result, = outcomes[name]
+        assert not result.passed and result.severity == "error"
+        assert result.message.startswith("Did not finish within")
+    assert doctor.elapsed == pytest.approx(0.3, abs=0.2)
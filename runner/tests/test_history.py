@@ -0,0 +1,79 @@
+import pytest
+
+from history import JobHistory, ingest_results, read_run_rounds
+from results_store import ArrowResultsWriter, JsonResultsWriter
+
+
+def record(round_num, status="completed", algorithm="FederatedAveraging", accuracy=0.5, minute=0):
+    return {"round": round_num, "algorithm": algorithm, "status": status, "accuracy": accuracy,
+            "round_duration": 1.0, "uplink_bytes": 10, "downlink_bytes": 20,
+            "timestamp": f"2026-01-01T00:{minute:02d}:{round_num:02d}"}
+
+
+def write_run(results_dir, run_id, records):
+    writer = JsonResultsWriter(results_dir / run_id)
+    for r in records:
+        writer.write_round(r)
+    return results_dir / run_id
+
+
+def test_resumed_rounds_keep_the_later_record(tmp_path):
+    pytest.importorskip("pyarrow")
+    with ArrowResultsWriter(tmp_path, flush_every=1) as writer:
+        for round_num in (1, 2, 3):
+            writer.write_round(record(round_num, "running", accuracy=0.1))
+    with ArrowResultsWriter(tmp_path) as writer:
+        # The resumed run repeats round 3
+        writer.write_round(record(3, "running", accuracy=0.3, minute=5))
+        writer.write_round(record(4, minute=5))
+        writer.write_round(record(1, algorithm="Other", minute=6))
+    rounds = read_run_rounds(tmp_path)
+    assert [(r["algorithm"], r["round"]) for r in rounds] == \
+        [("FederatedAveraging", 1), ("FederatedAveraging", 2), ("FederatedAveraging", 3),
+         ("FederatedAveraging", 4), ("Other", 1)]
+    assert rounds[2]["accuracy"] == 0.3
+
+
+def test_ingest_indexes_new_runs_once(tmp_path):
+    results = tmp_path / "results"
+    write_run(results, "job-20260101-000000", [record(1, "running"), record(2)])
+    write_run(results, "job-20260101-000000-2", [record(1, minute=1)])
+    write_run(results, "manual", [record(1, minute=2)])
+    (results / "empty").mkdir()
+    with JobHistory.open(tmp_path) as history:
+        assert ingest_results(history, results, "fallback") == 3
+        assert ingest_results(history, results, "fallback") == 0
+        assert ingest_results(history, results, "fallback", reindex=True) == 3
+        jobs = dict(history.conn.execute("SELECT run_id, job_name FROM runs"))
+        assert jobs == {"job-20260101-000000": "job", "job-20260101-000000-2": "job", "manual": "fallback"}
+        row = history.conn.execute(
+            "SELECT status, rounds, duration, uplink_bytes, downlink_bytes FROM results WHERE run_id = ?",
+            ("job-20260101-000000",)
+        ).fetchone()
+        assert row == ("completed", 2, 2.0, 20, 40)
+
+
+def test_latest_runs_filters_by_status(tmp_path):
+    with JobHistory.open(tmp_path) as history:
+        history.record_run("a", "job", tmp_path / "a", [record(1, minute=1)])
+        history.record_run("b", "job", tmp_path / "b", [record(1, "timeout", minute=2)])
+        history.record_run("c", "job", tmp_path / "c", [record(1, minute=3)])
+        history.record_run("d", "other", tmp_path / "d", [record(1, minute=4)])
+        history.record_run("e", "job", tmp_path / "e",
+                           [record(1, minute=5), record(1, "timeout", algorithm="Other", minute=5)])
+        assert history.latest_runs("job", 5) == ["c", "a"]
+        assert history.latest_runs("job") == ["c"]
+        assert history.latest_runs("job", 5, status="timeout") == ["b"]
+        assert history.latest_runs("job", 5, status="partial") == ["e"]
+
+
+def test_baseline_pin_and_unpin(tmp_path):
+    with JobHistory.open(tmp_path) as history:
+        for run_id in ("a", "b", "c"):
+            history.record_run(run_id, "job", tmp_path / run_id, [record(1)])
+        history.pin_baseline("job", ["a", "b"])
+        history.pin_baseline("job", ["c", "b"])
+        assert history.baseline("job") == ["b", "c"]
+        assert history.run_dirs(["b", "c"]) == {"b": tmp_path / "b", "c": tmp_path / "c"}
+        history.unpin_baseline("job")
+        assert history.baseline("job") == []
@@ -0,0 +1,62 @@
+import numpy as np
+
+from latency import LatencyHistogram, merge_histograms
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    values = np.arange(256)
+    histogram.record(values)
+    np.testing.assert_array_equal(histogram.bucket_values(histogram.bucket_indices(values)), values)
+
+
+def test_relative_error_bound():
+    values = np.unique(np.random.default_rng(0).integers(1, 10 ** 10, size=20000))
+    histogram = LatencyHistogram(bits=8)
+    reported = histogram.bucket_values(histogram.bucket_indices(values))
+    assert np.max(np.abs(reported - values) / values) < 2.0 ** -(histogram.bits - 1)
+
+
+def test_percentiles_track_numpy():
+    values = np.random.default_rng(1).lognormal(13, 1, size=50000).astype(np.int64)
+    histogram = LatencyHistogram()
+    histogram.record(values)
+    assert histogram.count == len(values)
+    assert abs(histogram.mean_ms() - values.mean() / 1e6) < 1e-9
+    for percentile in (50, 95, 99, 99.9):
+        exact = np.percentile(values, percentile, method="inverted_cdf") / 1e6
+        assert abs(histogram.percentile_ms(percentile) - exact) / exact < 0.01
+
+
+def test_merge_equals_recording_everything():
+    rng = np.random.default_rng(2)
+    a, b = rng.integers(1, 10 ** 6, size=1000), rng.integers(1, 10 ** 9, size=1000)
+    merged = LatencyHistogram()
+    merged.record(a)
+    other = LatencyHistogram()
+    other.record(b)
+    merged.merge(other)
+    combined = LatencyHistogram()
+    combined.record(np.concatenate([a, b]))
+    np.testing.assert_array_equal(merged.counts, combined.counts)
+    assert merged.total_ns == combined.total_ns
+
+
+def test_merge_histograms_from_reports():
+    rng = np.random.default_rng(3)
+    reports, everything = [], {1: [], 32: []}
+    for _ in range(3):
+        report = {}
+        for batch_size in everything:
+            values = rng.integers(1000, 10 ** 7, size=200)
+            everything[batch_size].append(values)
+            histogram = LatencyHistogram()
+            histogram.record(values)
+            report[str(batch_size)] = histogram.to_dict()  # Keys are strings after JSON
+        reports.append(report)
+    merged = merge_histograms(reports)
+    assert sorted(merged) == [1, 32]
+    for batch_size, parts in everything.items():
+        expected = LatencyHistogram()
+        expected.record(np.concatenate(parts))
+        assert merged[batch_size].summary() == expected.summary()
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from metrics import ConfusionMatrix, evaluate_stream, merge_matrices
+
+
+def labels(n=2000, classes=4, seed=0):
+    rng = np.random.default_rng(seed)
+    y_true = rng.integers(0, classes, size=n)
+    y_pred = np.where(rng.random(n) < 0.7, y_true, rng.integers(0, classes, size=n))
+    return y_true, y_pred
+
+
+def test_counts_match_pairs():
+    y_true, y_pred = labels()
+    matrix = ConfusionMatrix(4)
+    matrix.update(y_true, y_pred)
+    expected = np.zeros((4, 4), dtype=np.int64)
+    np.add.at(expected, (y_true, y_pred), 1)
+    np.testing.assert_array_equal(matrix.counts, expected)
+
+
+def test_metrics_match_definitions():
+    y_true, y_pred = labels()
+    matrix = ConfusionMatrix(4)
+    matrix.update(y_true, y_pred)
+    metrics = matrix.metrics()
+    assert metrics["accuracy"] == pytest.approx(np.mean(y_true == y_pred))
+    precision = [np.mean(y_true[y_pred == c] == c) for c in range(4)]
+    recall = [np.mean(y_pred[y_true == c] == c) for c in range(4)]
+    f1 = [2 * p * r / (p + r) for p, r in zip(precision, recall)]
+    np.testing.assert_allclose(metrics["class_precision"], precision)
+    np.testing.assert_allclose(metrics["class_recall"], recall)
+    assert metrics["f1_macro"] == pytest.approx(np.mean(f1))
+    assert metrics["precision_micro"] == metrics["accuracy"]
+
+
+def test_absent_class_is_excluded_from_macro_average():
+    matrix = ConfusionMatrix(3)
+    matrix.update(np.array([0, 0, 1, 1]), np.array([0, 1, 1, 1]))
+    metrics = matrix.metrics()
+    assert metrics["class_support"][2] == 0
+    assert metrics["recall_macro"] == pytest.approx((0.5 + 1.0) / 2)
+
+
+def test_merge_is_exact():
+    y_true, y_pred = labels(seed=1)
+    whole = ConfusionMatrix(4)
+    whole.update(y_true, y_pred)
+    reports = []
+    for part in np.array_split(np.arange(len(y_true)), 3):
+        matrix = ConfusionMatrix(4)
+        matrix.update(y_true[part], y_pred[part])
+        reports.append(matrix.to_dict())
+    np.testing.assert_array_equal(merge_matrices(reports).counts, whole.counts)
+
+
+def test_merge_rejects_other_class_count():
+    with pytest.raises(ValueError):
+        ConfusionMatrix(3).merge(ConfusionMatrix(4))
+
+
+def test_evaluate_stream_batches_agree():
+    rng = np.random.default_rng(2)
+    proba = rng.dirichlet(np.ones(5), size=3000)
+    y = rng.integers(0, 5, size=3000)
+    X = np.arange(3000)
+    full, loss = evaluate_stream(lambda batch: proba[batch], X, y, 5, batch_size=3000)
+    streamed, streamed_loss = evaluate_stream(lambda batch: proba[batch], X, y, 5, batch_size=128)
+    np.testing.assert_array_equal(full.counts, streamed.counts)
+    assert streamed_loss == pytest.approx(loss)
+    assert loss == pytest.approx(-np.mean(np.log(proba[np.arange(3000), y] + 1e-12)))
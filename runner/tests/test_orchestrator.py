@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from dataset import prepare_from_configs
+from model import SoftmaxModel
+from orchestrator import CONFIG_DIR, FederatedOrchestrator, JobConfig, build_clients
+from results_store import open_results_writer
+
+SLOW = "edge-node-3"
+
+
+def run_with_straggler(tmp_path, late_updates="stale", max_staleness=10):
+    """Five rounds with a 0.2 s round deadline and one node whose every exchange takes 0.5 s"""
+    job = JobConfig.from_dir(CONFIG_DIR)
+    job.edge_delays = {SLOW: 0.5}
+    job.round_deadline = 0.2
+    job.min_updates = 1
+    job.late_updates = late_updates
+    job.max_staleness = max_staleness
+    algorithm = job.algorithms[0]
+    algorithm.rounds = 5
+    dataset = prepare_from_configs(CONFIG_DIR, tmp_path / "workspace", algorithm.client_number, 200)
+    model = SoftmaxModel(dataset.n_features, dataset.n_classes)
+    clients = build_clients(algorithm, [], dataset, job.edge_delays)
+    with open_results_writer(tmp_path / "results", {"format": "json"}) as writer:
+        orchestrator = FederatedOrchestrator(job, algorithm, clients, model, dataset.arrays("test"), writer, None)
+        scales = []
+        add = orchestrator.aggregator.add
+
+        def recording_add(weights, samples, scale=1.0):
+            scales.append(scale)
+            add(weights, samples, scale)
+
+        orchestrator.aggregator.add = recording_add
+        records = asyncio.run(orchestrator.run())
+    return job, records, scales
+
+
+def slow_node(record):
+    return next(node for node in record["edge_nodes"] if node["name"] == SLOW)
+
+
+def test_straggler_update_is_folded_in_late_with_the_staleness_scale(tmp_path):
+    job, records, scales = run_with_straggler(tmp_path)
+    assert slow_node(records[0])["status"] == "straggler"
+    assert records[0]["participants"] == 2
+    late = [slow_node(r) for r in records if slow_node(r)["status"] == "late"]
+    assert late
+    for node in late:
+        assert node["staleness"] >= 1
+        assert node["lateness"] > 0
+    expected = sorted((1 + node["staleness"]) ** -job.staleness_decay for node in late)
+    assert sorted(s for s in scales if s != 1.0) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("late_updates, max_staleness", [("stale", 0), ("drop", 10)])
+def test_late_update_is_dropped(tmp_path, late_updates, max_staleness):
+    _, records, scales = run_with_straggler(tmp_path, late_updates, max_staleness)
+    statuses = [slow_node(r)["status"] for r in records]
+    assert statuses[0] == "straggler"
+    assert "dropped" in statuses
+    assert "late" not in statuses
+    assert set(scales) == {1.0}
+    for record in records:
+        assert record["participants"] == 2
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from regression import bootstrap_delta, compare_runs, verdict
+from results_store import JsonResultsWriter
+
+
+def test_bootstrap_delta_recovers_a_known_shift():
+    rng = np.random.default_rng(0)
+    baseline = [rng.normal(0.80, 0.01, 50)]
+    candidate = [baseline[0] + 0.05]
+    delta, low, high, base_mean, cand_mean = bootstrap_delta(baseline, candidate, 0.95, 2000,
+                                                             np.random.default_rng(7))
+    assert delta == pytest.approx(0.05)
+    assert low < 0.05 < high
+    assert low > 0
+    assert cand_mean - base_mean == pytest.approx(delta)
+    # Same seed, same interval
+    again = bootstrap_delta(baseline, candidate, 0.95, 2000, np.random.default_rng(7))
+    assert again == (delta, low, high, base_mean, cand_mean)
+
+
+def test_bootstrap_delta_resamples_whole_runs():
+    baseline = [np.full(5, 1.0), np.full(5, 2.0)]
+    candidate = [np.full(5, 1.0), np.full(5, 2.0)]
+    delta, low, high, _, _ = bootstrap_delta(baseline, candidate, 0.95, 500, np.random.default_rng(0))
+    assert delta == 0.0
+    # Run means are 1 or 2, so resampled differences stay within [-1, 1]
+    assert -1.0 <= low < 0 < high <= 1.0
+
+
+@pytest.mark.parametrize("order, low, high, expected", [
+    ("desc", -0.05, -0.02, "regression"),
+    ("desc", -0.005, -0.002, "unchanged"),  # Worse, but within the 0.01 margin
+    ("desc", 0.02, 0.05, "improvement"),
+    ("asc", 0.02, 0.05, "regression"),
+    ("asc", 0.002, 0.005, "unchanged"),
+    ("asc", -0.05, -0.02, "improvement"),
+    ("asc", -0.05, 0.05, "unchanged"),
+])
+def test_verdict_on_each_side_of_the_margin(order, low, high, expected):
+    assert verdict(order, low, high, 0.01) == expected
+
+
+def write_run(run_dir, accuracies, cached=False):
+    writer = JsonResultsWriter(run_dir)
+    for round_num, accuracy in enumerate(accuracies, 1):
+        record = {"round": round_num, "algorithm": "FederatedAveraging", "accuracy": accuracy,
+                  "timestamp": f"2026-01-01T00:00:{round_num:02d}"}
+        if cached:
+            record["cached"] = True
+        writer.write_round(record)
+    return run_dir
+
+
+SETTINGS = {"window": 5, "resamples": 500, "metrics": [{"name": "accuracy", "order": "desc", "tolerance": 0.01}]}
+
+
+def test_compare_runs_flags_a_drop_past_tolerance(tmp_path):
+    noise = np.random.default_rng(1).normal(0, 0.002, 5)
+    baseline = write_run(tmp_path / "base", 0.90 + noise)
+    same = write_run(tmp_path / "same", 0.90 + noise[::-1])
+    worse = write_run(tmp_path / "worse", 0.80 + noise)
+
+    report = compare_runs([baseline], [same], SETTINGS)
+    assert report["algorithms"]["FederatedAveraging"]["accuracy"]["verdict"] == "unchanged"
+    assert not report["regression"]
+
+    report = compare_runs([baseline], [worse], SETTINGS)
+    assert report["algorithms"]["FederatedAveraging"]["accuracy"]["verdict"] == "regression"
+    assert report["regression"]
+
+
+def test_cached_runs_are_not_measured(tmp_path):
+    baseline = write_run(tmp_path / "base", [0.9] * 5)
+    replayed = write_run(tmp_path / "replayed", [0.5] * 5, cached=True)
+    report = compare_runs([baseline], [replayed], SETTINGS)
+    assert report["not_measured"] == ["FederatedAveraging"]
+    assert report["algorithms"] == {}
+    assert not report["regression"]
@@ -0,0 +1,112 @@
+import os
+import shutil
+from types import SimpleNamespace
+
+import pytest
+import yaml
+
+import orchestrator
+from orchestrator import CONFIG_DIR, JobConfig, result_key
+from result_cache import ResultCache, code_digest, replay
+
+MANIFEST = {"name": "synthetic", "train_samples": 600, "splits": {"iid-c3-s0": {"sizes": [200, 200, 200]}}}
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    return shutil.copytree(CONFIG_DIR, tmp_path / "configs")
+
+
+def key_of(config_dir, job=None, manifest=MANIFEST):
+    job = job or JobConfig.from_dir(config_dir)
+    return result_key(job, job.algorithms[0], config_dir, SimpleNamespace(manifest=manifest), False)
+
+
+def test_key_is_stable(config_dir):
+    assert key_of(config_dir) == key_of(config_dir)
+
+
+def test_key_changes_with_testenv(config_dir):
+    before = key_of(config_dir)
+    path = config_dir / "testenv.yaml"
+    testenv = yaml.safe_load(path.read_text())
+    testenv["testenv"]["name"] = "other"
+    path.write_text(yaml.safe_dump(testenv))
+    assert key_of(config_dir) != before
+
+
+def test_key_changes_with_code(config_dir, monkeypatch):
+    before = key_of(config_dir)
+    monkeypatch.setattr(orchestrator, "code_digest", lambda directory: "0" * 64)
+    assert key_of(config_dir) != before
+
+
+def test_key_changes_with_dataset_manifest(config_dir):
+    resplit = {**MANIFEST, "splits": {"iid-c3-s1": {"sizes": [200, 200, 200]}}}
+    assert key_of(config_dir, manifest=resplit) != key_of(config_dir)
+
+
+def test_key_changes_with_keyed_job_fields(config_dir):
+    job = JobConfig.from_dir(config_dir)
+    before = key_of(config_dir, job)
+    job.round_deadline = 5.0
+    assert key_of(config_dir, job) != before
+
+
+@pytest.mark.parametrize("field, value", [
+    ("output", {"format": "json"}),
+    ("sweep", {"enabled": True}),
+    ("telemetry", {"enabled": False}),
+    ("cache", {"max_entries": 1}),
+])
+def test_key_ignores_unkeyed_job_fields(config_dir, field, value):
+    job = JobConfig.from_dir(config_dir)
+    before = key_of(config_dir, job)
+    setattr(job, field, value)
+    assert key_of(config_dir, job) == before
+
+
+def test_code_digest_covers_module_contents(tmp_path):
+    (tmp_path / "a.py").write_text("x = 1\n")
+    before = code_digest(tmp_path)
+    (tmp_path / "notes.txt").write_text("not code")
+    assert code_digest(tmp_path) == before
+    (tmp_path / "a.py").write_text("x = 2\n")
+    assert code_digest(tmp_path) != before
+
+
+def rounds(n=20):
+    return [{"round": r, "accuracy": 0.5} for r in range(1, n + 1)]
+
+
+def test_get_put_and_replay(tmp_path):
+    cache = ResultCache(tmp_path)
+    assert cache.get("a" * 64) is None
+    cache.put("a" * 64, "run-1", rounds(2))
+    replayed = replay(cache.get("a" * 64))
+    assert [r["round"] for r in replayed] == [1, 2]
+    assert all(r["cached"] and r["cached_from"] == "run-1" for r in replayed)
+
+
+def test_evicts_least_recently_used_past_the_size_cap(tmp_path):
+    cache = ResultCache(tmp_path, max_entries=100)
+    keys = [c * 64 for c in "abcd"]
+    for age, key in zip((3000, 2000, 1000), keys):
+        cache.put(key, "run-1", rounds())
+        os.utime(cache.path(key), (1e9 - age, 1e9 - age))
+    size = cache.path(keys[0]).stat().st_size
+    # Room for three entries
+    cache.max_bytes = int(size * 3.5)
+    cache.get(keys[0])  # "a" is now the most recently used
+    cache.put(keys[3], "run-2", rounds())
+    assert sorted(p.stem[0] for p in tmp_path.glob("*.json")) == ["a", "c", "d"]
+
+
+def test_evicts_past_the_entry_cap(tmp_path):
+    cache = ResultCache(tmp_path, max_entries=2)
+    for age, key in zip((3000, 2000), ("a" * 64, "b" * 64)):
+        cache.put(key, "run-1", rounds(1))
+        os.utime(cache.path(key), (1e9 - age, 1e9 - age))
+    cache.put("c" * 64, "run-1", rounds(1))
+    assert cache.evict() == 0
+    assert sorted(p.stem[0] for p in tmp_path.glob("*.json")) == ["b", "c"]
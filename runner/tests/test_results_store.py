@@ -0,0 +1,38 @@
+import pytest
+
+from results_store import ArrowResultsWriter, JsonResultsWriter, read_arrow_segment
+
+
+def record(round_num, algorithm="FederatedAveraging"):
+    return {"round": round_num, "total_rounds": 6, "algorithm": algorithm, "accuracy": round_num / 10}
+
+
+def test_arrow_discard_after_drops_rounds_past_the_checkpoint(tmp_path):
+    pytest.importorskip("pyarrow")
+    with ArrowResultsWriter(tmp_path, flush_every=1) as writer:
+        for round_num in (1, 2, 3):
+            writer.write_round(record(round_num, "Other"))
+        for round_num in (1, 2, 3, 4, 5):
+            writer.write_round(record(round_num))
+    with ArrowResultsWriter(tmp_path) as writer:
+        # Resume after the round 4 checkpoint
+        writer.discard_after("FederatedAveraging", 4)
+        for round_num in (5, 6):
+            writer.write_round(record(round_num))
+
+    first, second = sorted(tmp_path.glob("rounds-*.arrows"))
+    assert [(r["algorithm"], r["round"]) for r in read_arrow_segment(first)] == \
+        [("Other", 1), ("Other", 2), ("Other", 3)] + [("FederatedAveraging", r) for r in (1, 2, 3, 4)]
+    assert [r["round"] for r in read_arrow_segment(second)] == [5, 6]
+    assert read_arrow_segment(first)[3] == record(1)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_json_discard_after_deletes_rounds_past_the_checkpoint(tmp_path):
+    writer = JsonResultsWriter(tmp_path)
+    for round_num in (1, 2, 3):
+        writer.write_round(record(round_num))
+    writer.discard_after("Other", 0)
+    assert len(list(tmp_path.glob("round_*.json"))) == 3
+    writer.discard_after("FederatedAveraging", 1)
+    assert [p.name for p in tmp_path.glob("round_*.json")] == ["round_1.json"]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from transport import UpdateCodec, codec_from_config, decode, downlink_codec, payload_size, zstandard
+
+
+def weights(size=1000, seed=0):
+    return np.random.default_rng(seed).normal(size=size).astype(np.float32)
+
+
+def roundtrip(codec, new, reference=None):
+    return decode(b"".join(codec.encode(new, reference)), reference)
+
+
+@pytest.mark.parametrize("delta", [False, True])
+def test_lossless_roundtrip(delta):
+    reference = weights(seed=1)
+    new = weights(seed=2)
+    np.testing.assert_allclose(roundtrip(UpdateCodec(delta=delta), new, reference), new, atol=1e-6)
+
+
+@pytest.mark.skipif(zstandard is None, reason="zstandard not installed")
+def test_zstd_roundtrip():
+    new = weights()
+    codec = UpdateCodec(compression="zstd")
+    np.testing.assert_array_equal(roundtrip(codec, new), new)
+
+
+def test_int8_error_is_within_half_a_step():
+    reference = weights(seed=1)
+    new = reference + weights(seed=2) * 0.01
+    codec = UpdateCodec(delta=True, quantization="int8")
+    step = np.max(np.abs(new - reference)) / 127
+    assert np.max(np.abs(roundtrip(codec, new, reference) - new)) <= step / 2 + 1e-6
+
+
+def test_topk_keeps_largest_deltas_and_reference_elsewhere():
+    reference = weights(seed=1)
+    delta = np.zeros_like(reference)
+    delta[[3, 500, 999]] = [5.0, -4.0, 3.0]
+    codec = UpdateCodec(delta=True, topk_ratio=0.003)
+    decoded = roundtrip(codec, reference + delta, reference)
+    np.testing.assert_allclose(decoded, reference + delta, atol=1e-6)
+    assert payload_size(codec.encode(reference + delta, reference)) < reference.nbytes / 10
+
+
+def test_topk_without_delta_is_rejected():
+    # Sparse raw weights would decode to zeros outside the top-k and wipe the global model
+    with pytest.raises(ValueError, match="delta"):
+        codec_from_config({"topk_ratio": 0.1, "delta": False})
+
+
+def test_topk_without_reference_is_rejected():
+    with pytest.raises(ValueError, match="reference"):
+        UpdateCodec(delta=True, topk_ratio=0.1).encode(weights())
+
+
+def test_delta_payload_needs_reference():
+    reference = weights(seed=1)
+    payload = b"".join(UpdateCodec(delta=True).encode(weights(seed=2), reference))
+    with pytest.raises(ValueError):
+        decode(payload)
+
+
+def test_downlink_is_lossless():
+    codec = downlink_codec(codec_from_config({"delta": True, "topk_ratio": 0.1, "quantization": "int8"}))
+    assert not codec.lossy
+    new = weights()
+    np.testing.assert_array_equal(roundtrip(codec, new), new)
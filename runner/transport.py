@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Ianvs Update Transport - Binary encoding of model updates between cloud and edge
+Payloads are a fixed header followed by raw NumPy buffers, optionally delta
+encoded, top-k sparsified, int8 quantized and zstd compressed. Every payload is
+self-describing, so the receiver needs no codec settings to decode it.
+"""
+
+import struct
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:  # Only required for transport.compression: "zstd"
+    zstandard = None
+
+MAGIC = b"IVU1"
+HEADER = struct.Struct("<4sBIIf")  # magic, flags, model size, value count, int8 scale
+
+FLAG_DELTA = 0x01
+FLAG_SPARSE = 0x02
+FLAG_INT8 = 0x04
+FLAG_ZSTD = 0x08
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class UpdateCodec:
+    """Encodes flat float32 weight vectors into wire buffers and back"""
+
+    def __init__(self, delta: bool = False, topk_ratio: float = 0.0, quantization: str = "none",
+                 compression: str = "none", compression_level: int = 3):
+        if quantization not in ("none", "int8"):
+            raise ValueError(f"Unknown transport.quantization '{quantization}', expected 'none' or 'int8'")
+        if compression not in ("none", "zstd"):
+            raise ValueError(f"Unknown transport.compression '{compression}', expected 'none' or 'zstd'")
+        if 0 < topk_ratio < 1 and not delta:
+            # Decoding fills the dropped values with zeros, which is only a no-op for deltas
+            raise ValueError("transport.topk_ratio requires transport.delta: true; sparse raw weights "
+                             "would zero every weight outside the top-k")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("transport.compression 'zstd' requires zstandard. Run: pip install zstandard")
+        self.delta = delta
+        self.topk_ratio = topk_ratio
+        self.quantization = quantization
+        self.compression = compression
+        self.compression_level = compression_level
+
+    @property
+    def lossy(self) -> bool:
+        return 0 < self.topk_ratio < 1 or self.quantization != "none"
+
+    def config(self) -> Dict:
+        """Settings that rebuild this codec on the other side via codec_from_config"""
+        return {
+            "delta": self.delta,
+            "topk_ratio": self.topk_ratio,
+            "quantization": self.quantization,
+            "compression": self.compression,
+            "compression_level": self.compression_level,
+        }
+
+    def encode(self, weights: np.ndarray, reference: Optional[np.ndarray] = None) -> List[Buffer]:
+        """Wire buffers for ``weights``; delta encoding is relative to ``reference``
+
+        Without compression the value buffers are views of the arrays, so the
+        caller can hand them to a socket without joining them first.
+        """
+        flags = 0
+        values = np.asarray(weights, dtype=np.float32)
+        if self.delta and reference is not None:
+            values = values - reference
+            flags |= FLAG_DELTA
+
+        buffers = []
+        if 0 < self.topk_ratio < 1:
+            if not flags & FLAG_DELTA:
+                raise ValueError("Top-k sparsification encodes deltas and needs the reference weights")
+            k = max(1, int(len(values) * self.topk_ratio))
+            indices = np.sort(np.argpartition(np.abs(values), -k)[-k:]).astype(np.uint32)
+            values = values[indices]
+            buffers.append(indices.data)
+            flags |= FLAG_SPARSE
+
+        scale = 0.0
+        if self.quantization == "int8":
+            peak = float(np.max(np.abs(values))) if len(values) else 0.0
+            scale = peak / 127 if peak > 0 else 1.0
+            values = np.clip(np.rint(values / scale), -127, 127).astype(np.int8)
+            flags |= FLAG_INT8
+        buffers.append(np.ascontiguousarray(values).data)
+
+        if self.compression == "zstd":
+            compressor = zstandard.ZstdCompressor(level=self.compression_level)
+            buffers = [compressor.compress(b"".join(buffers))]
+            flags |= FLAG_ZSTD
+
+        header = HEADER.pack(MAGIC, flags, len(weights), len(values), scale)
+        return [header] + buffers
+
+
+def payload_size(buffers: List[Buffer]) -> int:
+    """Bytes on the wire for a list of buffers"""
+    return sum(memoryview(b).nbytes for b in buffers)
+
+
+def decode(payload: Buffer, reference: Optional[np.ndarray] = None) -> np.ndarray:
+    """Weights from an encoded payload; ``reference`` is required for delta payloads
+
+    Uncompressed dense payloads are read in place with np.frombuffer.
+    """
+    payload = memoryview(payload)
+    magic, flags, size, count, scale = HEADER.unpack_from(payload)
+    if magic != MAGIC:
+        raise ValueError("Not an Ianvs update payload")
+    body = payload[HEADER.size:]
+    if flags & FLAG_ZSTD:
+        if zstandard is None:
+            raise ImportError("Decoding a zstd payload requires zstandard. Run: pip install zstandard")
+        body = memoryview(zstandard.ZstdDecompressor().decompress(body))
+
+    offset = 0
+    indices = None
+    if flags & FLAG_SPARSE:
+        indices = np.frombuffer(body, dtype=np.uint32, count=count)
+        offset = indices.nbytes
+
+    if flags & FLAG_INT8:
+        values = np.frombuffer(body, dtype=np.int8, count=count, offset=offset).astype(np.float32) * scale
+    else:
+        values = np.frombuffer(body, dtype=np.float32, count=count, offset=offset)
+
+    if indices is not None:
+        dense = np.zeros(size, dtype=np.float32)
+        dense[indices] = values
+        values = dense
+
+    if flags & FLAG_DELTA:
+        if reference is None:
+            raise ValueError("Delta payload needs the reference weights to decode")
+        return reference + values
+    return values
+
+
+def codec_from_config(config: Optional[Dict]) -> UpdateCodec:
+    """Codec for the transport section of benchmarkingjob.yaml"""
+    config = config or {}
+    return UpdateCodec(
+        delta=bool(config.get("delta", False)),
+        topk_ratio=float(config.get("topk_ratio", 0.0)),
+        quantization=config.get("quantization", "none"),
+        compression=config.get("compression", "none"),
+        compression_level=int(config.get("compression_level", 3)),
+    )
+
+
+def downlink_codec(codec: UpdateCodec) -> UpdateCodec:
+    """Lossless codec for broadcasting the global model; only compression carries over"""
+    return UpdateCodec(compression=codec.compression, compression_level=codec.compression_level)
+